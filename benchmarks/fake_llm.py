@@ -0,0 +1,98 @@
+# benchmarks/fake_llm.py
+
+# A deterministic stand-in for the LLM provider, so benchmarks measure
+# statlingua's own overhead without network access or API keys.
+#
+# `FakeLLM` is a `CompletionBackend`, and `fake_backend()` installs it with
+# `use_backend()`, so benchmarked calls take the same path through
+# `completion.send` (policy, rate limiter, instrumentation) as real ones.
+# Each response is derived from a hash of the messages, its latency is
+# configurable, and its `usage` reports token counts estimated with the
+# library's own `estimate_tokens`.
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+from statlingua.backends import CompletionBackend, use_backend
+from statlingua.prompts import estimate_tokens
+
+class FakeLLM(CompletionBackend):
+    """A fake chat-completion backend with a fixed latency.
+
+    Parameters
+    ----------
+    latency : float, optional
+        Seconds to wait before each response, by default 0.0.
+    completion_tokens : int, optional
+        Approximate length of each response in tokens, by default 200.
+    """
+
+    def __init__(self, latency: float = 0.0, completion_tokens: int = 200):
+        self.latency = latency
+        self.completion_tokens = completion_tokens
+        self.calls = 0
+
+    def _text(self, messages: list) -> str:
+        payload = json.dumps(messages, sort_keys=True, default=repr)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        words = ["The", "model", "explains", "the", "outcome", "well."]
+        body = " ".join(words[i % len(words)] for i in range(self.completion_tokens))
+        return f"[{digest[:12]}] {body}"
+
+    def _response(self, messages: list) -> SimpleNamespace:
+        text = self._text(messages)
+        prompt_text = "".join(
+            m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+            for m in messages if isinstance(m, dict)
+        )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text, tool_calls=None))],
+            usage=SimpleNamespace(
+                prompt_tokens=estimate_tokens(prompt_text),
+                completion_tokens=estimate_tokens(text),
+            ),
+        )
+
+    def _stream(self, response: SimpleNamespace, kwargs: dict) -> Iterator[SimpleNamespace]:
+        text = response.choices[0].message.content
+        for start in range(0, len(text), 16):
+            delta = SimpleNamespace(content=text[start:start + 16])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+        if (kwargs.get("stream_options") or {}).get("include_usage"):
+            yield SimpleNamespace(choices=[], usage=response.usage)
+
+    def completion(self, model: str, messages: list, stream: bool = False, **kwargs: Any):
+        """Returns a canned response after `latency` seconds."""
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        response = self._response(messages)
+        if stream:
+            return self._stream(response, kwargs)
+        return response
+
+    async def acompletion(self, model: str, messages: list, stream: bool = False, **kwargs: Any):
+        """Returns a canned response after `latency` seconds, asynchronously."""
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response = self._response(messages)
+        if stream:
+            chunks = list(self._stream(response, kwargs))
+
+            async def _agen():
+                for chunk in chunks:
+                    yield chunk
+            return _agen()
+        return response
+
+@contextlib.contextmanager
+def fake_backend(latency: float = 0.0, completion_tokens: int = 200) -> Iterator[FakeLLM]:
+    """Routes all LLM requests to a :class:`FakeLLM` within the block."""
+    with use_backend(FakeLLM(latency=latency, completion_tokens=completion_tokens)) as llm:
+        yield llm
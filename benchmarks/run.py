@@ -0,0 +1,224 @@
+# benchmarks/run.py
+
+"""Offline benchmarks for statlingua's own overhead.
+
+Every LLM call goes to the deterministic fake backend in `fake_llm.py`, so
+the suite needs no network access or API keys. Results are written as JSON
+and can be compared against an earlier run:
+
+    python benchmarks/run.py --output before.json
+    # ... change something ...
+    python benchmarks/run.py --output after.json --compare before.json
+
+Use `--quick` for a reduced grid (seconds rather than minutes) and
+`--only handler` (a name prefix) to run a subset.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+# Stay offline: litellm otherwise downloads its model cost map on import
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+# Benchmark the working tree rather than whatever version is installed
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+import statlingua
+from statlingua.diagnostic import plot_residuals_vs_fitted
+from statlingua.explain import aexplain_many, explain
+from statlingua.model_handlers import clear_summary_cache, extract_summary
+from statlingua.prompts import assemble_sys_prompt, reload_prompts
+
+from fake_llm import fake_backend
+
+AUDIENCES = ("novice", "student", "researcher", "manager", "domain_expert")
+VERBOSITIES = ("brief", "moderate", "detailed")
+STYLES = ("markdown", "html", "json", "text", "latex")
+
+def _measure(fn: Callable[[], object], repeat: int, setup: Callable[[], object] = None) -> dict:
+    """Times `fn` `repeat` times (running `setup` untimed before each)."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+    }
+
+def _fit(family: str, n: int, p: int, seed: int = 0):
+    import statsmodels.api as sm
+
+    rng = np.random.default_rng(seed)
+    X = sm.add_constant(rng.normal(size=(n, p)))
+    beta = rng.normal(scale=0.1, size=p + 1)
+    if family == "ols":
+        return sm.OLS(X @ beta + rng.normal(size=n), X).fit()
+    y = rng.poisson(np.exp(np.clip(X @ beta, -5, 5)))
+    return sm.GLM(y, X, family=sm.families.Poisson()).fit()
+
+def bench_handler(quick: bool) -> List[dict]:
+    """Handler extraction (summary rendering) for models of growing size."""
+    grid = [("ols", 2_000, p) for p in (5, 50, 500)]
+    grid += [("ols", n, 10) for n in (1_000, 100_000, 1_000_000)]
+    grid += [("glm", 2_000, p) for p in (5, 50)] + [("glm", 100_000, 10)]
+    if quick:
+        grid = [("ols", 2_000, 5), ("ols", 2_000, 50), ("ols", 100_000, 10), ("glm", 2_000, 5)]
+    results = []
+    for family, n, p in grid:
+        # Refit before each run: statsmodels caches derived statistics on the
+        # results object, so reusing one fit would only time the formatting
+        state = {}
+        stats = _measure(
+            lambda: extract_summary(state["fit"]),
+            repeat=3 if quick else 5,
+            setup=lambda: state.update(fit=_fit(family, n, p)),
+        )
+        results.append({"benchmark": f"handler.{family}", "params": {"n": n, "p": p}, **stats})
+    return results
+
+def bench_prompts(quick: bool) -> List[dict]:
+    """System-prompt assembly, cold (files re-read) and memoized."""
+    combos = [
+        (model, audience, verbosity, style)
+        for model in ("lm", "glm", "default")
+        for audience in AUDIENCES
+        for verbosity in VERBOSITIES
+        for style in STYLES
+    ]
+
+    def assemble_all():
+        for combo in combos:
+            assemble_sys_prompt(*combo)
+
+    repeat = 3 if quick else 10
+    cold = _measure(assemble_all, repeat=repeat, setup=reload_prompts)
+    warm = _measure(assemble_all, repeat=repeat)
+    return [
+        {"benchmark": "prompts.assemble", "params": {"cache": cache, "prompts": len(combos)},
+         **stats, "prompts_per_s": len(combos) / stats["median_s"]}
+        for cache, stats in (("cold", cold), ("warm", warm))
+    ]
+
+def bench_explain(quick: bool, latency: float) -> List[dict]:
+    """End-to-end explain() and explain_many() against the fake backend."""
+    results = []
+    fit = _fit("ols", 2_000, 10)
+    with fake_backend(latency=0.0):
+        for memoized in (False, True):
+            setup = None if memoized else clear_summary_cache
+            stats = _measure(lambda: explain(fit, model="fake"), repeat=5 if quick else 20, setup=setup)
+            results.append({
+                "benchmark": "explain.overhead",
+                "params": {"memoized_summary": memoized},
+                **stats,
+            })
+
+    n_models = 16 if quick else 64
+    fits = [_fit("ols", 500, 5, seed=seed) for seed in range(n_models)]
+    with fake_backend(latency=latency):
+        for concurrency in (1, 8) if quick else (1, 8, 32):
+            stats = _measure(
+                lambda: asyncio.run(aexplain_many(fits, model="fake", max_concurrency=concurrency)),
+                repeat=1 if quick else 3,
+                setup=clear_summary_cache,
+            )
+            results.append({
+                "benchmark": "explain.batch",
+                "params": {"models": n_models, "latency_s": latency, "max_concurrency": concurrency},
+                **stats,
+                "models_per_s": n_models / stats["median_s"],
+            })
+    return results
+
+def bench_plots(quick: bool) -> List[dict]:
+    """Residual plot rendering, including the large-n mode."""
+    results = []
+    for n in (1_000, 100_000) if quick else (1_000, 100_000, 1_000_000, 5_000_000):
+        rng = np.random.default_rng(0)
+        fitted = rng.normal(size=n)
+
+        class _Fit:
+            fittedvalues = fitted
+            resid = rng.normal(size=n) * (1 + np.abs(fitted))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = _measure(lambda: plot_residuals_vs_fitted(_Fit()), repeat=2 if quick else 3)
+        results.append({"benchmark": "plot.residuals", "params": {"n": n}, **stats})
+    return results
+
+def _key(result: dict) -> str:
+    return result["benchmark"] + json.dumps(result["params"], sort_keys=True)
+
+def compare(current: dict, baseline: dict) -> None:
+    """Prints the median-time ratio of each benchmark to a baseline run."""
+    previous = {_key(r): r for r in baseline["results"]}
+    print(f"\n{'benchmark':<60} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for result in current["results"]:
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        label = f"{result['benchmark']} {json.dumps(result['params'], sort_keys=True)}"
+        print(f"{label:<60} {before['median_s']:>10.4f} {result['median_s']:>10.4f} {ratio:>7.2f}")
+
+def main(argv: List[str] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="run a reduced grid")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="fake LLM latency in seconds for batch benchmarks (default 0.05)")
+    parser.add_argument("--only", default="", help="only run benchmarks whose name starts with this")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="a previous JSON results file to compare against")
+    args = parser.parse_args(argv)
+
+    suites = [
+        ("handler", lambda: bench_handler(args.quick)),
+        ("prompts", lambda: bench_prompts(args.quick)),
+        ("explain", lambda: bench_explain(args.quick, args.latency)),
+        ("plot", lambda: bench_plots(args.quick)),
+    ]
+    results = []
+    for name, suite in suites:
+        if name.startswith(args.only) or args.only.startswith(name):
+            for result in suite():
+                if result["benchmark"].startswith(args.only):
+                    print(f"{result['benchmark']:<20} {json.dumps(result['params'], sort_keys=True):<55} "
+                          f"median {result['median_s'] * 1000:10.2f} ms")
+                    results.append(result)
+
+    report = {
+        "statlingua_version": statlingua.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "quick": args.quick,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -28,7 +28,8 @@ def run_agent_example():
     result = diagnose_agent(
         model_object=model,
         prompt=user_question,
-        model="gpt-4o"
+        model="gpt-4o",
+        plot_path="residual_plot.png"
     )
 
     print("\n--- Statlingua Agent Response ---")
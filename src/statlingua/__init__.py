@@ -1,9 +1,51 @@
 # src/statlingua/__init__.py
 
-# Make the main function available at the top level of the package
-from .explain import explain
-from .diagnostic import diagnose, diagnose_agent
+# The public API is loaded lazily: submodules (and with them litellm,
+# statsmodels and the plotting stack) are only imported when one of the
+# names below is first accessed, which keeps `import statlingua` cheap.
+import importlib
 
-__all__ = ["explain", "diagnose", "diagnose_agent"]
+# Map each public name to the submodule that defines it
+_LAZY_ATTRS = {
+    "explain": ".explain",
+    "aexplain": ".explain",
+    "explain_many": ".explain",
+    "aexplain_many": ".explain",
+    "explain_variants": ".explain",
+    "aexplain_variants": ".explain",
+    "explain_stream": ".explain",
+    "aexplain_stream": ".explain",
+    "ExplanationStream": ".explain",
+    "diagnose": ".diagnostic",
+    "diagnose_agent": ".diagnostic",
+    "DiagnosticSession": ".session",
+    "ResponseCache": ".cache",
+    "LRUCache": ".cache",
+    "SQLiteCache": ".cache",
+    "RecordReplayBackend": ".backends",
+    "set_backend": ".backends",
+    "use_backend": ".backends",
+    "RequestPolicy": ".policy",
+    "set_default_policy": ".policy",
+    "RateLimiter": ".ratelimit",
+    "SQLiteRateLimiter": ".ratelimit",
+    "set_rate_limiter": ".ratelimit",
+    "register_hook": ".instrumentation",
+    "unregister_hook": ".instrumentation",
+}
+
+__all__ = list(_LAZY_ATTRS)
 __version__ = "0.1.0"
 
+def __getattr__(name: str):
+    """Imports public names from their submodules on first access."""
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        # Cache on the package so later lookups bypass __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,314 @@
+# src/statlingua/backends.py
+
+# Completion backends.
+#
+# Every LLM request made by explain(), diagnose() and diagnose_agent() goes
+# through the active backend's `completion()` / `acompletion()`, which take
+# the same arguments as (and by default simply call) `litellm.completion` /
+# `litellm.acompletion`. Swapping the backend lets the whole pipeline run
+# against recorded responses, e.g. for deterministic tests or offline load
+# tests; see `RecordReplayBackend`.
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional
+
+from .cache import make_cache_key
+
+class CompletionBackend:
+    """Base class for completion backends.
+
+    Subclasses implement `completion()` and `acompletion()` with the
+    signature and return types of `litellm.completion` and
+    `litellm.acompletion` (including `stream=True`).
+    """
+
+    def completion(self, model: str, messages: list, **kwargs: Any) -> Any:
+        """Sends a chat completion request."""
+        raise NotImplementedError
+
+    async def acompletion(self, model: str, messages: list, **kwargs: Any) -> Any:
+        """Sends a chat completion request asynchronously."""
+        raise NotImplementedError
+
+class LiteLLMBackend(CompletionBackend):
+    """The default backend: calls the provider through litellm."""
+
+    def completion(self, model: str, messages: list, **kwargs: Any) -> Any:
+        import litellm
+
+        return litellm.completion(model=model, messages=messages, **kwargs)
+
+    async def acompletion(self, model: str, messages: list, **kwargs: Any) -> Any:
+        import litellm
+
+        return await litellm.acompletion(model=model, messages=messages, **kwargs)
+
+_DEFAULT_BACKEND = LiteLLMBackend()
+_backend: CompletionBackend = _DEFAULT_BACKEND
+
+def get_backend() -> CompletionBackend:
+    """Returns the backend that LLM requests are currently routed through."""
+    return _backend
+
+def set_backend(backend: Optional[CompletionBackend]) -> None:
+    """Routes all subsequent LLM requests through `backend`.
+
+    The setting is process-wide. Pass None to restore the default
+    :class:`LiteLLMBackend`.
+    """
+    global _backend
+    _backend = _DEFAULT_BACKEND if backend is None else backend
+
+@contextlib.contextmanager
+def use_backend(backend: CompletionBackend) -> Iterator[CompletionBackend]:
+    """Temporarily routes all LLM requests through `backend`.
+
+    Examples
+    --------
+    >>> with use_backend(RecordReplayBackend("run.jsonl", mode="replay")):  # doctest: +SKIP
+    ...     explain(fit, model="gpt-4o")
+    """
+    previous = get_backend()
+    set_backend(backend)
+    try:
+        yield backend
+    finally:
+        set_backend(previous)
+
+# Record/Replay ----------------------------------------------------------------
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request has no recorded response."""
+
+class SimulatedLLMError(RuntimeError):
+    """The error raised by `RecordReplayBackend` for injected failures."""
+
+def _plain_tool_calls(tool_calls: Any) -> list:
+    return [
+        {"id": call.id, "name": call.function.name, "arguments": call.function.arguments}
+        for call in tool_calls or []
+    ]
+
+def _plain_content(content: Any) -> Any:
+    """Replaces inline images with their digest so cassettes stay small."""
+    if not isinstance(content, list):
+        return content
+    parts = []
+    for part in content:
+        url = part.get("image_url", {}).get("url", "") if isinstance(part, dict) else ""
+        if url.startswith("data:"):
+            digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+            part = {**part, "image_url": {**part["image_url"], "url": f"sha256:{digest}"}}
+        parts.append(part)
+    return parts
+
+def _plain_message(message: Any) -> dict:
+    """Converts a message (a dict or a response message object) to plain JSON."""
+    if isinstance(message, dict):
+        plain = {k: v for k, v in message.items() if k != "content"}
+        plain["content"] = _plain_content(message.get("content"))
+        return plain
+    plain = {"role": getattr(message, "role", "assistant"), "content": message.content}
+    if getattr(message, "tool_calls", None):
+        plain["tool_calls"] = _plain_tool_calls(message.tool_calls)
+    return plain
+
+def _serialize_response(response: Any) -> dict:
+    from .completion import response_usage
+
+    message = response.choices[0].message
+    return {
+        "content": message.content,
+        "tool_calls": _plain_tool_calls(getattr(message, "tool_calls", None)),
+        "usage": response_usage(response),
+    }
+
+def _build_response(record: dict) -> SimpleNamespace:
+    """Rebuilds a litellm-like response object from a recorded response."""
+    tool_calls = [
+        SimpleNamespace(
+            id=call["id"], type="function",
+            function=SimpleNamespace(name=call["name"], arguments=call["arguments"]),
+        )
+        for call in record.get("tool_calls") or []
+    ]
+    message = SimpleNamespace(
+        role="assistant", content=record.get("content"), tool_calls=tool_calls or None
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=_build_usage(record))
+
+def _build_usage(record: dict) -> SimpleNamespace:
+    usage = dict(record.get("usage") or {})
+    usage["prompt_tokens_details"] = SimpleNamespace(cached_tokens=usage.pop("cached_tokens", None))
+    return SimpleNamespace(**usage)
+
+def _stream_chunks(record: dict, size: int = 16) -> Iterator[SimpleNamespace]:
+    text = record.get("content") or ""
+    for start in range(0, len(text), size):
+        delta = SimpleNamespace(content=text[start:start + size])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+    if (record.get("usage") or {}).get("prompt_tokens") is not None:
+        # Like providers asked to include usage, report it on a final chunk
+        yield SimpleNamespace(choices=[], usage=_build_usage(record))
+
+class RecordReplayBackend(CompletionBackend):
+    """Records LLM responses to a cassette file and replays them offline.
+
+    Requests are identified by the same key as the response cache (model,
+    messages and result-affecting kwargs; see
+    :func:`statlingua.cache.make_cache_key`), with inline images replaced by
+    their digests. The cassette is a JSON Lines file with one request and
+    its response per line.
+
+    Parameters
+    ----------
+    path : str
+        The cassette file. In record mode, new entries are appended to it.
+    mode : str, optional
+        "record" forwards requests to `backend` and saves the responses;
+        "replay" (the default) serves responses from the cassette without
+        any network access.
+    backend : CompletionBackend, optional
+        The backend to record from, by default :class:`LiteLLMBackend`.
+    latency : float, optional
+        Simulated seconds per replayed response, by default 0.0 (memory
+        speed). For streamed responses this is the time to the first chunk.
+    error_rate : float, optional
+        The probability, between 0 and 1, that a replayed request raises
+        :class:`SimulatedLLMError` instead, by default 0.0.
+    seed : int, optional
+        Seeds the error injection for reproducible runs, by default None.
+
+    Examples
+    --------
+    >>> with use_backend(RecordReplayBackend("run.jsonl", mode="record")):  # doctest: +SKIP
+    ...     explain(fit, model="gpt-4o")
+    >>> replay = RecordReplayBackend("run.jsonl", latency=0.2, error_rate=0.05)  # doctest: +SKIP
+    >>> with use_backend(replay):  # doctest: +SKIP
+    ...     explain_many(fits * 100, model="gpt-4o", max_concurrency=32)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        backend: CompletionBackend = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError("`mode` must be either 'record' or 'replay'.")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("`error_rate` must be between 0 and 1.")
+        self.path = path
+        self.mode = mode
+        self.backend = _DEFAULT_BACKEND if backend is None else backend
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # Responses by request key; repeated requests are served in turn
+        self._responses: dict = {}
+        self._served: dict = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as cassette:
+                for line in cassette:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._responses.setdefault(entry["key"], []).append(entry["response"])
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def _key(self, model: str, messages: list, kwargs: dict) -> tuple:
+        plain = [_plain_message(message) for message in messages]
+        return make_cache_key(model, plain, **kwargs), plain
+
+    def _record(self, key: str, model: str, plain: list, response: dict) -> None:
+        entry = {"key": key, "model": model, "messages": plain, "response": response}
+        with self._lock:
+            self._responses.setdefault(key, []).append(response)
+            with open(self.path, "a", encoding="utf-8") as cassette:
+                cassette.write(json.dumps(entry, default=repr) + "\n")
+
+    def _lookup(self, key: str) -> dict:
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise CassetteMissError(f"No recorded response for request {key[:12]} in {self.path!r}.")
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        if fail:
+            raise SimulatedLLMError("Simulated provider error (injected by RecordReplayBackend).")
+        return responses[index % len(responses)]
+
+    def _record_stream(self, key: str, model: str, plain: list, chunks: Any) -> Iterator[Any]:
+        from .completion import _chunk_text, _chunk_usage
+
+        parts = []
+        usage = None
+        for chunk in chunks:
+            parts.append(_chunk_text(chunk))
+            usage = _chunk_usage(chunk) or usage
+            yield chunk
+        response = {"content": "".join(parts), "tool_calls": [], "usage": usage or {}}
+        self._record(key, model, plain, response)
+
+    async def _arecord_stream(self, key: str, model: str, plain: list, chunks: Any):
+        from .completion import _chunk_text, _chunk_usage
+
+        parts = []
+        usage = None
+        async for chunk in chunks:
+            parts.append(_chunk_text(chunk))
+            usage = _chunk_usage(chunk) or usage
+            yield chunk
+        response = {"content": "".join(parts), "tool_calls": [], "usage": usage or {}}
+        self._record(key, model, plain, response)
+
+    def completion(self, model: str, messages: list, stream: bool = False, **kwargs: Any) -> Any:
+        key, plain = self._key(model, messages, kwargs)
+        if self.mode == "record":
+            response = self.backend.completion(model=model, messages=messages, stream=stream, **kwargs)
+            if stream:
+                return self._record_stream(key, model, plain, response)
+            self._record(key, model, plain, _serialize_response(response))
+            return response
+
+        record = self._lookup(key)
+        if self.latency:
+            time.sleep(self.latency)
+        if stream:
+            return _stream_chunks(record)
+        return _build_response(record)
+
+    async def acompletion(self, model: str, messages: list, stream: bool = False, **kwargs: Any) -> Any:
+        key, plain = self._key(model, messages, kwargs)
+        if self.mode == "record":
+            response = await self.backend.acompletion(
+                model=model, messages=messages, stream=stream, **kwargs
+            )
+            if stream:
+                return self._arecord_stream(key, model, plain, response)
+            self._record(key, model, plain, _serialize_response(response))
+            return response
+
+        record = self._lookup(key)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if stream:
+            async def _chunks():
+                for chunk in _stream_chunks(record):
+                    yield chunk
+            return _chunks()
+        return _build_response(record)
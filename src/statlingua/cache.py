@@ -0,0 +1,215 @@
+# src/statlingua/cache.py
+
+# Response caches for LLM completions.
+#
+# A cache maps a key derived from everything that affects an LLM response
+# (the model string, the full message list and result-affecting kwargs) to
+# the stored response. Backends only need to implement `get()` and `set()`,
+# so users can plug in their own (e.g., Redis) by subclassing `ResponseCache`.
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Keyword arguments that change how a request is sent, but not what the LLM
+# is asked to do; these are left out of the cache key.
+NON_KEY_KWARGS = frozenset({
+    "api_key", "api_base", "base_url", "api_version", "organization",
+    "timeout", "request_timeout", "num_retries", "max_retries",
+    "metadata", "extra_headers", "headers", "caching", "stream", "stream_options",
+})
+
+def make_cache_key(model: str, messages: list, **kwargs: Any) -> str:
+    """Builds a stable cache key for an LLM request.
+
+    Parameters
+    ----------
+    model : str
+        The model string for the LLM provider.
+    messages : list
+        The full list of messages (system and user prompts) sent to the LLM.
+    **kwargs : Any
+        Additional keyword arguments passed to the completion call. Only
+        result-affecting arguments (e.g., `temperature`) enter the key.
+
+    Returns
+    -------
+    str
+        A hex-encoded SHA-256 digest identifying the request.
+    """
+    key_kwargs = {k: v for k, v in kwargs.items() if k not in NON_KEY_KWARGS}
+    payload = json.dumps(
+        {"model": model, "messages": messages, "kwargs": key_kwargs},
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """Base class for response caches.
+
+    Subclasses must implement `get()` and `set()`. Stored values are
+    JSON-serializable dictionaries (e.g., `{"text": ...}`).
+    """
+
+    def get(self, key: str) -> Optional[dict]:
+        """Returns the cached value for `key`, or None on a miss."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: dict) -> None:
+        """Stores `value` under `key`."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        raise NotImplementedError
+
+class LRUCache(ResponseCache):
+    """An in-process, thread-safe least-recently-used cache.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of responses to keep. Defaults to 1024.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be a positive integer.")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class SQLiteCache(ResponseCache):
+    """A persistent cache stored in a SQLite database on disk.
+
+    Parameters
+    ----------
+    path : str
+        The path to the SQLite database file. It is created if needed.
+    ttl : float, optional
+        The time-to-live of an entry in seconds. Expired entries are never
+        returned and are purged on write. Defaults to None (no expiry).
+    max_entries : int, optional
+        The maximum number of entries to keep. When exceeded, the least
+        recently used entries are evicted. Defaults to None (unbounded).
+
+    Notes
+    -----
+    A hit is a pure read. Access times are buffered in memory and written
+    in the transaction of the next `set()` (before any eviction), after
+    `max_pending_touches` hits, or on `close()`.
+    """
+
+    # The number of buffered access times that forces a write on a hit
+    max_pending_touches = 1024
+
+    def __init__(self, path: str, ttl: float = None, max_entries: int = None):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Access times of hits not yet written, by key
+        self._touched: dict = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses (accessed)"
+            )
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= self.max_pending_touches:
+                with self._conn:
+                    self._flush_touches()
+        return json.loads(value)
+
+    def _flush_touches(self) -> None:
+        """Writes the buffered access times (inside the caller's lock and transaction)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET accessed = max(accessed, ?) WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def set(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._flush_touches()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            if self.ttl is not None:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE created < ?", (now - self.ttl,)
+                )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed DESC"
+                    " LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Writes buffered access times and closes the database connection."""
+        with self._lock:
+            with self._conn:
+                self._flush_touches()
+            self._conn.close()
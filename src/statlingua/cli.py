@@ -0,0 +1,283 @@
+# src/statlingua/cli.py
+
+# The `statlingua` command: batch explanations and diagnostics.
+#
+# Inputs are pickled model results (*.pkl, *.pickle; one object per file)
+# and JSON Lines files of pre-rendered summaries (*.jsonl; one object per
+# line with a "summary" and optionally "id", "model_type" and "context"),
+# given as files or directories. They are streamed lazily, processed by a
+# thread pool with a bounded number of items in flight, and the results
+# are appended to a JSONL file as they complete, so memory use does not
+# grow with the number of inputs. Completed items are recorded by hash in
+# a SQLite checkpoint; re-running the same command skips them. The hash
+# covers the item's path (and line), so identical inputs under different
+# names each get their own output record.
+#
+# Only unpickle files you trust: loading a pickle can run arbitrary code.
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator, List, NamedTuple
+
+PICKLE_SUFFIXES = (".pkl", ".pickle")
+JSONL_SUFFIXES = (".jsonl",)
+
+class Item(NamedTuple):
+    """One input: a stable id, a hash of its id and content, and a loader.
+
+    The loader returns the model object and a dictionary of per-item
+    fields ('id' and 'context' for JSONL records).
+    """
+
+    id: str
+    hash: str
+    load: Callable[[], Any]
+
+class Checkpoint:
+    """The hashes of completed items, stored in a SQLite database.
+
+    Lookups go to disk, so memory use does not depend on the number of
+    completed items.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS done (hash TEXT PRIMARY KEY)")
+
+    def __contains__(self, item_hash: str) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM done WHERE hash = ?", (item_hash,)
+        ).fetchone() is not None
+
+    def add(self, item_hash: str) -> None:
+        with self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO done (hash) VALUES (?)", (item_hash,))
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM done").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+def _hash(salt: str, item_id: str, data: bytes) -> str:
+    digest = hashlib.sha256(salt.encode("utf-8") + b"\0" + item_id.encode("utf-8") + b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+def _walk(path: str) -> Iterator[str]:
+    """Yields input files below `path` in a stable order, one directory at a time."""
+    if not os.path.isdir(path):
+        yield path
+        return
+    with os.scandir(path) as entries:
+        names = sorted(entry.name for entry in entries)
+    for name in names:
+        child = os.path.join(path, name)
+        if os.path.isdir(child):
+            yield from _walk(child)
+        elif name.endswith(PICKLE_SUFFIXES + JSONL_SUFFIXES):
+            yield child
+
+def _load_record(line: bytes) -> tuple:
+    """Parses a JSONL record into a pre-rendered summary and its fields."""
+    from .model_handlers import RenderedSummary
+
+    record = json.loads(line)
+    if not isinstance(record, dict) or not isinstance(record.get("summary"), str):
+        raise ValueError("JSONL records must be objects with a string 'summary'.")
+    fields = {key: record[key] for key in ("id", "context") if record.get(key) is not None}
+    return RenderedSummary(record["summary"], record.get("model_type") or "default"), fields
+
+def iter_items(paths: List[str], salt: str = "") -> Iterator[Item]:
+    """Lazily yields the items in the given files and directories.
+
+    Parameters
+    ----------
+    paths : list[str]
+        Pickle files, JSONL files or directories containing them.
+    salt : str, optional
+        Mixed into every item hash, so that the same input processed with
+        different settings is not considered done. The hash also covers
+        the item's path (and line number), so identical inputs at different
+        locations are separate items.
+
+    Yields
+    ------
+    Item
+        The items, in a stable order.
+    """
+    for path in paths:
+        for filepath in _walk(path):
+            if filepath.endswith(JSONL_SUFFIXES):
+                with open(filepath, "rb") as f:
+                    for lineno, line in enumerate(f, start=1):
+                        if not line.strip():
+                            continue
+                        item_id = f"{filepath}:{lineno}"
+                        yield Item(
+                            item_id, _hash(salt, item_id, line),
+                            lambda line=line: _load_record(line),
+                        )
+            elif filepath.endswith(PICKLE_SUFFIXES):
+                with open(filepath, "rb") as f:
+                    data = f.read()
+                yield Item(
+                    filepath, _hash(salt, filepath, data),
+                    lambda data=data: (pickle.loads(data), {}),
+                )
+            else:
+                raise ValueError(f"Unsupported input file {filepath!r}.")
+
+def _process(item: Item, args: argparse.Namespace) -> dict:
+    """Runs explain() or diagnose() on one item and returns its output record."""
+    from .diagnostic import diagnose
+    from .explain import explain
+
+    record = {"id": item.id, "hash": item.hash}
+    try:
+        model_object, fields = item.load()
+        record["id"] = str(fields.get("id", item.id))
+        context = fields.get("context", args.context)
+        if args.command == "explain":
+            result = explain(
+                model_object, model=args.model, context=context, audience=args.audience,
+                verbosity=args.verbosity, style=args.style,
+                max_prompt_tokens=args.max_prompt_tokens,
+            )
+        else:
+            result = diagnose(
+                model_object, prompt=args.prompt, model=args.model,
+                max_prompt_tokens=args.max_prompt_tokens,
+            )
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    record.update(result)
+    return record
+
+def run(
+    items: Iterator[Item],
+    process: Callable[[Item], dict],
+    output: str,
+    checkpoint: Checkpoint,
+    concurrency: int = 8,
+) -> dict:
+    """Processes items concurrently, appending results to `output`.
+
+    At most `2 * concurrency` items are loaded or in flight at any time.
+    Each successful result is written (and flushed) before its hash is
+    added to the checkpoint, so an interrupted run loses no finished work;
+    failed items are written with an 'error' field and retried next time.
+
+    Returns
+    -------
+    dict
+        The counts of 'processed', 'skipped' and 'failed' items.
+    """
+    if concurrency < 1:
+        raise ValueError("`concurrency` must be a positive integer.")
+    counts = {"processed": 0, "skipped": 0, "failed": 0}
+
+    with open(output, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+
+        def _drain(block_until: int) -> None:
+            nonlocal pending
+            while len(pending) > block_until:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = future.result()
+                    out.write(json.dumps(record, default=str) + "\n")
+                    out.flush()
+                    if "error" in record:
+                        counts["failed"] += 1
+                    else:
+                        checkpoint.add(record["hash"])
+                        counts["processed"] += 1
+
+        for item in items:
+            if item.hash in checkpoint:
+                counts["skipped"] += 1
+                continue
+            _drain(2 * concurrency - 1)
+            pending.add(pool.submit(process, item))
+        _drain(0)
+    return counts
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="statlingua",
+        description="Explain or diagnose many statistical models with an LLM.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    explain_parser = commands.add_parser("explain", help="explain each model")
+    diagnose_parser = commands.add_parser("diagnose", help="answer a diagnostic question per model")
+    diagnose_parser.add_argument("--prompt", required=True, help="the diagnostic question")
+    explain_parser.add_argument("--audience", default="novice")
+    explain_parser.add_argument("--verbosity", default="moderate")
+    explain_parser.add_argument("--style", default="markdown")
+
+    for sub in (explain_parser, diagnose_parser):
+        sub.add_argument("inputs", nargs="+",
+                         help="pickle (.pkl, .pickle) or JSONL (.jsonl) files, or directories")
+        sub.add_argument("--model", required=True, help="the LLM model string (e.g., gpt-4o)")
+        sub.add_argument("--output", "-o", required=True, help="the JSONL file results are appended to")
+        sub.add_argument("--checkpoint",
+                         help="the checkpoint database (default: OUTPUT.checkpoint.db)")
+        sub.add_argument("--concurrency", "-j", type=int, default=8,
+                         help="the number of items processed at once (default 8)")
+        sub.add_argument("--context", help="additional context for every model")
+        sub.add_argument("--max-prompt-tokens", type=int, help="a token budget for each summary")
+        sub.add_argument("--requests-per-minute", type=float, help="rate-limit LLM requests")
+        sub.add_argument("--tokens-per-minute", type=float, help="rate-limit LLM tokens")
+    return parser
+
+def main(argv: List[str] = None) -> int:
+    """Entry point of the `statlingua` console script."""
+    args = _parser().parse_args(argv)
+    if args.requests_per_minute or args.tokens_per_minute:
+        from .ratelimit import RateLimiter, set_rate_limiter
+
+        set_rate_limiter(RateLimiter(
+            requests_per_minute=args.requests_per_minute,
+            tokens_per_minute=args.tokens_per_minute,
+        ))
+
+    # Settings that change the output are part of every item's hash
+    settings = {
+        key: getattr(args, key, None)
+        for key in ("command", "model", "audience", "verbosity", "style", "prompt",
+                    "context", "max_prompt_tokens")
+    }
+    salt = json.dumps(settings, sort_keys=True)
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint.db")
+    try:
+        counts = run(
+            iter_items(args.inputs, salt),
+            lambda item: _process(item, args),
+            args.output,
+            checkpoint,
+            concurrency=args.concurrency,
+        )
+    finally:
+        checkpoint.close()
+    print(
+        f"statlingua: {counts['processed']} processed, {counts['skipped']} skipped "
+        f"(already done), {counts['failed']} failed",
+        file=sys.stderr,
+    )
+    return 1 if counts["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+# src/statlingua/completion.py
+
+# A thin layer around `litellm.completion` shared by explain() and
+# diagnose(). Keeping every call site behind these helpers means features
+# like response caching only need to be implemented once. Requests go
+# through the active completion backend (see backends.py), which imports
+# litellm on first use so that importing statlingua stays cheap, under a
+# request policy (deadlines, retries and hedging; see policy.py) and, if
+# one is set, the process-wide rate limiter (see ratelimit.py).
+
+from typing import Any, AsyncIterator, Callable, Iterator, Tuple
+
+from .backends import get_backend
+from .cache import ResponseCache, make_cache_key
+from .policy import RequestPolicy, get_default_policy
+from .ratelimit import estimate_request_tokens, get_rate_limiter
+
+def response_usage(response: Any) -> dict:
+    """Extracts the token counts from a litellm response's `usage`.
+
+    Returns the keys 'prompt_tokens', 'completion_tokens' and
+    'cached_tokens' (prompt tokens served from the provider's prompt
+    cache). Counts the provider did not report are None.
+    """
+    usage = getattr(response, "usage", None)
+    counts = {}
+    for field in ("prompt_tokens", "completion_tokens"):
+        value = getattr(usage, field, None)
+        counts[field] = value if isinstance(value, int) else None
+    # OpenAI-style usage reports cached tokens in the prompt token details;
+    # litellm's Anthropic responses also carry `cache_read_input_tokens`
+    cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+    if not isinstance(cached, int):
+        cached = getattr(usage, "cache_read_input_tokens", None)
+    counts["cached_tokens"] = cached if isinstance(cached, int) else None
+    return counts
+
+def supports_cache_control(model: str) -> bool:
+    """Returns True if `model` only caches prompt prefixes marked with `cache_control`.
+
+    Anthropic's Claude models (directly or through Bedrock and Vertex AI)
+    cache a prefix only up to an explicit `cache_control` marker. OpenAI,
+    DeepSeek and others cache long prefixes automatically, so they need
+    no markers.
+    """
+    model = model.lower()
+    return model.startswith("anthropic/") or "claude" in model
+
+def _settle(limiter: Any, model: str, estimated: int, usage: dict) -> None:
+    """Corrects a rate-limiter reservation with the reported token usage."""
+    if usage["prompt_tokens"] is not None and usage["completion_tokens"] is not None:
+        limiter.settle(model, estimated, usage["prompt_tokens"] + usage["completion_tokens"])
+
+def _request_tokens(messages: list, kwargs: dict) -> int:
+    """The rate-limiter token estimate for a request."""
+    max_tokens = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens")
+    return estimate_request_tokens(messages, max_tokens)
+
+def _gate(limiter: Any, tokens: int) -> Callable:
+    """The policy gate that reserves rate-limiter capacity for each request.
+
+    Attempts wait for capacity; hedges are only sent if it is free now.
+    """
+    def gate(model: str, block: bool) -> bool:
+        if block:
+            limiter.acquire(model, tokens)
+            return True
+        return limiter.try_reserve(model, tokens)
+    return gate
+
+def _agate(limiter: Any, tokens: int) -> Callable:
+    """Asynchronous version of :func:`_gate`."""
+    async def gate(model: str, block: bool) -> bool:
+        if block:
+            await limiter.aacquire(model, tokens)
+            return True
+        return limiter.try_reserve(model, tokens)
+    return gate
+
+def _settled(fn: Callable, limiter: Any, tokens: int) -> Callable:
+    """Wraps a backend's `completion` to settle reservations with the reported usage.
+
+    Streamed responses are settled by the caller once the final chunk has
+    arrived.
+    """
+    def call(model: str, messages: list, **kwargs: Any) -> Any:
+        response = fn(model=model, messages=messages, **kwargs)
+        if not kwargs.get("stream"):
+            _settle(limiter, model, tokens, response_usage(response))
+        return response
+    return call
+
+def _asettled(afn: Callable, limiter: Any, tokens: int) -> Callable:
+    """Asynchronous version of :func:`_settled`."""
+    async def call(model: str, messages: list, **kwargs: Any) -> Any:
+        response = await afn(model=model, messages=messages, **kwargs)
+        if not kwargs.get("stream"):
+            _settle(limiter, model, tokens, response_usage(response))
+        return response
+    return call
+
+def send(
+    model: str,
+    messages: list,
+    policy: RequestPolicy = None,
+    hedge: bool = True,
+    **kwargs: Any,
+) -> Tuple[Any, dict]:
+    """Sends one request through the backend, rate limiter and request policy.
+
+    Every statlingua LLM call goes through this function (or
+    :func:`asend`). Each attempt the policy makes, including retries,
+    first waits for the active rate limiter, outside the attempt's
+    timeout; a hedged request is only sent if the limiter has capacity
+    right away.
+
+    Parameters
+    ----------
+    model : str
+        The model string for the LLM provider (e.g., "gpt-4o").
+    messages : list
+        The messages to send to the LLM.
+    policy : RequestPolicy, optional
+        The request policy, by default the process-wide default.
+    hedge : bool, optional
+        Whether the policy may hedge the request, by default True.
+    **kwargs : Any
+        Additional keyword arguments to pass to `litellm.completion`.
+
+    Returns
+    -------
+    tuple[Any, dict]
+        The litellm response and the policy's statistics (see
+        :meth:`statlingua.policy.RequestPolicy.call`).
+    """
+    policy = get_default_policy() if policy is None else policy
+    fn = get_backend().completion
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return policy.call(fn, model, messages, hedge=hedge, **kwargs)
+    tokens = _request_tokens(messages, kwargs)
+    return policy.call(
+        _settled(fn, limiter, tokens), model, messages, hedge=hedge,
+        gate=_gate(limiter, tokens), **kwargs
+    )
+
+async def asend(
+    model: str,
+    messages: list,
+    policy: RequestPolicy = None,
+    hedge: bool = True,
+    **kwargs: Any,
+) -> Tuple[Any, dict]:
+    """Asynchronous version of :func:`send` using `litellm.acompletion`."""
+    policy = get_default_policy() if policy is None else policy
+    afn = get_backend().acompletion
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return await policy.acall(afn, model, messages, hedge=hedge, **kwargs)
+    tokens = _request_tokens(messages, kwargs)
+    return await policy.acall(
+        _asettled(afn, limiter, tokens), model, messages, hedge=hedge,
+        gate=_agate(limiter, tokens), **kwargs
+    )
+
+def complete(
+    model: str,
+    messages: list,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> dict:
+    """Sends a chat completion request, consulting a response cache first.
+
+    Parameters
+    ----------
+    model : str
+        The model string for the LLM provider (e.g., "gpt-4o").
+    messages : list
+        The messages to send to the LLM.
+    cache : ResponseCache, optional
+        A response cache to read from and write to, by default None.
+    policy : RequestPolicy, optional
+        The deadline, retry and hedging policy for the request, by default
+        the process-wide default (see
+        :func:`statlingua.policy.set_default_policy`).
+    **kwargs : Any
+        Additional keyword arguments to pass to `litellm.completion`.
+
+    Returns
+    -------
+    dict
+        A dictionary with keys 'text' (the response content), 'cached'
+        (whether the response was served from the cache), 'usage' (the
+        prompt and completion token counts; None on a cache hit),
+        'retries' (the number of retried requests) and 'hedged' (whether a
+        hedged duplicate request was sent).
+    """
+    key = None
+    if cache is not None:
+        key = make_cache_key(model, messages, **kwargs)
+        hit = cache.get(key)
+        if hit is not None:
+            return {"text": hit["text"], "cached": True, "usage": None, "retries": 0, "hedged": False}
+
+    response, stats = send(model, messages, policy=policy, **kwargs)
+    text = response.choices[0].message.content
+
+    if cache is not None:
+        cache.set(key, {"text": text})
+    return {"text": text, "cached": False, "usage": response_usage(response), **stats}
+
+async def acomplete(
+    model: str,
+    messages: list,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> dict:
+    """Asynchronous version of :func:`complete` using `litellm.acompletion`."""
+    key = None
+    if cache is not None:
+        key = make_cache_key(model, messages, **kwargs)
+        hit = cache.get(key)
+        if hit is not None:
+            return {"text": hit["text"], "cached": True, "usage": None, "retries": 0, "hedged": False}
+
+    response, stats = await asend(model, messages, policy=policy, **kwargs)
+    text = response.choices[0].message.content
+
+    if cache is not None:
+        cache.set(key, {"text": text})
+    return {"text": text, "cached": False, "usage": response_usage(response), **stats}
+
+def _chunk_text(chunk: Any) -> str:
+    """Extracts the text delta from a streamed litellm chunk."""
+    try:
+        return chunk.choices[0].delta.content or ""
+    except (AttributeError, IndexError):
+        return ""
+
+def _chunk_usage(chunk: Any) -> Any:
+    """Returns the token counts carried by a streamed chunk, or None.
+
+    With `stream_options={"include_usage": True}`, providers report the
+    usage of the whole response on the final chunk.
+    """
+    usage = response_usage(chunk)
+    return usage if usage["prompt_tokens"] is not None else None
+
+# Asks providers to report token usage at the end of a stream
+STREAM_OPTIONS = {"stream_options": {"include_usage": True}}
+
+def _finish_stream(model: str, messages: list, limiter: Any, usage: Any, kwargs: dict) -> None:
+    """Settles the rate-limiter reservation of a finished stream."""
+    if limiter is not None and usage is not None:
+        _settle(limiter, model, _request_tokens(messages, kwargs), usage)
+
+def stream_complete(
+    model: str,
+    messages: list,
+    cache: ResponseCache = None,
+    status: dict = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> Iterator[str]:
+    """Streams a chat completion, yielding text chunks as they arrive.
+
+    Parameters
+    ----------
+    model : str
+        The model string for the LLM provider (e.g., "gpt-4o").
+    messages : list
+        The messages to send to the LLM.
+    cache : ResponseCache, optional
+        A response cache. On a hit, the cached text is yielded as a single
+        chunk; on a miss, the full streamed text is stored once complete.
+    status : dict, optional
+        A dictionary that is filled with the keys 'text', 'cached' and
+        'usage' (the token counts reported on the final chunk, or None)
+        once the stream has been exhausted.
+    policy : RequestPolicy, optional
+        The request policy, by default the process-wide default. Only the
+        request that opens the stream is retried or timed out; hedging is
+        not used for streams.
+    **kwargs : Any
+        Additional keyword arguments to pass to `litellm.completion`.
+
+    Yields
+    ------
+    str
+        The text chunks of the response.
+    """
+    status = {} if status is None else status
+    key = None
+    if cache is not None:
+        key = make_cache_key(model, messages, **kwargs)
+        hit = cache.get(key)
+        if hit is not None:
+            status.update(text=hit["text"], cached=True, usage=None)
+            yield hit["text"]
+            return
+
+    parts = []
+    usage = None
+    limiter = get_rate_limiter()
+    response, _ = send(
+        model, messages, policy=policy, hedge=False, stream=True, **{**STREAM_OPTIONS, **kwargs}
+    )
+    for chunk in response:
+        text = _chunk_text(chunk)
+        if text:
+            parts.append(text)
+            yield text
+        usage = _chunk_usage(chunk) or usage
+    _finish_stream(model, messages, limiter, usage, kwargs)
+
+    text = "".join(parts)
+    if cache is not None:
+        cache.set(key, {"text": text})
+    status.update(text=text, cached=False, usage=usage)
+
+async def astream_complete(
+    model: str,
+    messages: list,
+    cache: ResponseCache = None,
+    status: dict = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> AsyncIterator[str]:
+    """Asynchronous version of :func:`stream_complete`."""
+    status = {} if status is None else status
+    key = None
+    if cache is not None:
+        key = make_cache_key(model, messages, **kwargs)
+        hit = cache.get(key)
+        if hit is not None:
+            status.update(text=hit["text"], cached=True, usage=None)
+            yield hit["text"]
+            return
+
+    parts = []
+    usage = None
+    limiter = get_rate_limiter()
+    response, _ = await asend(
+        model, messages, policy=policy, hedge=False, stream=True, **{**STREAM_OPTIONS, **kwargs}
+    )
+    async for chunk in response:
+        text = _chunk_text(chunk)
+        if text:
+            parts.append(text)
+            yield text
+        usage = _chunk_usage(chunk) or usage
+    _finish_stream(model, messages, limiter, usage, kwargs)
+
+    text = "".join(parts)
+    if cache is not None:
+        cache.set(key, {"text": text})
+    status.update(text=text, cached=False, usage=usage)
@@ -1,17 +1,26 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+# matplotlib and seaborn are imported inside the functions that need them
+# (and litellm by the completion backend), so importing this module does not
+# load the plotting stack.
 import base64
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-from typing import Any
-import litellm
+from typing import Any, Iterable, Union
 
-from .model_handlers import get_handler
+from .cache import ResponseCache
+from .completion import complete, response_usage, send
+from .instrumentation import Metrics
+from .policy import RequestPolicy
+from .model_handlers import extract_summary, memoize_per_model
 
 def diagnose(
     model_object: Any,
     prompt: str,
     model: str,
+    max_prompt_tokens: int = None,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
     **kwargs: Any,
 ) -> dict:
     """
@@ -29,17 +38,30 @@ def diagnose(
         The user's question about model diagnostics (e.g., "Is this a good model?").
     model : str
         The model string for the LLM provider (e.g., "gpt-4o").
+    max_prompt_tokens : int, optional
+        An (estimated) token budget for the model summary; larger summaries
+        are compacted to their most significant coefficients. Defaults to
+        None (no limit).
+    cache : ResponseCache, optional
+        A response cache to consult before calling the LLM, by default None.
+    policy : RequestPolicy, optional
+        The deadline, retry and hedging policy for the LLM request, by
+        default the process-wide default policy.
     **kwargs : Any
         Additional keyword arguments to pass to `litellm.completion`.
 
     Returns
     -------
     dict
-        A dictionary containing the LLM's diagnostic advice.
+        A dictionary containing the LLM's diagnostic advice, with keys
+        'text', 'cached' and 'metrics' (stage timings and token usage, see
+        :class:`statlingua.instrumentation.Metrics`).
     """
+    metrics = Metrics("diagnose")
+
     # 1. Get the model's summary using the existing handler system
-    handler = get_handler(model_object)
-    model_name, summary_text = handler(model_object)
+    with metrics.stage("handler"):
+        model_name, summary_text = extract_summary(model_object, max_tokens=max_prompt_tokens)
 
     # 2. Create a system prompt that primes the LLM for diagnostics
     system_prompt = (
@@ -59,59 +81,427 @@ def diagnose(
     )
 
     # 4. Call the LLM
-    response = litellm.completion(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        **kwargs,
-    )
+    with metrics.stage("llm"):
+        result = complete(
+            model,
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            cache=cache,
+            policy=policy,
+            **kwargs,
+        )
+    metrics.add_call(result)
 
     # 5. Return the response
     return {
-        "text": response.choices[0].message.content
+        "text": result["text"],
+        "cached": result["cached"],
+        "metrics": metrics.emit(),
     }
 
 # --- Agentic Tools ---
 
-def plot_residuals_vs_fitted(model_object: Any) -> str:
+def _new_figure(figsize: tuple = (8, 6)):
+    """Creates a standalone Agg figure that is not registered with pyplot.
+
+    Figures created this way hold no global state, so tools can render
+    plots concurrently from several threads.
     """
-    Generates and saves a residuals vs. fitted values plot.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def _save_png(png: bytes, filepath: str) -> None:
+    """Writes PNG bytes to a file."""
+    with open(filepath, "wb") as image_file:
+        image_file.write(png)
+
+def _figure_to_png(fig, filepath: str = None) -> bytes:
+    """Renders a figure to PNG bytes in memory, optionally saving a copy."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    png = buffer.getvalue()
+    if filepath is not None:
+        _save_png(png, filepath)
+    return png
+
+# Formats accepted by `diagnose_agent(image_format=...)`, with their MIME types
+IMAGE_FORMATS = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+def _encode_image(
+    png: bytes,
+    max_size: int = None,
+    image_format: str = "png",
+    colors: int = None,
+    quality: int = 80,
+) -> bytes:
+    """Re-encodes a rendered PNG for the vision payload.
+
+    The image is downscaled so that its longer side is at most `max_size`
+    pixels, then written as a palette PNG with `colors` colors (plots use
+    few colors, so this is nearly lossless), a plain PNG, or a JPEG/WebP at
+    the given `quality`.
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png)).convert("RGB")
+    if max_size is not None and max(image.size) > max_size:
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    if image_format == "png":
+        if colors is not None:
+            image = image.quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+        image.save(buffer, format="PNG")
+    else:
+        image.save(buffer, format=image_format.upper(), quality=quality)
+    return buffer.getvalue()
+
+# Above this many observations, residual plots switch to a subsampled density
+# view with a binned smoother; full LOWESS is quadratic-ish in n (about 0.5s
+# at 3,000 points, 1s at 5,000 and 10s at 20,000) and a scatter of millions
+# of points is pure overplotting.
+LARGE_N_THRESHOLD = 3_000
+
+# The number of observations drawn for the density view; hexbin and the
+# binned smoother handle this many in well under a second.
+LARGE_N_SAMPLE_SIZE = 100_000
+
+def _binned_residual_smoother(fitted, residuals, n_bins: int = 40):
+    """Summarizes residuals within quantile bins of the fitted values.
+
+    Returns the bin centres and the per-bin mean and standard deviation of
+    the residuals. The mean traces non-linearity (like a LOWESS curve) and
+    the spread traces heteroscedasticity.
+    """
+    import numpy as np
+
+    edges = np.unique(np.quantile(fitted, np.linspace(0, 1, n_bins + 1)))
+    n_bins = max(len(edges) - 1, 1)
+    bins = np.clip(np.searchsorted(edges, fitted, side="right") - 1, 0, n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    keep = counts > 0
+    counts = counts[keep]
+    centres = (np.bincount(bins, fitted, n_bins)[keep]) / counts
+    means = np.bincount(bins, residuals, n_bins)[keep] / counts
+    mean_sq = np.bincount(bins, residuals * residuals, n_bins)[keep] / counts
+    sds = np.sqrt(np.maximum(mean_sq - means * means, 0.0))
+    return centres, means, sds
+
+def _draw_large_n_residuals(ax, fitted, residuals, max_points: int, seed: int = 0) -> int:
+    """Draws a hexbin density of (a subsample of) residuals vs. fitted values.
+
+    At most `max_points` observations, drawn uniformly at random without
+    replacement, are rendered, so the cost is bounded regardless of n.
+    Returns the number of observations plotted.
+    """
+    import numpy as np
+
+    fitted = np.asarray(fitted, dtype=float)
+    residuals = np.asarray(residuals, dtype=float)
+    finite = np.isfinite(fitted) & np.isfinite(residuals)
+    if not finite.all():
+        fitted, residuals = fitted[finite], residuals[finite]
+    if len(fitted) > max_points:
+        rows = np.random.default_rng(seed).choice(len(fitted), size=max_points, replace=False)
+        fitted, residuals = fitted[rows], residuals[rows]
+
+    ax.hexbin(fitted, residuals, gridsize=60, bins="log", cmap="Blues", mincnt=1)
+    centres, means, sds = _binned_residual_smoother(fitted, residuals)
+    ax.plot(centres, means, color="red", lw=2, alpha=0.8, label="Binned mean")
+    ax.plot(centres, means + sds, color="red", lw=1, ls="--", alpha=0.8, label="Mean ± 1 SD")
+    ax.plot(centres, means - sds, color="red", lw=1, ls="--", alpha=0.8)
+    ax.axhline(0, color="grey", lw=1)
+    ax.legend(loc="upper right")
+    return len(fitted)
+
+def plot_residuals_vs_fitted(
+    model_object: Any,
+    filepath: str = None,
+    large_n_threshold: int = LARGE_N_THRESHOLD,
+) -> Union[bytes, str]:
+    """
+    Generates a residuals vs. fitted values plot in memory.
+
+    Small models get a scatter plot with a LOWESS smoother. Models with more
+    than `large_n_threshold` observations get a hexbin density of the points
+    (a random subsample of at most `LARGE_N_SAMPLE_SIZE` of them), overlaid
+    with the binned mean and ±1 SD of the residuals, which keeps plotting
+    time bounded for any n.
 
     Parameters
     ----------
     model_object : Any
         A fitted statsmodels model object that has .resid and .fittedvalues attributes.
+    filepath : str, optional
+        If given, the PNG is also written to this path. Defaults to None
+        (no filesystem I/O).
+    large_n_threshold : int, optional
+        The number of observations above which the large-n rendering mode is
+        used, by default `LARGE_N_THRESHOLD` (3,000).
 
     Returns
     -------
-    str
-        The filepath of the saved plot image.
+    bytes or str
+        The PNG-encoded plot, or an error message if the plot could not be
+        generated.
     """
     try:
         residuals = model_object.resid
         fitted = model_object.fittedvalues
-        
-        plt.figure(figsize=(8, 6))
-        sns.residplot(x=fitted, y=residuals, lowess=True,
-                      scatter_kws={'alpha': 0.5},
-                      line_kws={'color': 'red', 'lw': 2, 'alpha': 0.8})
-        plt.title('Residuals vs. Fitted Plot')
-        plt.xlabel('Fitted values')
-        plt.ylabel('Residuals')
-        
-        # Save the plot to a file
-        filepath = "residual_plot.png"
-        plt.savefig(filepath)
-        plt.close() # Close the plot to free up memory
-        
-        print(f"Tool executed: Generated plot at '{filepath}'")
-        return filepath
+
+        fig = _new_figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        if len(residuals) > large_n_threshold:
+            n_plotted = _draw_large_n_residuals(
+                ax, fitted, residuals, max_points=LARGE_N_SAMPLE_SIZE
+            )
+            ax.set_title(f'Residuals vs. Fitted Plot ({n_plotted:,} of {len(residuals):,} points)')
+        else:
+            import seaborn as sns
+
+            sns.residplot(x=fitted, y=residuals, lowess=True, ax=ax,
+                          scatter_kws={'alpha': 0.5},
+                          line_kws={'color': 'red', 'lw': 2, 'alpha': 0.8})
+            ax.set_title('Residuals vs. Fitted Plot')
+        ax.set_xlabel('Fitted values')
+        ax.set_ylabel('Residuals')
+
+        png = _figure_to_png(fig, filepath)
+        if filepath is not None:
+            print(f"Tool executed: Generated plot at '{filepath}'")
+        else:
+            print("Tool executed: Generated residuals vs. fitted plot")
+        return png
 
     except Exception as e:
         return f"Error executing plot_residuals_vs_fitted: {e}"
 
+def _text_table(header: tuple, rows: list) -> str:
+    """Formats rows of cells as a compact fixed-width text table."""
+    cells = [tuple(str(cell) for cell in row) for row in [header] + list(rows)]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+    lines = [
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in cells
+    ]
+    return "\n".join(lines)
+
+def _weighted_design_matrix(model_object: Any):
+    """Returns the design matrix whose hat matrix defines the model's leverages.
+
+    Linear models expose the whitened design as `.model.wexog`; for GLMs the
+    design is scaled by the square roots of the final IRLS weights.
+    """
+    import numpy as np
+
+    model = model_object.model
+    exog = getattr(model, "wexog", None)
+    if exog is not None:
+        return np.asarray(exog, dtype=float)
+    exog = np.asarray(model.exog, dtype=float)
+    weights = np.asarray(getattr(model, "weights", 1.0), dtype=float)
+    if weights.ndim == 1:
+        exog = exog * np.sqrt(weights)[:, None]
+    return exog
+
+def _residuals(model_object: Any) -> tuple:
+    """Returns the model's residuals as an array, and what kind they are.
+
+    Linear models expose raw residuals as `.resid`; GLM results do not, so
+    their Pearson residuals (or, failing that, response residuals) are used,
+    as in :func:`compute_influence`.
+    """
+    import numpy as np
+
+    for attr, kind in (
+        ("resid", "residuals"),
+        ("resid_pearson", "Pearson residuals"),
+        ("resid_response", "response residuals"),
+    ):
+        residuals = getattr(model_object, attr, None)
+        if residuals is not None:
+            return np.asarray(residuals, dtype=float), kind
+    raise AttributeError(f"'{type(model_object).__name__}' object has no residuals")
+
+def compute_vif(model_object: Any) -> str:
+    """
+    Computes Variance Inflation Factors for the model's predictors.
+
+    The VIFs are the diagonal of the inverse correlation matrix of the
+    non-constant columns of the design matrix, so all predictors are handled
+    in one matrix inversion rather than one auxiliary regression each.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statsmodels model object with a design matrix (`.model.exog`).
+
+    Returns
+    -------
+    str
+        A text table of VIFs, or an error message.
+    """
+    try:
+        import numpy as np
+
+        exog = np.asarray(model_object.model.exog, dtype=float)
+        names = getattr(model_object.model, "exog_names", None) or [f"x{j}" for j in range(exog.shape[1])]
+        varying = exog.std(axis=0) > 0
+        if varying.sum() < 2:
+            return "VIFs need at least two non-constant predictors."
+        corr = np.corrcoef(exog[:, varying], rowvar=False)
+        vifs = np.diag(np.linalg.pinv(corr))
+        rows = [
+            (name, f"{vif:.2f}", "high" if vif >= 10 else ("moderate" if vif >= 5 else ""))
+            for name, vif in zip(np.asarray(names)[varying], vifs)
+        ]
+        return "Variance Inflation Factors\n" + _text_table(("predictor", "VIF", "flag"), rows)
+
+    except Exception as e:
+        return f"Error executing compute_vif: {e}"
+
+def check_heteroscedasticity(model_object: Any) -> str:
+    """
+    Runs the Breusch-Pagan test for heteroscedasticity of the residuals.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statsmodels model object with residuals (`.resid`, or
+        Pearson residuals for GLMs) and a design matrix.
+
+    Returns
+    -------
+    str
+        A text table with the LM and F versions of the test, or an error
+        message.
+    """
+    try:
+        import numpy as np
+        from statsmodels.stats.diagnostic import het_breuschpagan
+
+        exog = np.asarray(model_object.model.exog, dtype=float)
+        residuals, kind = _residuals(model_object)
+        lm, lm_pvalue, fvalue, f_pvalue = het_breuschpagan(residuals, exog)
+        rows = [
+            ("Breusch-Pagan LM", f"{lm:.4g}", f"{lm_pvalue:.3g}"),
+            ("Breusch-Pagan F", f"{fvalue:.4g}", f"{f_pvalue:.3g}"),
+        ]
+        header = "Heteroscedasticity tests" if kind == "residuals" \
+            else f"Heteroscedasticity tests of the {kind}"
+        return (
+            f"{header} (H0: constant variance)\n"
+            + _text_table(("test", "statistic", "p-value"), rows)
+        )
+
+    except Exception as e:
+        return f"Error executing check_heteroscedasticity: {e}"
+
+def compute_influence(model_object: Any, top_k: int = 5) -> str:
+    """
+    Computes leverage and Cook's distance for every observation.
+
+    Leverages are the squared row norms of Q from a thin QR decomposition of
+    the (weighted) design matrix, which costs O(n p^2) time and never forms the n x n
+    hat matrix. Cook's distances follow in closed form from the leverages
+    and residuals.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statsmodels model object with residuals and a design matrix.
+    top_k : int, optional
+        The number of most influential observations to list, by default 5.
+
+    Returns
+    -------
+    str
+        A text summary with counts of high-leverage and influential points
+        and a table of the `top_k` largest Cook's distances, or an error
+        message.
+    """
+    try:
+        import numpy as np
+
+        exog = _weighted_design_matrix(model_object)
+        residuals = getattr(model_object, "wresid", None)
+        if residuals is None:
+            residuals = model_object.resid_pearson
+        residuals = np.asarray(residuals, dtype=float)
+        n, p = exog.shape
+
+        q, _ = np.linalg.qr(exog)
+        leverage = np.einsum("ij,ij->i", q, q)
+        scale = float(model_object.scale)
+        cooks = residuals ** 2 * leverage / (p * scale * (1 - leverage) ** 2)
+
+        leverage_cutoff = 2 * p / n
+        cooks_cutoff = 4 / n
+        k = min(top_k, n)
+        top = np.argpartition(-cooks, k - 1)[:k]
+        top = top[np.argsort(-cooks[top])]
+        labels = getattr(getattr(model_object.model, "data", None), "row_labels", None)
+        labels = np.arange(n) if labels is None else np.asarray(labels)
+        rows = [
+            (labels[i], f"{cooks[i]:.4g}", f"{leverage[i]:.4g}", f"{residuals[i]:.4g}")
+            for i in top
+        ]
+        return (
+            f"Influence measures (n = {n}, p = {p})\n"
+            f"High leverage (h > 2p/n = {leverage_cutoff:.3g}): {int((leverage > leverage_cutoff).sum())} observations; "
+            f"max leverage = {leverage.max():.4g}\n"
+            f"Influential (Cook's D > 4/n = {cooks_cutoff:.3g}): {int((cooks > cooks_cutoff).sum())} observations; "
+            f"max Cook's D = {cooks.max():.4g}\n"
+            f"Top {k} by Cook's distance:\n"
+            + _text_table(("observation", "Cook's D", "leverage", "residual"), rows)
+        )
+
+    except Exception as e:
+        return f"Error executing compute_influence: {e}"
+
+def check_normality(model_object: Any) -> str:
+    """
+    Tests the residuals for normality (Jarque-Bera and D'Agostino omnibus).
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statsmodels model object with residuals (`.resid`, or
+        Pearson residuals for GLMs).
+
+    Returns
+    -------
+    str
+        A text table with both tests plus the residuals' skewness and
+        kurtosis, or an error message.
+    """
+    try:
+        from statsmodels.stats.stattools import jarque_bera, omni_normtest
+
+        residuals, kind = _residuals(model_object)
+        jb, jb_pvalue, skew, kurtosis = jarque_bera(residuals)
+        omnibus, omnibus_pvalue = omni_normtest(residuals)
+        rows = [
+            ("Jarque-Bera", f"{jb:.4g}", f"{jb_pvalue:.3g}"),
+            ("Omnibus (D'Agostino)", f"{omnibus:.4g}", f"{omnibus_pvalue:.3g}"),
+        ]
+        return (
+            f"Normality tests of the {kind} (H0: normally distributed)\n"
+            + _text_table(("test", "statistic", "p-value"), rows)
+            + f"\nSkewness = {skew:.3f}, kurtosis = {kurtosis:.3f} (3 for a normal distribution)"
+        )
+
+    except Exception as e:
+        return f"Error executing check_normality: {e}"
+
 
 # --- Tool Definitions for the LLM ---
 
@@ -127,91 +517,355 @@ tools = [
                 "required": []
             }
         }
-    }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compute_vif",
+            "description": "Computes Variance Inflation Factors for each predictor to check for multicollinearity. Returns a text table.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_heteroscedasticity",
+            "description": "Runs the Breusch-Pagan test for non-constant residual variance (heteroscedasticity). Returns a text table.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compute_influence",
+            "description": "Computes leverage and Cook's distance for every observation and lists the most influential points. Returns a text summary.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_normality",
+            "description": "Runs the Jarque-Bera and omnibus tests for normality of the residuals and reports their skewness and kurtosis. Returns a text table.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    },
 ]
 
 # A dictionary to map tool names to the actual Python functions
 available_tools = {
     "plot_residuals_vs_fitted": plot_residuals_vs_fitted,
+    "compute_vif": compute_vif,
+    "check_heteroscedasticity": check_heteroscedasticity,
+    "compute_influence": compute_influence,
+    "check_normality": check_normality,
 }
 
+# Tools that return PNG bytes for visual analysis rather than text
+plot_tools = {"plot_residuals_vs_fitted"}
+
+# Tools started in the background by `diagnose_agent(speculate=True)`: cheap
+# and requested on most runs
+SPECULATIVE_TOOLS = ("plot_residuals_vs_fitted",)
+
+def _call_tool(function_name: str, model_object: Any, large_n_threshold: int) -> Union[bytes, str]:
+    """Runs a registered tool in memory (plots are not written to disk).
+
+    Numeric tool outputs are memoized per model object, so every agent run
+    and session on the same fit computes each of them once.
+    """
+    function_to_call = available_tools[function_name]
+    if function_name in plot_tools:
+        return function_to_call(model_object, large_n_threshold=large_n_threshold)
+    return memoize_per_model(
+        model_object, ("tool", function_name), lambda: function_to_call(model_object)
+    )
+
+def _run_tool(
+    tool_call: Any,
+    model_object: Any,
+    plot_path: str,
+    large_n_threshold: int,
+    speculative: dict,
+) -> Union[bytes, str]:
+    """Executes one tool call requested by the LLM.
+
+    Results of tools started speculatively are reused rather than computed
+    again. Returns PNG bytes for plot tools and text otherwise (including
+    error messages, which are reported back to the LLM like any other
+    result).
+    """
+    function_name = tool_call.function.name
+    if function_name not in available_tools:
+        return f"Error: Tool '{function_name}' not found."
+    print(f"Agent: Decided to use the tool '{function_name}'.")
+    if function_name in speculative:
+        output = speculative[function_name].result()
+    else:
+        output = _call_tool(function_name, model_object, large_n_threshold)
+    if isinstance(output, bytes) and plot_path is not None:
+        _save_png(output, plot_path)
+    return output
+
 def diagnose_agent(
     model_object: Any,
     prompt: str,
     model: str,
+    max_prompt_tokens: int = None,
+    plot_path: str = None,
+    large_n_threshold: int = LARGE_N_THRESHOLD,
+    max_steps: int = 3,
+    max_concurrency: int = 4,
+    speculate: Union[bool, Iterable[str]] = False,
+    image_size: int = 768,
+    image_format: str = "png",
+    image_colors: int = 32,
+    image_detail: str = "auto",
+    policy: RequestPolicy = None,
     **kwargs: Any,
 ):
     """
     Diagnoses a model using an agentic, tool-based approach.
+
+    The model summary is included in the conversation so the agent can
+    choose tools with the fitted model in mind; it is shared with
+    :func:`statlingua.explain` and :func:`diagnose` through the per-model
+    summary cache. Besides the residual plot, the agent can call numeric
+    tools (VIFs, Breusch-Pagan, influence measures, normality tests) whose
+    text tables are returned to the LLM without a vision round trip. Plots
+    are rendered in memory and sent to the LLM directly, so several agents
+    can run concurrently (e.g., in a thread pool) without touching the
+    filesystem.
+
+    The agent runs for up to `max_steps` turns. In each turn, every tool
+    call the LLM requested is executed concurrently in a thread pool, so a
+    turn takes as long as its slowest tool; the results are appended to the
+    conversation in the order the calls were made.
+
+    With `speculate` enabled, likely-needed tools (by default the residual
+    plot) start on background threads while the first LLM call is in
+    flight, so their results are usually ready when requested. Results the
+    LLM never asks for are discarded.
+
+    Plots are re-encoded before they are sent to the LLM: downscaled to
+    `image_size` pixels on the longer side and, by default, written as a
+    32-color palette PNG, which is typically about a third of the size of
+    the rendered PNG while keeping text and points legible.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statistical model object.
+    prompt : str
+        The user's question about model diagnostics.
+    model : str
+        The model string for a vision-capable LLM (e.g., "gpt-4o").
+    max_prompt_tokens : int, optional
+        An (estimated) token budget for the model summary, by default None.
+    plot_path : str, optional
+        If given, any generated plot is also saved to this path. Defaults
+        to None (plots are kept in memory only).
+    large_n_threshold : int, optional
+        The number of observations above which plots are drawn from a
+        subsample as a density with a binned smoother, by default
+        `LARGE_N_THRESHOLD`.
+    max_steps : int, optional
+        The maximum number of tool-calling turns, by default 3. Once it is
+        reached, the LLM is asked for a final answer without tools.
+    max_concurrency : int, optional
+        The maximum number of tool calls executed at the same time, by
+        default 4.
+    speculate : bool or iterable of str, optional
+        Whether to pre-execute tools during the first LLM call: True runs
+        `SPECULATIVE_TOOLS`, an iterable names the tools to run. Defaults
+        to False.
+    image_size : int, optional
+        The maximum width or height, in pixels, of images sent to the LLM,
+        by default 768. None keeps the rendered size.
+    image_format : str, optional
+        The encoding of images sent to the LLM: "png" (the default),
+        "jpeg" or "webp".
+    image_colors : int, optional
+        The palette size for PNG quantization, by default 32. None sends
+        a full-color PNG. Ignored for JPEG and WebP.
+    image_detail : str, optional
+        The provider's image `detail` level: "auto" (the default), "low"
+        or "high".
+    policy : RequestPolicy, optional
+        The deadline, retry and hedging policy for each LLM turn, by
+        default the process-wide default policy. A `hedge_model` must
+        support tool calls and images.
+    **kwargs : Any
+        Additional keyword arguments to pass to `litellm.completion`.
+
+    Returns
+    -------
+    dict
+        A dictionary with keys 'text' (the agent's answer), 'plot' (the
+        path the plot was saved to, or None), 'image' (the PNG bytes of
+        the last generated plot, or None), 'table' (the text output of the
+        numeric diagnostic tools, or None), 'tool_calls' (the names of
+        the tools executed, in order), 'image_payload_bytes' (the total
+        size of the encoded images sent to the LLM) and 'metrics' (stage
+        timings and token usage summed over all turns, see
+        :class:`statlingua.instrumentation.Metrics`).
     """
-    # 1. First call to the LLM to decide on a course of action
+    if max_steps < 1:
+        raise ValueError("`max_steps` must be a positive integer.")
+    if max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be a positive integer.")
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"`image_format` must be one of {sorted(IMAGE_FORMATS)}.")
+    if image_detail not in ("auto", "low", "high"):
+        raise ValueError("`image_detail` must be one of 'auto', 'low' or 'high'.")
+
+    metrics = Metrics("diagnose_agent")
+    with metrics.stage("handler"):
+        model_name, summary_text = extract_summary(model_object, max_tokens=max_prompt_tokens)
+
+    # 1. The initial conversation: the agent decides on a course of action
     system_prompt = (
         "You are an expert statistical consultant. Your goal is to help a user "
         "diagnose the assumptions of their statistical model. Based on the user's "
-        "question, decide if one of your available tools can help answer it. "
-        "If so, call the appropriate tool. If not, provide a text-based answer."
+        "question, decide if one or more of your available tools can help answer it. "
+        "If so, call the appropriate tools. If not, provide a text-based answer."
+    )
+
+    user_prompt = (
+        f"{prompt}\n\n"
+        f"Here is the summary of my {model_name} model:\n\n---\n{summary_text}"
     )
-    
-    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}]
-    
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+
+    image = None
+    plot = None
+    tables = []
+    executed = []
+    payload_bytes = 0
+
+    if speculate is True:
+        speculate = SPECULATIVE_TOOLS
+    speculative_names = [name for name in (speculate or ()) if name in available_tools]
+    speculative_pool = None
+    speculative = {}
+    if speculative_names:
+        # Start likely-needed tools now so they overlap the first LLM call
+        speculative_pool = ThreadPoolExecutor(max_workers=len(speculative_names))
+        speculative = {
+            name: speculative_pool.submit(_call_tool, name, model_object, large_n_threshold)
+            for name in speculative_names
+        }
+
     print("Agent: Thinking about the user's request...")
-    response = litellm.completion(model=model, messages=messages, tools=tools, **kwargs)
-    
-    response_message = response.choices[0].message
-    tool_calls = response_message.tool_calls
+    try:
+        for step in range(max_steps + 1):
+            # On the final turn the LLM has to answer. The tools stay defined
+            # because providers such as Anthropic reject tool messages in a
+            # request without them; `tool_choice="none"` forbids new calls.
+            tool_kwargs = {"tools": tools}
+            if step == max_steps:
+                tool_kwargs["tool_choice"] = "none"
+            with metrics.stage("llm"):
+                response, stats = send(
+                    model, messages, policy=policy, **tool_kwargs, **kwargs
+                )
+            metrics.add_call({"usage": response_usage(response), **stats})
 
-    if not tool_calls:
-        print("Agent: No tool needed. Responding directly.")
-        return {"text": response_message.content, "plot": None}
+            response_message = response.choices[0].message
+            tool_calls = response_message.tool_calls if step < max_steps else None
 
-    # Append the assistant's decision to use a tool to the conversation
-    messages.append(response_message)
+            if not tool_calls:
+                if step == 0:
+                    print("Agent: No tool needed. Responding directly.")
+                break
 
-    # 2. Execute the tool call(s)
-    tool_call = tool_calls[0]
-    function_name = tool_call.function.name
-    
-    if function_name in available_tools:
-        print(f"Agent: Decided to use the tool '{function_name}'.")
-        function_to_call = available_tools[function_name]
-        tool_output_filepath = function_to_call(model_object)
-
-        # 3. Append the REQUIRED 'tool' message to the conversation
-        # This message tells the LLM the result of the tool call it requested.
-        messages.append({
-            "role": "tool",
-            "tool_call_id": tool_call.id,
-            "name": function_name,
-            "content": f"Tool '{function_name}' executed successfully. The resulting plot has been generated at '{tool_output_filepath}'. Now, I will analyze it."
-        })
+            # Append the assistant's decision to use tools to the conversation
+            messages.append(response_message)
+
+            # 2. Execute every requested tool call concurrently
+            with metrics.stage("tools"), \
+                    ThreadPoolExecutor(max_workers=min(max_concurrency, len(tool_calls))) as pool:
+                outputs = list(pool.map(
+                    lambda tool_call: _run_tool(
+                        tool_call, model_object, plot_path, large_n_threshold, speculative
+                    ),
+                    tool_calls,
+                ))
+
+            # 3. Append the REQUIRED 'tool' message for each call, in order
+            # These messages tell the LLM the result of the tool calls it requested.
+            new_images = []
+            for tool_call, output in zip(tool_calls, outputs):
+                function_name = tool_call.function.name
+                executed.append(function_name)
+                if isinstance(output, bytes):
+                    new_images.append(output)
+                    image = output
+                    plot = plot_path
+                    content = (
+                        f"Tool '{function_name}' executed successfully. The resulting "
+                        "plot is attached below. Now, I will analyze it."
+                    )
+                else:
+                    if function_name in available_tools and function_name not in plot_tools:
+                        tables.append(output)
+                    content = output
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "name": function_name,
+                    "content": content,
+                })
+
+            # 4. Tool messages cannot carry images, so plots are sent for visual
+            # analysis in a follow-up user message
+            if new_images:
+                print("Agent: Sending plots to the LLM for interpretation...")
+                content = [{"type": "text", "text": "Please analyze the plots that were just generated and interpret them for me."}]
+                for png in new_images:
+                    with metrics.stage("encode"):
+                        encoded = _encode_image(png, image_size, image_format, image_colors)
+                    payload_bytes += len(encoded)
+                    base64_image = base64.b64encode(encoded).decode('utf-8')
+                    content.append({
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{IMAGE_FORMATS[image_format]};base64,{base64_image}",
+                            "detail": image_detail,
+                        }
+                    })
+                messages.append({"role": "user", "content": content})
+            else:
+                print("Agent: Sending tool results to the LLM for interpretation...")
+    finally:
+        if speculative_pool is not None:
+            # Discard speculative work the LLM did not ask for
+            for future in speculative.values():
+                future.cancel()
+            speculative_pool.shutdown(wait=False)
 
-    else:
-        return {"text": f"Error: Tool '{function_name}' not found.", "plot": None}
-
-    # --- 4. Second call to the LLM to interpret the result ---
-    
-    # Read the image and encode it to be sent for visual analysis
-    with open(tool_output_filepath, "rb") as image_file:
-        base64_image = base64.b64encode(image_file.read()).decode('utf-8')
-    
-    # Now, append the user message that includes the image for analysis
-    messages.append({
-        "role": "user",
-        "content": [
-            {"type": "text", "text": "Please analyze the plot that was just generated and interpret it for me."},
-            {
-                "type": "image_url",
-                "image_url": {"url": f"data:image/png;base64,{base64_image}"}
-            }
-        ]
-    })
-    
-    print("Agent: Sending plot to the LLM for interpretation...")
-    
-    # Use a vision-capable model for the final interpretation
-    final_response = litellm.completion(model=model, messages=messages, **kwargs)
-    
     return {
-        "text": final_response.choices[0].message.content,
-        "plot": tool_output_filepath
-    }
\ No newline at end of file
+        "text": response_message.content,
+        "plot": plot,
+        "image": image,
+        "table": "\n\n".join(tables) if tables else None,
+        "tool_calls": executed,
+        "image_payload_bytes": payload_bytes,
+        "metrics": metrics.emit(),
+    }
@@ -1,11 +1,329 @@
 # src/statlingua/explain.py
 
-from typing import Any
-import litellm
+import asyncio
+import itertools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
 
 # Import our internal modules
-from .prompts import assemble_sys_prompt, build_user_prompt
-from .model_handlers import get_handler
+from .cache import ResponseCache
+from .instrumentation import Metrics
+from .policy import RequestPolicy
+from .completion import (
+    acomplete,
+    astream_complete,
+    complete,
+    stream_complete,
+    supports_cache_control,
+)
+from .prompts import (
+    assemble_multi_sys_prompt,
+    assemble_sys_prompt,
+    build_reduce_prompt,
+    build_user_prompt,
+    static_sys_prompt,
+    variable_sys_prompt,
+    variant_key,
+)
+from .model_handlers import extract_summary, summary_blocks, summary_fingerprint
+
+def _build_messages(
+    model_name: str,
+    summary_text: str,
+    context: str,
+    audience: str,
+    verbosity: str,
+    style: str,
+    prompt_caching: bool = False,
+    model: str = None,
+) -> list:
+    """Assembles the system and user messages for a model summary.
+
+    With `prompt_caching`, the messages use the cache-friendly layout: the
+    static system prompt (role, instructions, caution) comes first, then
+    the summary, and the audience, verbosity and style sections come last.
+    For providers that need them (see
+    :func:`statlingua.completion.supports_cache_control`), the static
+    prompt and the summary are marked with `cache_control` breakpoints.
+    """
+    user_prompt = build_user_prompt(
+        model_description=f"{model_name} model",
+        output=summary_text,
+        context=context
+    )
+    if not prompt_caching:
+        system_prompt = assemble_sys_prompt(model_name, audience, verbosity, style)
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    static_prompt = static_sys_prompt(model_name)
+    variable_prompt = variable_sys_prompt(audience, verbosity, style)
+    if not (model and supports_cache_control(model)):
+        return [
+            {"role": "system", "content": static_prompt},
+            {"role": "user", "content": f"{user_prompt}\n\n\n{variable_prompt}"},
+        ]
+    marker = {"type": "ephemeral"}
+    return [
+        {"role": "system", "content": [
+            {"type": "text", "text": static_prompt, "cache_control": marker},
+        ]},
+        {"role": "user", "content": [
+            {"type": "text", "text": user_prompt, "cache_control": marker},
+            {"type": "text", "text": variable_prompt},
+        ]},
+    ]
+
+def _prepare_messages(
+    model_object: Any,
+    context: str,
+    audience: str,
+    verbosity: str,
+    style: str,
+    max_prompt_tokens: int = None,
+    metrics: Metrics = None,
+    prompt_caching: bool = False,
+    model: str = None,
+) -> tuple:
+    """Runs the handler and prompt-assembly stages for a single model.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statistical model object.
+    context : str
+        Additional context about the data or research question, or None.
+    audience : str
+        The target audience for the explanation.
+    verbosity : str
+        The desired level of detail.
+    style : str
+        The output format style.
+    max_prompt_tokens : int, optional
+        An (estimated) token budget for the model summary, or None.
+    metrics : Metrics, optional
+        If given, the 'handler' and 'prompt' stages are timed into it.
+    prompt_caching : bool, optional
+        Whether to use the cache-friendly prompt layout, by default False.
+    model : str, optional
+        The LLM model string, used to decide on cache-control markers.
+
+    Returns
+    -------
+    tuple[str, list[dict], str]
+        The internal model name, the messages to send to the LLM and the
+        fingerprint of the model's canonical summary.
+    """
+    metrics = Metrics("prepare") if metrics is None else metrics
+
+    # 1. Get the model's summary and internal type name using the handler
+    with metrics.stage("handler"):
+        model_name, summary_text = extract_summary(model_object, max_tokens=max_prompt_tokens)
+        fingerprint = summary_fingerprint(model_name, summary_text)
+
+    # 2. Assemble the system and user prompts
+    with metrics.stage("prompt"):
+        messages = _build_messages(
+            model_name, summary_text, context, audience, verbosity, style,
+            prompt_caching, model,
+        )
+    return model_name, messages, fingerprint
+
+def _normalize_kwargs(kwargs: dict) -> dict:
+    """Maps common aliases in user-supplied kwargs to litellm's names."""
+    kwargs = dict(kwargs)
+    # Map common alias `base_url` to litellm's `api_base` if present
+    if "base_url" in kwargs:
+        kwargs["api_base"] = kwargs.pop("base_url")
+    return kwargs
+
+def _chunk_messages(
+    model_object: Any,
+    model: str,
+    context: str,
+    audience: str,
+    verbosity: str,
+    style: str,
+    chunk_size: int,
+    prompt_caching: bool,
+    metrics: Metrics,
+) -> Tuple[str, str, str, List[list]]:
+    """Runs the handler and builds the map-step messages of a chunked call.
+
+    Returns the model name, the summary fingerprint, the summary header
+    and one message list per coefficient block. A model that fits in a
+    single block gets one message list for the whole summary in the
+    requested `style` (no reduce step is needed).
+    """
+    with metrics.stage("handler"):
+        model_name, summary_text = extract_summary(model_object)
+        fingerprint = summary_fingerprint(model_name, summary_text)
+        header, blocks = summary_blocks(model_object, summary_text, chunk_size)
+
+    with metrics.stage("prompt"):
+        if len(blocks) == 1:
+            block_messages = [_build_messages(
+                model_name, summary_text, context, audience, verbosity, style,
+                prompt_caching, model,
+            )]
+        else:
+            # Map: partial explanations are plain markdown regardless of `style`
+            block_messages = [
+                _build_messages(
+                    model_name, block, context, audience, verbosity, "markdown",
+                    prompt_caching, model,
+                )
+                for block in blocks
+            ]
+    return model_name, fingerprint, header, block_messages
+
+def _reduce_messages(
+    model_name: str,
+    header: str,
+    partials: List[str],
+    context: str,
+    audience: str,
+    verbosity: str,
+    style: str,
+) -> list:
+    """Builds the reduce-step messages that merge the partial explanations."""
+    return [
+        {"role": "system",
+         "content": assemble_sys_prompt(model_name, audience, verbosity, style)},
+        {"role": "user",
+         "content": build_reduce_prompt(f"{model_name} model", header, partials, context)},
+    ]
+
+def _explain_chunked(
+    model_object: Any,
+    model: str,
+    context: str,
+    audience: str,
+    verbosity: str,
+    style: str,
+    chunk_size: int,
+    max_concurrency: int,
+    cache: ResponseCache,
+    policy: RequestPolicy,
+    prompt_caching: bool,
+    kwargs: dict,
+    metrics: Metrics,
+) -> dict:
+    """Explains a model in coefficient blocks and merges the results.
+
+    The map step explains each block (header plus `chunk_size`
+    coefficients) concurrently in a thread pool; the reduce step merges
+    the partial explanations into one narrative in the requested style,
+    using the same audience and verbosity settings.
+    """
+    if max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be a positive integer.")
+    model_name, fingerprint, header, block_messages = _chunk_messages(
+        model_object, model, context, audience, verbosity, style, chunk_size,
+        prompt_caching, metrics,
+    )
+
+    if len(block_messages) == 1:
+        messages = block_messages[0]
+    else:
+        with metrics.stage("map"):
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(block_messages))) as pool:
+                block_results = list(pool.map(
+                    lambda messages: complete(
+                        model, messages, cache=cache, policy=policy, **kwargs
+                    ),
+                    block_messages,
+                ))
+        for block_result in block_results:
+            metrics.add_call(block_result)
+
+        # Reduce: merge the partials in the requested style
+        with metrics.stage("prompt"):
+            messages = _reduce_messages(
+                model_name, header, [block_result["text"] for block_result in block_results],
+                context, audience, verbosity, style,
+            )
+    with metrics.stage("llm"):
+        result = complete(model, messages, cache=cache, policy=policy, **kwargs)
+    metrics.add_call(result)
+
+    return {
+        "text": result["text"],
+        "model_type": model_name,
+        "audience": audience,
+        "verbosity": verbosity,
+        "style": style,
+        "cached": result["cached"],
+        "fingerprint": fingerprint,
+        "chunks": len(block_messages),
+        "metrics": metrics.emit(),
+    }
+
+async def _aexplain_chunked(
+    model_object: Any,
+    model: str,
+    context: str,
+    audience: str,
+    verbosity: str,
+    style: str,
+    chunk_size: int,
+    max_concurrency: int,
+    cache: ResponseCache,
+    policy: RequestPolicy,
+    prompt_caching: bool,
+    kwargs: dict,
+    metrics: Metrics,
+) -> dict:
+    """Asynchronous version of :func:`_explain_chunked`.
+
+    The map step runs the block explanations as concurrent coroutines,
+    at most `max_concurrency` at a time.
+    """
+    if max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be a positive integer.")
+    model_name, fingerprint, header, block_messages = await asyncio.to_thread(
+        _chunk_messages, model_object, model, context, audience, verbosity, style,
+        chunk_size, prompt_caching, metrics,
+    )
+
+    if len(block_messages) == 1:
+        messages = block_messages[0]
+    else:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _call(messages: list) -> dict:
+            async with semaphore:
+                return await acomplete(model, messages, cache=cache, policy=policy, **kwargs)
+
+        with metrics.stage("map"):
+            block_results = await asyncio.gather(*(_call(m) for m in block_messages))
+        for block_result in block_results:
+            metrics.add_call(block_result)
+
+        with metrics.stage("prompt"):
+            messages = _reduce_messages(
+                model_name, header, [block_result["text"] for block_result in block_results],
+                context, audience, verbosity, style,
+            )
+    with metrics.stage("llm"):
+        result = await acomplete(model, messages, cache=cache, policy=policy, **kwargs)
+    metrics.add_call(result)
+
+    return {
+        "text": result["text"],
+        "model_type": model_name,
+        "audience": audience,
+        "verbosity": verbosity,
+        "style": style,
+        "cached": result["cached"],
+        "fingerprint": fingerprint,
+        "chunks": len(block_messages),
+        "metrics": metrics.emit(),
+    }
 
 def explain(
     model_object: Any,
@@ -14,6 +332,12 @@ def explain(
     audience: str = "novice",
     verbosity: str = "moderate",
     style: str = "markdown",
+    max_prompt_tokens: int = None,
+    prompt_caching: bool = False,
+    chunk_size: int = None,
+    max_concurrency: int = 8,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
     **kwargs: Any,
 ) -> dict:
     """Explains a statistical model's output using an LLM.
@@ -43,6 +367,39 @@ def explain(
     style : str, optional
         The output format style. Must be one of "markdown", "html", "json",
         "text", or "latex". Defaults to "markdown".
+    max_prompt_tokens : int, optional
+        An (estimated) token budget for the model summary. Summaries that
+        exceed it keep their header and fit statistics but only list the
+        most significant coefficients, plus one line summarizing the
+        omitted terms (see :func:`statlingua.model_handlers.compact_summary`).
+        Defaults to None (no limit).
+    prompt_caching : bool, optional
+        If True, the prompt uses a cache-friendly layout. The static system
+        prompt (role, instructions, caution) comes first, then the model
+        summary, then the audience, verbosity and style sections. Repeated
+        calls then share a long prefix that providers can serve from their
+        prompt cache. For Claude models the prefix is marked with
+        `cache_control` breakpoints. Cached tokens are reported in
+        'metrics'. Defaults to False.
+    chunk_size : int, optional
+        If given, models with more than `chunk_size` coefficients are
+        explained in map-reduce fashion: the coefficient table is split
+        into blocks of `chunk_size` rows, the blocks are explained
+        concurrently, and a final call merges the partial explanations
+        into one narrative in the requested `style`. Every term is covered,
+        so `max_prompt_tokens` is ignored in this mode. Defaults to None.
+    max_concurrency : int, optional
+        The maximum number of block explanations in flight at once when
+        `chunk_size` is used. Defaults to 8.
+    cache : ResponseCache, optional
+        A response cache (e.g., :class:`statlingua.cache.LRUCache` or
+        :class:`statlingua.cache.SQLiteCache`). When given, identical
+        requests are answered from the cache instead of the LLM. Defaults
+        to None (no caching).
+    policy : RequestPolicy, optional
+        The deadline, retry and hedging policy for the LLM requests (see
+        :class:`statlingua.policy.RequestPolicy`). Defaults to the
+        process-wide default policy.
     **kwargs : Any
         Additional keyword arguments to pass directly to the
         `litellm.completion` function. This can be used for parameters
@@ -53,36 +410,35 @@ def explain(
     -------
     dict
         A dictionary containing the explanation and metadata, with keys:
-        'text', 'model_type', 'audience', 'verbosity', 'style'.
+        'text', 'model_type', 'audience', 'verbosity', 'style', 'cached',
+        'fingerprint' (a stable hash of the model's canonical summary,
+        see :func:`statlingua.model_handlers.summary_fingerprint`) and
+        'metrics' (stage timings and token usage, see
+        :class:`statlingua.instrumentation.Metrics`). In chunked mode, the
+        number of blocks is reported under 'chunks'.
     """
-    # 1. Get the model's summary and internal type name using the handler
-    handler = get_handler(model_object)
-    model_name, summary_text = handler(model_object)
+    metrics = Metrics("explain")
+    if chunk_size is not None:
+        return _explain_chunked(
+            model_object, model, context, audience, verbosity, style,
+            chunk_size, max_concurrency, cache, policy, prompt_caching,
+            _normalize_kwargs(kwargs), metrics,
+        )
 
-    # 2. Assemble the system and user prompts
-    system_prompt = assemble_sys_prompt(model_name, audience, verbosity, style)
-    user_prompt = build_user_prompt(
-        model_description=f"{model_name} model",
-        output=summary_text,
-        context=context
+    # 1-2. Run the handler and assemble the system and user prompts
+    model_name, messages, fingerprint = _prepare_messages(
+        model_object, context, audience, verbosity, style, max_prompt_tokens, metrics,
+        prompt_caching, model,
     )
-
-    # Map common alias `base_url` to litellm's `api_base` if present
-    if "base_url" in kwargs:
-        kwargs["api_base"] = kwargs.pop("base_url")
+    kwargs = _normalize_kwargs(kwargs)
 
     # 3. Call the LLM via litellm, passing all relevant parameters
-    response = litellm.completion(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        **kwargs,
-    )
+    with metrics.stage("llm"):
+        result = complete(model, messages, cache=cache, policy=policy, **kwargs)
+    metrics.add_call(result)
 
     # 4. Structure and return the output
-    explanation_text = response.choices[0].message.content
+    explanation_text = result["text"]
     
     # The R version has a .remove_fences() utility. We can add this later
     # for now, we'll return the raw text.
@@ -93,6 +449,594 @@ def explain(
         "audience": audience,
         "verbosity": verbosity,
         "style": style,
+        "cached": result["cached"],
+        "fingerprint": fingerprint,
+        "metrics": metrics.emit(),
     }
     return output
 
+async def aexplain(
+    model_object: Any,
+    model: str,
+    context: str = None,
+    audience: str = "novice",
+    verbosity: str = "moderate",
+    style: str = "markdown",
+    max_prompt_tokens: int = None,
+    prompt_caching: bool = False,
+    chunk_size: int = None,
+    max_concurrency: int = 8,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> dict:
+    """Asynchronous version of :func:`explain`.
+
+    The handler and prompt-assembly stages run in a worker thread so that
+    expensive `summary()` calls do not block the event loop, and the LLM
+    call is made with `litellm.acompletion`. In chunked mode, the block
+    explanations are concurrent coroutines on the running event loop.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statistical model object.
+    model : str
+        The model string for the LLM provider (e.g., "gpt-4o").
+    context : str, optional
+        Additional context about the data or research question.
+    audience : str, optional
+        The target audience for the explanation. Defaults to "novice".
+    verbosity : str, optional
+        The desired level of detail. Defaults to "moderate".
+    style : str, optional
+        The output format style. Defaults to "markdown".
+    max_prompt_tokens : int, optional
+        An (estimated) token budget for each model summary.
+    prompt_caching : bool, optional
+        Whether to use the cache-friendly prompt layout (see
+        :func:`explain`). Defaults to False.
+    chunk_size : int, optional
+        If given, models with more than `chunk_size` coefficients are
+        explained in map-reduce fashion (see :func:`explain`). Defaults
+        to None.
+    max_concurrency : int, optional
+        The maximum number of block explanations in flight at once when
+        `chunk_size` is used. Defaults to 8.
+    cache : ResponseCache, optional
+        A response cache to consult before calling the LLM.
+    policy : RequestPolicy, optional
+        The deadline, retry and hedging policy for the LLM request.
+    **kwargs : Any
+        Additional keyword arguments to pass to `litellm.acompletion`.
+
+    Returns
+    -------
+    dict
+        The same dictionary as returned by :func:`explain`.
+    """
+    metrics = Metrics("aexplain")
+    if chunk_size is not None:
+        return await _aexplain_chunked(
+            model_object, model, context, audience, verbosity, style,
+            chunk_size, max_concurrency, cache, policy, prompt_caching,
+            _normalize_kwargs(kwargs), metrics,
+        )
+
+    model_name, messages, fingerprint = await asyncio.to_thread(
+        _prepare_messages, model_object, context, audience, verbosity, style,
+        max_prompt_tokens, metrics, prompt_caching, model,
+    )
+    kwargs = _normalize_kwargs(kwargs)
+
+    with metrics.stage("llm"):
+        result = await acomplete(model, messages, cache=cache, policy=policy, **kwargs)
+    metrics.add_call(result)
+
+    return {
+        "text": result["text"],
+        "model_type": model_name,
+        "audience": audience,
+        "verbosity": verbosity,
+        "style": style,
+        "cached": result["cached"],
+        "fingerprint": fingerprint,
+        "metrics": metrics.emit(),
+    }
+
+async def aexplain_many(
+    model_objects: Iterable[Any],
+    model: str,
+    context: str = None,
+    audience: str = "novice",
+    verbosity: str = "moderate",
+    style: str = "markdown",
+    max_prompt_tokens: int = None,
+    prompt_caching: bool = False,
+    max_concurrency: int = 8,
+    dedupe: bool = True,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> List[Union[dict, Exception]]:
+    """Explains many models concurrently.
+
+    See :func:`explain_many` for a description of the parameters. This
+    coroutine is useful when an event loop is already running (e.g., in a
+    Jupyter notebook or an async web server).
+    """
+    if max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be a positive integer.")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    kwargs = _normalize_kwargs(kwargs)
+    # One LLM call per distinct summary fingerprint when deduplicating
+    calls: dict = {}
+
+    async def _call(messages: list) -> dict:
+        async with semaphore:
+            return await acomplete(model, messages, cache=cache, policy=policy, **kwargs)
+
+    async def _run_one(model_object: Any) -> Union[dict, Exception]:
+        metrics = Metrics("explain_many")
+        try:
+            model_name, messages, fingerprint = await asyncio.to_thread(
+                _prepare_messages, model_object, context, audience, verbosity,
+                style, max_prompt_tokens, metrics, prompt_caching, model,
+            )
+            # Only the item that issues a call is charged for it, so that
+            # summing the items' metrics does not double-count deduped calls
+            issued = True
+            with metrics.stage("llm"):
+                if dedupe:
+                    issued = fingerprint not in calls
+                    if issued:
+                        calls[fingerprint] = asyncio.ensure_future(_call(messages))
+                    result = await asyncio.shield(calls[fingerprint])
+                else:
+                    result = await _call(messages)
+            if issued:
+                metrics.add_call(result)
+        except Exception as e:
+            return e
+        return {
+            "text": result["text"],
+            "model_type": model_name,
+            "audience": audience,
+            "verbosity": verbosity,
+            "style": style,
+            "cached": result["cached"],
+            "fingerprint": fingerprint,
+            "metrics": metrics.emit(),
+        }
+
+    # `gather` preserves the input order of the results
+    return await asyncio.gather(*(_run_one(obj) for obj in model_objects))
+
+def explain_many(
+    model_objects: Iterable[Any],
+    model: str,
+    context: str = None,
+    audience: str = "novice",
+    verbosity: str = "moderate",
+    style: str = "markdown",
+    max_prompt_tokens: int = None,
+    prompt_caching: bool = False,
+    max_concurrency: int = 8,
+    dedupe: bool = True,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> List[Union[dict, Exception]]:
+    """Explains a batch of statistical models with concurrent LLM calls.
+
+    Each model is processed as in :func:`explain`, but up to
+    `max_concurrency` LLM requests are in flight at any one time, so the
+    total run time is bounded by provider rate limits rather than by the
+    latency of individual calls.
+
+    Parameters
+    ----------
+    model_objects : Iterable[Any]
+        The fitted statistical model objects to explain.
+    model : str
+        The model string for the LLM provider (e.g., "gpt-4o").
+    context : str, optional
+        Additional context shared by every model in the batch.
+    audience : str, optional
+        The target audience for the explanations. Defaults to "novice".
+    verbosity : str, optional
+        The desired level of detail. Defaults to "moderate".
+    style : str, optional
+        The output format style. Defaults to "markdown".
+    prompt_caching : bool, optional
+        Whether to use the cache-friendly prompt layout (see
+        :func:`explain`). Defaults to False.
+    max_concurrency : int, optional
+        The maximum number of LLM calls in flight at once. Defaults to 8.
+    dedupe : bool, optional
+        If True (the default), models whose canonical summaries are
+        identical (same fingerprint) share a single LLM call.
+    cache : ResponseCache, optional
+        A response cache shared by every item in the batch.
+    policy : RequestPolicy, optional
+        The deadline, retry and hedging policy applied to every LLM call.
+    **kwargs : Any
+        Additional keyword arguments to pass to `litellm.acompletion`.
+
+    Returns
+    -------
+    list[dict | Exception]
+        One entry per input model, in input order. Successful items are
+        the dictionaries returned by :func:`explain`; failed items are the
+        exception that was raised, so a single failure does not abort the
+        whole batch.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError(
+            "explain_many() cannot be called from a running event loop; "
+            "use `await aexplain_many(...)` instead."
+        )
+    return asyncio.run(aexplain_many(
+        list(model_objects), model, context=context, audience=audience,
+        verbosity=verbosity, style=style, max_prompt_tokens=max_prompt_tokens,
+        prompt_caching=prompt_caching, max_concurrency=max_concurrency, dedupe=dedupe,
+        cache=cache, policy=policy, **kwargs
+    ))
+
+def _as_tuple(values: Union[str, Sequence[str]], name: str) -> tuple:
+    """Accepts a single option or a sequence of options, without duplicates."""
+    values = (values,) if isinstance(values, str) else tuple(dict.fromkeys(values))
+    if not values:
+        raise ValueError(f"`{name}` must not be empty.")
+    return values
+
+def _parse_variants(text: str, keys: List[str]) -> dict:
+    """Extracts the per-variant explanations from a multi-variant response."""
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        parsed = json.loads(text[start:end + 1]) if start != -1 else None
+    except json.JSONDecodeError:
+        parsed = None
+    if not isinstance(parsed, dict):
+        error = ValueError("The LLM did not return a JSON object of explanation variants.")
+        return {key: error for key in keys}
+    return {
+        key: parsed[key] if isinstance(parsed.get(key), str)
+        else ValueError(f"The LLM response has no explanation for variant {key!r}.")
+        for key in keys
+    }
+
+async def aexplain_variants(
+    model_object: Any,
+    model: str,
+    audiences: Union[str, Sequence[str]] = ("novice",),
+    verbosities: Union[str, Sequence[str]] = ("moderate",),
+    styles: Union[str, Sequence[str]] = ("markdown",),
+    context: str = None,
+    max_prompt_tokens: int = None,
+    prompt_caching: bool = False,
+    max_concurrency: int = 8,
+    single_call: bool = False,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> Dict[Tuple[str, str, str], Union[dict, Exception]]:
+    """Asynchronous version of :func:`explain_variants`."""
+    if max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be a positive integer.")
+    variants = list(itertools.product(
+        _as_tuple(audiences, "audiences"),
+        _as_tuple(verbosities, "verbosities"),
+        _as_tuple(styles, "styles"),
+    ))
+    kwargs = _normalize_kwargs(kwargs)
+
+    # The handler runs once; its cost is charged to the first variant
+    first = Metrics("explain_variants")
+    with first.stage("handler"):
+        model_name, summary_text = await asyncio.to_thread(
+            extract_summary, model_object, max_tokens=max_prompt_tokens
+        )
+        fingerprint = summary_fingerprint(model_name, summary_text)
+
+    def _result(variant: tuple, text: str, cached: bool, metrics: Metrics) -> dict:
+        audience, verbosity, style = variant
+        return {
+            "text": text,
+            "model_type": model_name,
+            "audience": audience,
+            "verbosity": verbosity,
+            "style": style,
+            "cached": cached,
+            "fingerprint": fingerprint,
+            "metrics": metrics.emit(),
+        }
+
+    if single_call:
+        with first.stage("prompt"):
+            system_prompt = assemble_multi_sys_prompt(model_name, tuple(variants))
+            user_prompt = build_user_prompt(f"{model_name} model", summary_text, context)
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ]
+        with first.stage("llm"):
+            result = await acomplete(model, messages, cache=cache, policy=policy, **kwargs)
+        first.add_call(result)
+        texts = _parse_variants(result["text"], [variant_key(*variant) for variant in variants])
+        output = {}
+        for i, variant in enumerate(variants):
+            text = texts[variant_key(*variant)]
+            metrics = first if i == 0 else Metrics("explain_variants")
+            output[variant] = text if isinstance(text, Exception) \
+                else _result(variant, text, result["cached"], metrics)
+        if isinstance(output[variants[0]], Exception):
+            first.emit()
+        return output
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run_one(i: int, variant: tuple) -> Union[dict, Exception]:
+        metrics = first if i == 0 else Metrics("explain_variants")
+        try:
+            with metrics.stage("prompt"):
+                messages = _build_messages(
+                    model_name, summary_text, context, *variant, prompt_caching, model
+                )
+            async with semaphore:
+                with metrics.stage("llm"):
+                    result = await acomplete(model, messages, cache=cache, policy=policy, **kwargs)
+            metrics.add_call(result)
+        except Exception as e:
+            return e
+        return _result(variant, result["text"], result["cached"], metrics)
+
+    results = await asyncio.gather(*(_run_one(i, variant) for i, variant in enumerate(variants)))
+    return dict(zip(variants, results))
+
+def explain_variants(
+    model_object: Any,
+    model: str,
+    audiences: Union[str, Sequence[str]] = ("novice",),
+    verbosities: Union[str, Sequence[str]] = ("moderate",),
+    styles: Union[str, Sequence[str]] = ("markdown",),
+    context: str = None,
+    max_prompt_tokens: int = None,
+    prompt_caching: bool = False,
+    max_concurrency: int = 8,
+    single_call: bool = False,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> Dict[Tuple[str, str, str], Union[dict, Exception]]:
+    """Explains one model for several audiences, verbosities and styles.
+
+    The model summary is extracted once and every combination of the
+    given audiences, verbosities and styles is explained from it. By
+    default, each combination gets its own LLM call (with its memoized
+    system prompt), and up to `max_concurrency` calls are in flight at
+    once. With `single_call=True`, one LLM call is asked for all variants
+    as the keyed fields of a JSON object, which sends the summary only
+    once at the cost of a longer response.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statistical model object.
+    model : str
+        The model string for the LLM provider (e.g., "gpt-4o").
+    audiences : str or sequence of str, optional
+        The target audiences, by default ("novice",).
+    verbosities : str or sequence of str, optional
+        The levels of detail, by default ("moderate",).
+    styles : str or sequence of str, optional
+        The output format styles, by default ("markdown",).
+    context : str, optional
+        Additional context about the data or research question.
+    max_prompt_tokens : int, optional
+        An (estimated) token budget for the model summary.
+    prompt_caching : bool, optional
+        Whether to use the cache-friendly prompt layout (see
+        :func:`explain`), so that the variants share a cached prefix up to
+        the end of the summary. Ignored with `single_call`. Defaults to
+        False.
+    max_concurrency : int, optional
+        The maximum number of LLM calls in flight at once. Defaults to 8.
+    single_call : bool, optional
+        If True, request every variant in a single LLM call. Defaults to
+        False.
+    cache : ResponseCache, optional
+        A response cache shared by every variant.
+    policy : RequestPolicy, optional
+        The deadline, retry and hedging policy applied to every LLM call.
+    **kwargs : Any
+        Additional keyword arguments to pass to `litellm.acompletion`.
+
+    Returns
+    -------
+    dict[tuple[str, str, str], dict | Exception]
+        One entry per (audience, verbosity, style) combination, in the
+        order of the inputs. Successful entries are dictionaries as
+        returned by :func:`explain`; failed entries (e.g., a variant
+        missing from a single-call response) are the exception raised.
+        The handler's cost (and, with `single_call`, the LLM call) is
+        charged to the first variant's metrics.
+
+    Examples
+    --------
+    >>> variants = explain_variants(  # doctest: +SKIP
+    ...     fit, model="gpt-4o", audiences=["manager", "researcher", "novice"],
+    ...     verbosities=["brief", "detailed"],
+    ... )
+    >>> variants["manager", "brief", "markdown"]["text"]  # doctest: +SKIP
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError(
+            "explain_variants() cannot be called from a running event loop; "
+            "use `await aexplain_variants(...)` instead."
+        )
+    return asyncio.run(aexplain_variants(
+        model_object, model, audiences=audiences, verbosities=verbosities, styles=styles,
+        context=context, max_prompt_tokens=max_prompt_tokens, prompt_caching=prompt_caching,
+        max_concurrency=max_concurrency, single_call=single_call, cache=cache,
+        policy=policy, **kwargs
+    ))
+
+class ExplanationStream:
+    """An explanation whose text is delivered incrementally.
+
+    Iterate over the stream (with `for`, or `async for` when it was created
+    by :func:`aexplain_stream`) to receive text chunks as the LLM produces
+    them. Once the stream is exhausted, :attr:`result` holds the same
+    dictionary that :func:`explain` would have returned.
+
+    Attributes
+    ----------
+    metadata : dict
+        The explanation metadata ('model_type', 'audience', 'verbosity',
+        'style' and 'fingerprint'), available before streaming starts.
+    result : dict or None
+        The complete output dictionary, or None until the stream finishes.
+        Its 'metrics' separate the time to the first chunk ('first_token')
+        from the whole generation ('llm').
+    """
+
+    def __init__(self, chunks, metadata: dict, status: dict, metrics: Metrics = None):
+        self._chunks = chunks
+        self._status = status
+        self._metrics = Metrics("explain_stream") if metrics is None else metrics
+        self.metadata = metadata
+        self.result = None
+
+    def _record_chunk(self, start: float, first: bool) -> None:
+        if first:
+            self._metrics.add_time("first_token", time.perf_counter() - start)
+
+    def _finish(self, start: float) -> None:
+        self._metrics.add_time("llm", time.perf_counter() - start)
+        self._metrics.add_call(self._status)
+        self.result = {
+            "text": self._status["text"],
+            "model_type": self.metadata["model_type"],
+            "audience": self.metadata["audience"],
+            "verbosity": self.metadata["verbosity"],
+            "style": self.metadata["style"],
+            "cached": self._status["cached"],
+            "fingerprint": self.metadata["fingerprint"],
+            "metrics": self._metrics.emit(),
+        }
+
+    def __iter__(self) -> Iterator[str]:
+        start = time.perf_counter()
+        first = True
+        for chunk in self._chunks:
+            self._record_chunk(start, first)
+            first = False
+            yield chunk
+        self._finish(start)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        first = True
+        async for chunk in self._chunks:
+            self._record_chunk(start, first)
+            first = False
+            yield chunk
+        self._finish(start)
+
+def explain_stream(
+    model_object: Any,
+    model: str,
+    context: str = None,
+    audience: str = "novice",
+    verbosity: str = "moderate",
+    style: str = "markdown",
+    max_prompt_tokens: int = None,
+    prompt_caching: bool = False,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> ExplanationStream:
+    """Explains a statistical model, streaming the text as it is generated.
+
+    The parameters are the same as for :func:`explain`. The LLM is called
+    with `stream=True`, so the first chunk arrives after the provider's
+    time-to-first-token rather than after the whole response is generated.
+
+    Returns
+    -------
+    ExplanationStream
+        An iterable of text chunks. After iteration, its `result` attribute
+        holds the same dictionary as returned by :func:`explain`.
+
+    Examples
+    --------
+    >>> stream = explain_stream(fit, model="gpt-4o")  # doctest: +SKIP
+    >>> for chunk in stream:  # doctest: +SKIP
+    ...     print(chunk, end="", flush=True)
+    >>> stream.result["model_type"]  # doctest: +SKIP
+    'lm'
+    """
+    metrics = Metrics("explain_stream")
+    model_name, messages, fingerprint = _prepare_messages(
+        model_object, context, audience, verbosity, style, max_prompt_tokens, metrics,
+        prompt_caching, model,
+    )
+    kwargs = _normalize_kwargs(kwargs)
+    status = {}
+    chunks = stream_complete(
+        model, messages, cache=cache, status=status, policy=policy, **kwargs
+    )
+    metadata = {
+        "model_type": model_name,
+        "audience": audience,
+        "verbosity": verbosity,
+        "style": style,
+        "fingerprint": fingerprint,
+    }
+    return ExplanationStream(chunks, metadata, status, metrics)
+
+async def aexplain_stream(
+    model_object: Any,
+    model: str,
+    context: str = None,
+    audience: str = "novice",
+    verbosity: str = "moderate",
+    style: str = "markdown",
+    max_prompt_tokens: int = None,
+    prompt_caching: bool = False,
+    cache: ResponseCache = None,
+    policy: RequestPolicy = None,
+    **kwargs: Any,
+) -> ExplanationStream:
+    """Asynchronous version of :func:`explain_stream`.
+
+    Await this coroutine to get an :class:`ExplanationStream`, then consume
+    it with `async for`.
+    """
+    metrics = Metrics("aexplain_stream")
+    model_name, messages, fingerprint = await asyncio.to_thread(
+        _prepare_messages, model_object, context, audience, verbosity, style,
+        max_prompt_tokens, metrics, prompt_caching, model,
+    )
+    kwargs = _normalize_kwargs(kwargs)
+    status = {}
+    chunks = astream_complete(
+        model, messages, cache=cache, status=status, policy=policy, **kwargs
+    )
+    metadata = {
+        "model_type": model_name,
+        "audience": audience,
+        "verbosity": verbosity,
+        "style": style,
+        "fingerprint": fingerprint,
+    }
+    return ExplanationStream(chunks, metadata, status, metrics)
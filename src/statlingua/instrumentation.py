@@ -0,0 +1,158 @@
+# src/statlingua/instrumentation.py
+
+# Stage-level timings and token accounting.
+#
+# Every explain(), diagnose() and diagnose_agent() call collects a `Metrics`
+# record: wall-clock seconds per stage (handler extraction, prompt assembly,
+# LLM calls, tools, ...), token counts from the litellm response `usage`,
+# and cache hits, misses, retries and hedged requests. The record is returned under the
+# 'metrics' key of the result and passed to every registered hook, so it
+# can be forwarded to a metrics system. With no hooks registered the cost
+# is a handful of `time.perf_counter()` calls per request.
+
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+# Hooks receive the metrics dictionary of each finished call
+_HOOKS: list = []
+_HOOKS_LOCK = threading.Lock()
+
+def register_hook(hook: Callable[[dict], Any]) -> Callable[[dict], Any]:
+    """Registers a function to be called with the metrics of every call.
+
+    Can be used as a decorator. Hooks run synchronously in the calling
+    thread once a call has finished; exceptions they raise are turned into
+    warnings so that instrumentation never breaks an explanation.
+
+    Parameters
+    ----------
+    hook : Callable[[dict], Any]
+        A function taking the metrics dictionary (see :meth:`Metrics.as_dict`).
+
+    Returns
+    -------
+    Callable[[dict], Any]
+        The hook itself.
+
+    Examples
+    --------
+    >>> @register_hook  # doctest: +SKIP
+    ... def to_statsd(metrics):
+    ...     statsd.timing("statlingua.llm", metrics["stages"].get("llm", 0))
+    """
+    with _HOOKS_LOCK:
+        _HOOKS.append(hook)
+    return hook
+
+def unregister_hook(hook: Callable[[dict], Any]) -> None:
+    """Removes a hook added with :func:`register_hook` (a no-op if absent)."""
+    with _HOOKS_LOCK:
+        if hook in _HOOKS:
+            _HOOKS.remove(hook)
+
+def clear_hooks() -> None:
+    """Removes every registered hook."""
+    with _HOOKS_LOCK:
+        _HOOKS.clear()
+
+class Metrics:
+    """Collects the timings and LLM usage of a single statlingua call.
+
+    Parameters
+    ----------
+    operation : str
+        The name of the public function being measured (e.g., "explain").
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.stages = {}
+        self.llm_calls = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.retries = 0
+        self.hedges = 0
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Times a block of code, adding its duration to stage `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Adds `seconds` to the duration of stage `name`."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_call(self, result: dict) -> None:
+        """Records one LLM call from a completion result dictionary.
+
+        Parameters
+        ----------
+        result : dict
+            A dictionary as returned by :func:`statlingua.completion.complete`;
+            the keys 'cached', 'usage', 'retries' and 'hedged' are read if
+            present.
+        """
+        self.llm_calls += 1
+        if result.get("cached"):
+            self.cache_hits += 1
+        usage = result.get("usage") or {}
+        self.prompt_tokens += usage.get("prompt_tokens") or 0
+        self.completion_tokens += usage.get("completion_tokens") or 0
+        self.cached_tokens += usage.get("cached_tokens") or 0
+        self.retries += result.get("retries") or 0
+        self.hedges += 1 if result.get("hedged") else 0
+
+    def as_dict(self) -> dict:
+        """Returns the metrics as a plain dictionary.
+
+        Returns
+        -------
+        dict
+            A dictionary with keys 'operation', 'total_seconds', 'stages'
+            (seconds per stage), 'llm_calls', 'cache_hits', 'cache_misses',
+            'prompt_tokens', 'completion_tokens', 'cached_tokens' (prompt
+            tokens served from the provider's prompt cache), 'retries' and
+            'hedges'.
+        """
+        return {
+            "operation": self.operation,
+            "total_seconds": time.perf_counter() - self._start,
+            "stages": dict(self.stages),
+            "llm_calls": self.llm_calls,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.llm_calls - self.cache_hits,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "retries": self.retries,
+            "hedges": self.hedges,
+        }
+
+    def emit(self) -> dict:
+        """Finishes the record and passes it to every registered hook.
+
+        Returns
+        -------
+        dict
+            The metrics dictionary (see :meth:`as_dict`).
+        """
+        metrics = self.as_dict()
+        if _HOOKS:
+            with _HOOKS_LOCK:
+                hooks = list(_HOOKS)
+            for hook in hooks:
+                try:
+                    hook(metrics)
+                except Exception as e:
+                    warnings.warn(f"statlingua metrics hook {hook!r} failed: {e}")
+        return metrics
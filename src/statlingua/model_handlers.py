@@ -9,18 +9,28 @@
 # We can now systematically add support for models from scikit-learn, lifelines 
 # (for survival analysis), and other popular Python data science libraries.
 
-from typing import Any, Callable, Tuple
+import hashlib
+import re
+import threading
+import warnings
+import weakref
+from typing import Any, Callable, Tuple, Union
 
-# The registry to hold our model handlers
-MODEL_HANDLERS: dict[type, Callable[[Any], Tuple[str, str]]] = {}
+# The registry to hold our model handlers. Keys are either classes or fully
+# qualified class names (e.g., "statsmodels.regression.linear_model.OLSResults");
+# the latter let us support third-party models without importing their
+# libraries until an object of that type is actually explained.
+MODEL_HANDLERS: dict[Union[type, str], Callable[[Any], Tuple[str, str]]] = {}
 
-def register_handler(model_class: type):
+def register_handler(model_class: Union[type, str]):
     """A decorator to register a handler for a specific model class.
 
     Parameters
     ----------
-    model_class : type
-        The class of the model object to be handled (e.g., OLSResults).
+    model_class : type or str
+        The class of the model object to be handled (e.g., OLSResults), or
+        its fully qualified name as a string, which avoids importing the
+        library that defines it.
     """
     def decorator(func: Callable[[Any], Tuple[str, str]]):
         """The actual decorator that registers the function."""
@@ -28,11 +38,16 @@ def register_handler(model_class: type):
         return func
     return decorator
 
+def _qualified_name(cls: type) -> str:
+    """Returns the fully qualified name of a class."""
+    return f"{cls.__module__}.{cls.__qualname__}"
+
 def get_handler(model_object: Any) -> Callable[[Any], Tuple[str, str]]:
     """Finds the appropriate handler for a given model object.
 
     If a specific handler for the object's class is not found, it
-    returns the default handler.
+    returns the default handler. statsmodels results wrappers (as returned
+    by `.fit()`) are matched on the class of the results they wrap.
 
     Parameters
     ----------
@@ -44,7 +59,615 @@ def get_handler(model_object: Any) -> Callable[[Any], Tuple[str, str]]:
     Callable[[Any], Tuple[str, str]]
         The handler function to be used for the object.
     """
-    return MODEL_HANDLERS.get(type(model_object), handle_default)
+    candidates = [type(model_object)]
+    wrapped = getattr(model_object, "_results", None)
+    if wrapped is not None:
+        candidates.append(type(wrapped))
+    for cls in candidates:
+        handler = MODEL_HANDLERS.get(cls) or MODEL_HANDLERS.get(_qualified_name(cls))
+        if handler is not None:
+            return handler
+    return handle_default
+
+# Per-model Memoization -------------------------------------------------------
+
+# Handler output and other derived data, keyed by `id(model_object)`. Each
+# entry is removed by a `weakref.finalize` callback when its model object is
+# garbage-collected, so ids are never reused while an entry is alive and the
+# cache never keeps a model alive. (A WeakKeyDictionary would require model
+# objects to be hashable, which results classes do not guarantee.) The
+# finalizers take the lock too; it is re-entrant because garbage collection
+# can run them on a thread that already holds it.
+_MODEL_CACHE: dict[int, dict] = {}
+_MODEL_CACHE_LOCK = threading.RLock()
+
+def _evict(object_id: int) -> None:
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.pop(object_id, None)
+
+def memoize_per_model(model_object: Any, key: Any, compute: Callable[[], Any]) -> Any:
+    """Returns a value derived from a model object, computing it only once.
+
+    Parameters
+    ----------
+    model_object : Any
+        The fitted model object the value belongs to.
+    key : Any
+        A hashable key naming the value (e.g., "summary").
+    compute : Callable[[], Any]
+        Computes the value on a cache miss.
+
+    Returns
+    -------
+    Any
+        The cached or freshly computed value. Objects that cannot be weakly
+        referenced (e.g., plain strings) are never cached.
+    """
+    object_id = id(model_object)
+    with _MODEL_CACHE_LOCK:
+        entry = _MODEL_CACHE.get(object_id)
+        if entry is not None and key in entry:
+            return entry[key]
+    value = compute()
+    with _MODEL_CACHE_LOCK:
+        entry = _MODEL_CACHE.get(object_id)
+        if entry is None:
+            try:
+                weakref.finalize(model_object, _evict, object_id)
+            except TypeError:
+                return value
+            entry = _MODEL_CACHE[object_id] = {}
+        return entry.setdefault(key, value)
+
+def clear_summary_cache() -> None:
+    """Drops every memoized summary (entries are otherwise freed with their models)."""
+    with _MODEL_CACHE_LOCK:
+        for entry in list(_MODEL_CACHE.values()):
+            entry.clear()
+
+# Canonicalization ------------------------------------------------------------
+
+# Summary fields whose values change between otherwise identical fits. In
+# statsmodels' two-column header tables, a cell is a label followed by its
+# value, and cells are separated by at least two spaces.
+VOLATILE_FIELDS = ("Date", "Time")
+
+_VOLATILE_CELL = re.compile(
+    r"(?m)^(?P<cell>(?:%s):[ \t]+\S+(?: \S+)*)(?=[ \t]{2,}|[ \t]*$)"
+    % "|".join(re.escape(field) for field in VOLATILE_FIELDS)
+)
+
+def canonicalize_summary(summary_text: str) -> str:
+    """Removes volatile fields from a model summary.
+
+    The `Date:` and `Time:` header cells of statsmodels summaries are
+    blanked out (keeping the alignment of the neighbouring column), and
+    trailing whitespace is stripped, so that two identical refits produce
+    identical text.
+
+    Parameters
+    ----------
+    summary_text : str
+        The summary text produced by a handler.
+
+    Returns
+    -------
+    str
+        The canonical summary text.
+    """
+    lines = []
+    for line in summary_text.splitlines():
+        canonical = _VOLATILE_CELL.sub(lambda m: " " * len(m.group("cell")), line)
+        # Drop header rows that only held volatile fields
+        if canonical.strip() or not line.strip():
+            lines.append(canonical.rstrip())
+    return "\n".join(lines)
+
+def summary_fingerprint(model_name: str, summary_text: str) -> str:
+    """Computes a stable content hash for a model summary.
+
+    Parameters
+    ----------
+    model_name : str
+        The internal model name returned by the handler (e.g., "lm").
+    summary_text : str
+        The summary text; it is canonicalized before hashing.
+
+    Returns
+    -------
+    str
+        A hex-encoded SHA-256 digest. Numerically identical models yield
+        the same fingerprint regardless of when they were fitted.
+    """
+    canonical = canonicalize_summary(summary_text)
+    digest = hashlib.sha256(f"{model_name}\0{canonical}".encode("utf-8"))
+    return digest.hexdigest()
+
+def extract_summary(model_object: Any, max_tokens: int = None) -> Tuple[str, str]:
+    """Runs the appropriate handler and canonicalizes its output.
+
+    Parameters
+    ----------
+    model_object : Any
+        The statistical model object to be explained.
+    max_tokens : int, optional
+        If given, the summary is compacted to fit this (estimated) token
+        budget with :func:`compact_summary`. Defaults to None (no limit).
+
+    Returns
+    -------
+    tuple[str, str]
+        A tuple containing the model name and its canonical summary.
+    """
+    def _extract() -> Tuple[str, str]:
+        handler = get_handler(model_object)
+        model_name, summary_text = handler(model_object)
+        return model_name, canonicalize_summary(summary_text)
+
+    # Handler output is memoized per model object, so explain(), diagnose()
+    # and diagnose_agent() on the same fit only run the handler once
+    model_name, summary_text = memoize_per_model(model_object, "summary", _extract)
+    if max_tokens is not None:
+        summary_text = memoize_per_model(
+            model_object, ("summary", max_tokens),
+            lambda: compact_summary(model_object, summary_text, max_tokens),
+        )
+    return model_name, summary_text
+
+# Structured Extraction ---------------------------------------------------------
+
+# Fit statistics pulled directly from a results object, as (label,
+# attribute, format) triples. Attributes that are missing, fail to compute
+# or are not finite numbers are skipped, so one list serves every
+# statsmodels results class. Likelihood-scale statistics are large and
+# compared by their differences, so they keep fixed decimals rather than
+# significant digits.
+FIT_STATISTICS = [
+    ("No. Observations", "nobs", ".4g"),
+    ("Df Residuals", "df_resid", ".4g"),
+    ("Df Model", "df_model", ".4g"),
+    ("R-squared", "rsquared", ".4g"),
+    ("Adj. R-squared", "rsquared_adj", ".4g"),
+    ("F-statistic", "fvalue", ".4g"),
+    ("Prob (F-statistic)", "f_pvalue", ".4g"),
+    ("Scale", "scale", ".4g"),
+    ("Log-Likelihood", "llf", ".3f"),
+    ("Deviance", "deviance", ".3f"),
+    ("Pearson chi2", "pearson_chi2", ".3f"),
+    ("AIC", "aic", ".3f"),
+    ("BIC", "bic", ".3f"),
+]
+
+class StructuredSummary:
+    """A model summary held as arrays rather than rendered text.
+
+    Parameters
+    ----------
+    title : str
+        A short title for the summary (e.g., "OLS Regression Results").
+    header : list[tuple[str, str]]
+        Model information and fit statistics as (label, value) pairs.
+    names : numpy.ndarray
+        The coefficient names.
+    params, bse, statistic, pvalues : numpy.ndarray
+        The coefficient estimates, their standard errors, test statistics
+        and p-values.
+    conf_int : numpy.ndarray
+        An array of shape (n_params, 2) with the 95% confidence limits.
+    stat_label : str, optional
+        The name of the test statistic ("t" or "z"). Defaults to "t".
+    notes : list[str], optional
+        Warnings about the fit, such as a large condition number. Defaults
+        to no notes.
+    """
+
+    def __init__(self, title, header, names, params, bse, statistic, pvalues,
+                 conf_int, stat_label="t", notes=None):
+        self.title = title
+        self.header = header
+        self.names = names
+        self.params = params
+        self.bse = bse
+        self.statistic = statistic
+        self.pvalues = pvalues
+        self.conf_int = conf_int
+        self.stat_label = stat_label
+        self.notes = list(notes or [])
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def render_header(self) -> str:
+        """Renders the title, fit statistics (one per line) and notes."""
+        lines = [self.title]
+        lines.extend(f"{label}: {value}" for label, value in self.header)
+        if self.notes:
+            lines.append("Notes:")
+            lines.extend(f"[{i}] {note}" for i, note in enumerate(self.notes, start=1))
+        return "\n".join(lines)
+
+    def render_table(self, rows=None) -> str:
+        """Renders (a subset of) the coefficient table as fixed-width text.
+
+        Parameters
+        ----------
+        rows : array-like of int, optional
+            Indices of the coefficients to include, in display order.
+            Defaults to all coefficients.
+
+        Returns
+        -------
+        str
+            The coefficient table.
+        """
+        import numpy as np
+
+        index = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=int)
+        if len(index) == 0:
+            return ""
+        columns = [
+            ("", self.names[index].astype(str)),
+            ("coef", np.char.mod("%.4g", self.params[index])),
+            ("std err", np.char.mod("%.3g", self.bse[index])),
+            (self.stat_label, np.char.mod("%.3f", self.statistic[index])),
+            (f"P>|{self.stat_label}|", np.char.mod("%.3g", self.pvalues[index])),
+            ("[0.025", np.char.mod("%.4g", self.conf_int[index, 0])),
+            ("0.975]", np.char.mod("%.4g", self.conf_int[index, 1])),
+        ]
+        lines = []
+        cells = []
+        for i, (label, values) in enumerate(columns):
+            width = max(len(label), int(np.char.str_len(values).max()))
+            if i == 0:
+                lines.append(label.ljust(width))
+                cells.append(np.char.ljust(values, width))
+            else:
+                lines.append(label.rjust(width))
+                cells.append(np.char.rjust(values, width))
+        # Join the columns row-wise with array operations rather than a loop
+        # over coefficients
+        body = cells[0]
+        for column in cells[1:]:
+            body = np.char.add(np.char.add(body, "  "), column)
+        return "\n".join(["  ".join(lines).rstrip()] + body.tolist())
+
+    def render(self, rows=None) -> str:
+        """Renders the header and the coefficient table."""
+        return self.render_header() + "\n\n" + self.render_table(rows)
+
+def _format_statistic(value: Any, spec: str = ".4g") -> str:
+    """Formats a fit statistic compactly, or returns None if not usable."""
+    import numpy as np
+
+    if isinstance(value, str):
+        return value
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not np.isfinite(value):
+        return None
+    return str(int(value)) if value.is_integer() else format(value, spec)
+
+def _design_eigenvalues(model_object: Any):
+    """The eigenvalues of X'X of a linear regression, in decreasing order.
+
+    statsmodels caches them on the results object, reusing the singular
+    values of its pseudo-inverse, so reading them is nearly free. Only
+    results without them fall back to an SVD of the whitened design, whose
+    cost grows with n * p**2.
+    """
+    import numpy as np
+
+    try:
+        eigenvalues = np.asarray(model_object.eigenvals, dtype=float)
+    except Exception:
+        eigenvalues = None
+    if eigenvalues is None or eigenvalues.ndim != 1 or len(eigenvalues) == 0:
+        model = model_object.model
+        exog = np.asarray(getattr(model, "wexog", model.exog), dtype=float)
+        # The eigenvalues of X'X are the squared singular values of X
+        eigenvalues = np.linalg.svd(exog, compute_uv=False) ** 2
+    return np.sort(eigenvalues)[::-1]
+
+def _regression_diagnostics(model_object: Any) -> Tuple[list, list]:
+    """Residual tests, the condition number and notes of a linear regression.
+
+    These are the lower panel and the notes of statsmodels' OLS/WLS
+    `summary()`, computed directly from the whitened residuals and the
+    eigenvalues of the design matrix.
+
+    Returns
+    -------
+    tuple[list, list]
+        The (label, value) pairs and the notes.
+    """
+    import numpy as np
+    from statsmodels.stats.stattools import durbin_watson, jarque_bera, omni_normtest
+
+    header, notes = [], []
+    resid = np.asarray(model_object.wresid, dtype=float)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            omni, omni_pvalue = omni_normtest(resid)
+            jb, jb_pvalue, skew, kurtosis = jarque_bera(resid)
+            statistics = [
+                ("Omnibus", omni), ("Prob(Omnibus)", omni_pvalue),
+                ("Skew", skew), ("Kurtosis", kurtosis),
+                ("Durbin-Watson", durbin_watson(resid)),
+                ("Jarque-Bera (JB)", jb), ("Prob(JB)", jb_pvalue),
+            ]
+    except Exception:
+        # The omnibus test needs at least 8 residuals
+        statistics = [("Durbin-Watson", durbin_watson(resid))]
+    for label, value in statistics:
+        value = _format_statistic(value)
+        if value is not None:
+            header.append((label, value))
+
+    if not getattr(model_object, "k_constant", True):
+        notes.append("R-squared is computed without centering (uncentered) since "
+                     "the model does not contain a constant.")
+    description = (getattr(model_object, "cov_kwds", None) or {}).get("description")
+    if description:
+        notes.append(description)
+
+    model = model_object.model
+    eigenvalues = _design_eigenvalues(model_object)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        condition_number = float(np.sqrt(eigenvalues[0] / eigenvalues[-1]))
+    value = _format_statistic(condition_number, ".3g")
+    if value is not None:
+        header.append(("Cond. No.", value))
+    n_obs, n_columns = np.shape(model.exog)
+    if n_obs < n_columns:
+        notes.append("The input rank is higher than the number of observations.")
+    if eigenvalues[-1] < 1e-10:
+        notes.append(f"The smallest eigenvalue is {eigenvalues[-1]:.3g}. This might "
+                     "indicate that there are strong multicollinearity problems or that "
+                     "the design matrix is singular.")
+    elif condition_number > 1000:
+        notes.append(f"The condition number is large, {condition_number:.3g}. This might "
+                     "indicate that there are strong multicollinearity or other numerical "
+                     "problems.")
+    return header, notes
+
+def structured_summary(model_object: Any) -> Union[StructuredSummary, None]:
+    """Extracts a structured summary from a fitted model without `summary()`.
+
+    The coefficient table is built from the `params`, `bse`, `tvalues`,
+    `pvalues` and `conf_int()` of the results object as NumPy arrays, which
+    avoids building and rendering statsmodels' full `SimpleTable`.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statsmodels-like results object.
+
+    Returns
+    -------
+    StructuredSummary or None
+        The structured summary, or None if the object does not expose the
+        required attributes (callers then fall back to `summary()` text).
+        The result is memoized per model object.
+    """
+    return memoize_per_model(
+        model_object, "structured", lambda: _extract_structured(model_object)
+    )
+
+def _extract_structured(model_object: Any) -> Union[StructuredSummary, None]:
+    """Builds the structured summary for :func:`structured_summary`."""
+    required = ("params", "bse", "tvalues", "pvalues", "conf_int")
+    if not all(hasattr(model_object, attr) for attr in required):
+        return None
+    try:
+        import numpy as np
+
+        params = model_object.params
+        names = getattr(params, "index", None)
+        if names is None:
+            names = getattr(getattr(model_object, "model", None), "exog_names", None)
+        params = np.asarray(params, dtype=float).ravel()
+        if names is None or len(names) != len(params):
+            names = [f"x{i}" for i in range(len(params))]
+        conf_int = np.asarray(model_object.conf_int(), dtype=float).reshape(len(params), 2)
+        stat_label = "t" if getattr(model_object, "use_t", True) else "z"
+
+        model = getattr(model_object, "model", None)
+        title = f"{type(model).__name__} Regression Results" if model is not None \
+            else "Regression Results"
+        header = []
+        endog_names = getattr(model, "endog_names", None)
+        if endog_names is not None:
+            header.append(("Dep. Variable", str(endog_names)))
+        family = getattr(model, "family", None)
+        if family is not None:
+            header.append(("Model Family", type(family).__name__))
+            header.append(("Link Function", type(family.link).__name__))
+        cov_type = getattr(model_object, "cov_type", None)
+        if cov_type is not None:
+            header.append(("Covariance Type", str(cov_type)))
+        for label, attr, spec in FIT_STATISTICS:
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    value = _format_statistic(getattr(model_object, attr), spec)
+            except Exception:
+                # Some statistics are undefined for some families or fits
+                continue
+            if value is not None:
+                header.append((label, value))
+        notes = []
+        if hasattr(model_object, "wresid") and model is not None:
+            # Linear regressions (OLS, WLS, GLS) also report residual tests
+            diagnostics, notes = _regression_diagnostics(model_object)
+            header.extend(diagnostics)
+
+        return StructuredSummary(
+            title=title,
+            header=header,
+            names=np.asarray(names, dtype=object),
+            params=params,
+            bse=np.asarray(model_object.bse, dtype=float).ravel(),
+            statistic=np.asarray(model_object.tvalues, dtype=float).ravel(),
+            pvalues=np.asarray(model_object.pvalues, dtype=float).ravel(),
+            conf_int=conf_int,
+            stat_label=stat_label,
+            notes=notes,
+        )
+    except Exception:
+        return None
+
+def _summary_text(model_object: Any) -> str:
+    """Renders the structured summary, falling back to `summary()` text."""
+    structured = structured_summary(model_object)
+    if structured is not None:
+        return structured.render()
+    return str(model_object.summary())
+
+# Compaction --------------------------------------------------------------------
+
+def _truncate_lines(summary_text: str, max_tokens: int) -> str:
+    """Keeps the leading lines of a summary that fit in `max_tokens`."""
+    from .prompts import estimate_tokens
+
+    lines = summary_text.splitlines()
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line + "\n")
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    omitted = len(lines) - len(kept)
+    if omitted:
+        kept.append(f"[... {omitted} more lines omitted to fit the token budget]")
+    return "\n".join(kept)
+
+def compact_summary(
+    model_object: Any,
+    summary_text: str,
+    max_tokens: int,
+    rank_by: str = "statistic",
+) -> str:
+    """Shrinks a model summary to fit a token budget.
+
+    If the summary already fits, it is returned unchanged. Otherwise the
+    header and fit statistics are kept, the top-k coefficients by absolute
+    test statistic (or smallest p-value) are listed in their original
+    order, and a single line summarizes the omitted terms. Objects without
+    a structured summary are truncated line by line instead.
+
+    Parameters
+    ----------
+    model_object : Any
+        The fitted model object the summary was produced from.
+    summary_text : str
+        The summary text returned by the model's handler.
+    max_tokens : int
+        The maximum (estimated) number of tokens for the summary.
+    rank_by : str, optional
+        How to rank coefficients: "statistic" (largest |t| or |z|) or
+        "pvalue" (smallest p-value). Defaults to "statistic".
+
+    Returns
+    -------
+    str
+        The summary text, compacted if needed.
+    """
+    import numpy as np
+    from .prompts import estimate_tokens
+
+    if estimate_tokens(summary_text) <= max_tokens:
+        return summary_text
+    if rank_by not in ("statistic", "pvalue"):
+        raise ValueError("`rank_by` must be one of 'statistic' or 'pvalue'.")
+    structured = structured_summary(model_object)
+    if structured is None or structured.title not in summary_text:
+        return _truncate_lines(summary_text, max_tokens)
+
+    # Keep any description the handler put before the structured header
+    prefix = summary_text[:summary_text.index(structured.title)]
+    head = prefix + structured.render_header() + "\n\n"
+    # Reserve room for the aggregate line and the table's column header
+    available = max_tokens - estimate_tokens(head) - 40
+    # Rows of the fixed-width table all have the same width, so the cost of
+    # one rendered row gives the number of rows that fit
+    row_tokens = estimate_tokens(structured.render_table([0]).splitlines()[-1] + "\n")
+    k = int(np.clip(available // max(row_tokens, 1), 1, len(structured)))
+
+    if rank_by == "pvalue":
+        score = -np.nan_to_num(structured.pvalues, nan=1.0)
+    else:
+        score = np.nan_to_num(np.abs(structured.statistic), nan=0.0)
+    # Order the k best candidates by score; only they are ever rendered
+    top = np.argpartition(-score, k - 1)[:k] if k < len(structured) else np.arange(k)
+    top = top[np.argsort(-score[top], kind="stable")]
+
+    while True:
+        rows = np.sort(top[:k])
+        omitted = np.ones(len(structured), dtype=bool)
+        omitted[rows] = False
+        n_omitted = int(omitted.sum())
+        text = head + structured.render_table(rows)
+        if n_omitted:
+            pvalues = structured.pvalues[omitted]
+            largest = np.nanmax(np.abs(structured.statistic[omitted]))
+            text += (
+                f"\n[... {n_omitted} of {len(structured)} terms omitted to fit the "
+                f"token budget; {int(np.sum(pvalues < 0.05))} of them have p < 0.05 "
+                f"and the largest omitted |{structured.stat_label}| is {largest:.3f}]"
+            )
+        used = estimate_tokens(text)
+        if used <= max_tokens or k == 1:
+            return text
+        # Column widths depend on the selected rows, so shrink and re-render
+        k = max(1, min(k - 1, int(k * max_tokens / used)))
+
+def summary_blocks(
+    model_object: Any,
+    summary_text: str,
+    block_size: int,
+) -> Tuple[str, list]:
+    """Splits a model summary into blocks of coefficients.
+
+    Each block repeats the header and fit statistics so it can be explained
+    on its own. Summaries without a structured form, or with no more than
+    `block_size` coefficients, yield a single block.
+
+    Parameters
+    ----------
+    model_object : Any
+        The fitted model object the summary was produced from.
+    summary_text : str
+        The summary text returned by the model's handler.
+    block_size : int
+        The maximum number of coefficients per block.
+
+    Returns
+    -------
+    tuple[str, list[str]]
+        The shared header text and the list of block texts.
+    """
+    if block_size < 1:
+        raise ValueError("`block_size` must be a positive integer.")
+    structured = structured_summary(model_object)
+    if structured is None or structured.title not in summary_text \
+            or len(structured) <= block_size:
+        return summary_text, [summary_text]
+
+    prefix = summary_text[:summary_text.index(structured.title)]
+    header = prefix + structured.render_header()
+    n = len(structured)
+    blocks = []
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        blocks.append(
+            f"{header}\n\nCoefficients {start + 1}-{stop} of {n}:\n"
+            + structured.render_table(range(start, stop))
+        )
+    return header, blocks
 
 # Define Handlers --------------------------------------------------------------
 
@@ -71,52 +694,74 @@ def handle_default(model_object: Any) -> Tuple[str, str]:
         summary_text = str(model_object)
     return ("default", summary_text)
 
-# Add support for OLS (Ordinary Least Squares) models
-try:
-    from statsmodels.regression.linear_model import OLSResults
+class RenderedSummary:
+    """A model summary that was rendered ahead of time (e.g., stored as text).
 
-    @register_handler(OLSResults)
-    def handle_lm(model_object: OLSResults) -> Tuple[str, str]:
-        """Handler for statsmodels OLS (linear models).
+    Parameters
+    ----------
+    text : str
+        The summary output of the model.
+    model_type : str, optional
+        The internal model name used to select prompts (e.g., "lm", "glm"),
+        by default "default".
+    """
 
-        Parameters
-        ----------
-        model_object : OLSResults
-            The fitted Ordinary Least Squares model object.
+    def __init__(self, text: str, model_type: str = "default"):
+        self.text = text
+        self.model_type = model_type
 
-        Returns
-        -------
-        tuple[str, str]
-            A tuple containing the model name ("lm") and its summary.
-        """
-        return ("lm", str(model_object.summary()))
+    def summary(self) -> str:
+        return self.text
 
-except ImportError:
-    # This allows the package to be imported even if statsmodels is not installed
-    pass
+@register_handler(RenderedSummary)
+def handle_rendered(model_object: RenderedSummary) -> Tuple[str, str]:
+    """Handler for pre-rendered summaries.
 
-# Add support for GLM (Generalized Linear Models)
-try:
-    from statsmodels.genmod.generalized_linear_model import GLMResults
+    Parameters
+    ----------
+    model_object : RenderedSummary
+        The pre-rendered summary.
 
-    @register_handler(GLMResults)
-    def handle_glm(model_object: GLMResults) -> Tuple[str, str]:
-        """Handler for statsmodels GLM.
+    Returns
+    -------
+    tuple[str, str]
+        A tuple containing the given model name and the summary text.
+    """
+    return (model_object.model_type, model_object.text)
 
-        Parameters
-        ----------
-        model_object : GLMResults
-            The fitted Generalized Linear Model object.
+# Add support for OLS (Ordinary Least Squares) models
+@register_handler("statsmodels.regression.linear_model.OLSResults")
+def handle_lm(model_object: Any) -> Tuple[str, str]:
+    """Handler for statsmodels OLS (linear models).
 
-        Returns
-        -------
-        tuple[str, str]
-            A tuple containing the model name ("glm") and its summary.
-        """
-        # We can extract more details like the family for a better description
-        family_name = model_object.model.family.__class__.__name__
-        model_description = f"Generalized Linear Model (GLM) with {family_name} family"
-        return ("glm", model_description + "\n\n" + str(model_object.summary()))
+    Parameters
+    ----------
+    model_object : OLSResults
+        The fitted Ordinary Least Squares model object.
+
+    Returns
+    -------
+    tuple[str, str]
+        A tuple containing the model name ("lm") and its summary.
+    """
+    return ("lm", _summary_text(model_object))
+
+# Add support for GLM (Generalized Linear Models)
+@register_handler("statsmodels.genmod.generalized_linear_model.GLMResults")
+def handle_glm(model_object: Any) -> Tuple[str, str]:
+    """Handler for statsmodels GLM.
+
+    Parameters
+    ----------
+    model_object : GLMResults
+        The fitted Generalized Linear Model object.
 
-except ImportError:
-    pass
+    Returns
+    -------
+    tuple[str, str]
+        A tuple containing the model name ("glm") and its summary.
+    """
+    # We can extract more details like the family for a better description
+    family_name = model_object.model.family.__class__.__name__
+    model_description = f"Generalized Linear Model (GLM) with {family_name} family"
+    return ("glm", model_description + "\n\n" + _summary_text(model_object))
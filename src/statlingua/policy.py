@@ -0,0 +1,342 @@
+# src/statlingua/policy.py
+
+# Request policies: deadlines, retries and hedging around LLM calls.
+#
+# Every completion call site (explain(), diagnose(), diagnose_agent() and
+# their async/streaming variants) sends its request through a
+# `RequestPolicy`. The policy bounds each attempt with a timeout, retries
+# retryable errors with exponential backoff and full jitter, and can hedge:
+# if an attempt has not answered after a fixed delay or an observed latency
+# percentile, a duplicate request (to the same or a fallback model) is
+# fired and whichever answer arrives first wins. An optional gate (the rate
+# limiter, see completion.py) runs before each attempt's clock starts and
+# decides whether a hedge may be sent at all.
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional, Tuple
+
+# HTTP status codes worth retrying (timeouts, conflicts, rate limits and
+# server-side errors)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+# Exception class names treated as retryable. Matching by name covers the
+# litellm exception hierarchy without importing litellm.
+RETRYABLE_ERROR_NAMES = frozenset({
+    "Timeout", "APIConnectionError", "RateLimitError", "ServiceUnavailableError",
+    "InternalServerError", "SimulatedLLMError",
+})
+
+# Worker threads for synchronous attempts that need a timeout or a hedge.
+# A timed-out request cannot be interrupted, so it finishes in the
+# background and its result is discarded.
+_POOL_SIZE = 64
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=_POOL_SIZE, thread_name_prefix="statlingua-request")
+        return _pool
+
+def is_retryable(error: BaseException) -> bool:
+    """Returns True if an LLM call that raised `error` is worth retrying.
+
+    Timeouts, connection errors, rate limits and 5xx server errors are
+    retryable; invalid requests, authentication failures and other client
+    errors are not.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+class RequestPolicy:
+    """Deadlines, retries and hedging for LLM requests.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        The maximum number of seconds to wait for a single attempt, by
+        default None (wait indefinitely). A timed-out attempt raises
+        `TimeoutError`, which is retryable.
+    deadline : float, optional
+        The maximum number of seconds for the whole call, including retries
+        and backoff, by default None (no limit).
+    max_retries : int, optional
+        The number of times a retryable error is retried, by default 2.
+    backoff_base : float, optional
+        The base backoff in seconds, by default 0.5. Retry `k` (from 0)
+        waits a uniformly random time between 0 and
+        `min(backoff_max, backoff_base * 2**k)` ("full jitter").
+    backoff_max : float, optional
+        The cap on the backoff in seconds, by default 8.0.
+    hedge_after : float, optional
+        Seconds after which an unanswered attempt is hedged with a
+        duplicate request, by default None (no hedging). With
+        `hedge_percentile`, this is the delay used until enough latencies
+        have been observed.
+    hedge_percentile : float, optional
+        If given (e.g., 95), hedge once an attempt has taken longer than
+        this percentile of the latencies observed by this policy, by
+        default None.
+    hedge_model : str, optional
+        The model the hedged request is sent to, by default None (the same
+        model as the original request).
+    retry_on : Callable[[BaseException], bool], optional
+        Decides whether an error is retryable, by default
+        :func:`is_retryable`.
+    seed : int, optional
+        Seeds the backoff jitter, by default None.
+    """
+
+    # Observed latencies kept for `hedge_percentile`, and the number needed
+    # before the percentile replaces `hedge_after`
+    latency_window = 200
+    min_latency_samples = 20
+
+    def __init__(
+        self,
+        timeout: float = None,
+        deadline: float = None,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        hedge_after: float = None,
+        hedge_percentile: float = None,
+        hedge_model: str = None,
+        retry_on: Callable[[BaseException], bool] = None,
+        seed: int = None,
+    ):
+        if max_retries < 0:
+            raise ValueError("`max_retries` must be a non-negative integer.")
+        if hedge_percentile is not None and not 0 < hedge_percentile < 100:
+            raise ValueError("`hedge_percentile` must be between 0 and 100.")
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self.hedge_model = hedge_model
+        self.retry_on = is_retryable if retry_on is None else retry_on
+        self._random = random.Random(seed)
+        self._latencies = deque(maxlen=self.latency_window)
+        self._lock = threading.Lock()
+
+    # Helpers ------------------------------------------------------------------
+
+    def hedge_delay(self) -> Optional[float]:
+        """Returns the current hedging delay in seconds, or None if hedging is off."""
+        if self.hedge_percentile is not None:
+            with self._lock:
+                latencies = sorted(self._latencies)
+            if len(latencies) >= self.min_latency_samples:
+                index = min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))
+                return latencies[index]
+        return self.hedge_after
+
+    def _observe(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _backoff(self, retry: int) -> float:
+        with self._lock:
+            return self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** retry))
+
+    def _attempt_timeout(self, start: float) -> Optional[float]:
+        """The timeout for the next attempt, limited by the overall deadline."""
+        if self.deadline is None:
+            return self.timeout
+        remaining = self.deadline - (time.monotonic() - start)
+        if remaining <= 0:
+            raise TimeoutError(f"LLM request exceeded its {self.deadline}s deadline.")
+        return remaining if self.timeout is None else min(self.timeout, remaining)
+
+    def _next_delay(self, error: BaseException, retry: int, start: float) -> float:
+        """Returns the backoff before retry `retry`, or re-raises `error`."""
+        if retry >= self.max_retries or not self.retry_on(error):
+            raise error
+        delay = self._backoff(retry)
+        if self.deadline is not None and time.monotonic() - start + delay >= self.deadline:
+            raise error
+        return delay
+
+    # Synchronous calls --------------------------------------------------------
+
+    def _attempt(self, fn: Callable, model: str, messages: list, timeout: Optional[float],
+                 hedge: bool, gate: Optional[Callable], kwargs: dict) -> Tuple[Any, bool]:
+        hedge_delay = self.hedge_delay() if hedge else None
+        started = time.monotonic()
+        if timeout is None and hedge_delay is None:
+            # Nothing to race against: call in this thread
+            response = fn(model=model, messages=messages, **kwargs)
+            self._observe(time.monotonic() - started)
+            return response, False
+
+        pool = _get_pool()
+        pending = {pool.submit(fn, model=model, messages=messages, **kwargs)}
+        hedged = False
+        error = None
+        while pending:
+            elapsed = time.monotonic() - started
+            wait_for = None if timeout is None else max(0.0, timeout - elapsed)
+            if hedge_delay is not None:
+                until_hedge = max(0.0, hedge_delay - elapsed)
+                wait_for = until_hedge if wait_for is None else min(wait_for, until_hedge)
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self._observe(time.monotonic() - started)
+                    return future.result(), hedged
+                error = future.exception()
+            elapsed = time.monotonic() - started
+            if timeout is not None and elapsed >= timeout and pending:
+                break
+            if hedge_delay is not None and (pending or error is not None) \
+                    and elapsed >= hedge_delay:
+                # At most one hedge, and only if the gate lets it through now
+                hedge_model, hedge_delay = self.hedge_model or model, None
+                if gate is None or gate(hedge_model, False):
+                    hedged = True
+                    pending.add(pool.submit(fn, model=hedge_model, messages=messages, **kwargs))
+        if error is not None and not pending:
+            raise error
+        raise TimeoutError(f"LLM request timed out after {timeout}s.")
+
+    def call(self, fn: Callable, model: str, messages: list, hedge: bool = True,
+             gate: Callable = None, **kwargs: Any) -> Tuple[Any, dict]:
+        """Calls `fn(model=..., messages=..., **kwargs)` under this policy.
+
+        Parameters
+        ----------
+        fn : Callable
+            The completion function (e.g., a backend's `completion`).
+        model : str
+            The model string for the LLM provider.
+        messages : list
+            The messages to send.
+        hedge : bool, optional
+            Whether hedging may be used, by default True. Streaming calls
+            pass False.
+        gate : Callable, optional
+            Called as `gate(model, block)` before each request is sent, by
+            default None. Before an attempt, `block` is True and the gate
+            may wait (e.g., for a rate limiter); this wait counts against
+            the deadline but not the attempt's timeout or hedge delay.
+            Before a hedge, `block` is False and the hedge is skipped
+            unless the gate returns True.
+        **kwargs : Any
+            Additional keyword arguments for `fn`.
+
+        Returns
+        -------
+        tuple[Any, dict]
+            The response and a dictionary with keys 'retries' (the number
+            of retried attempts) and 'hedged' (whether a hedged request was
+            fired for the successful attempt).
+        """
+        start = time.monotonic()
+        retry = 0
+        while True:
+            try:
+                if gate is not None:
+                    self._attempt_timeout(start)
+                    gate(model, True)
+                timeout = self._attempt_timeout(start)
+                response, hedged = self._attempt(
+                    fn, model, messages, timeout, hedge, gate, kwargs
+                )
+                return response, {"retries": retry, "hedged": hedged}
+            except Exception as e:
+                time.sleep(self._next_delay(e, retry, start))
+                retry += 1
+
+    # Asynchronous calls -------------------------------------------------------
+
+    async def _aattempt(self, afn: Callable, model: str, messages: list,
+                        timeout: Optional[float], hedge: bool, gate: Optional[Callable],
+                        kwargs: dict) -> Tuple[Any, bool]:
+        hedge_delay = self.hedge_delay() if hedge else None
+        started = time.monotonic()
+        pending = {asyncio.ensure_future(afn(model=model, messages=messages, **kwargs))}
+        hedged = False
+        error = None
+        try:
+            while pending:
+                elapsed = time.monotonic() - started
+                wait_for = None if timeout is None else max(0.0, timeout - elapsed)
+                if hedge_delay is not None:
+                    until_hedge = max(0.0, hedge_delay - elapsed)
+                    wait_for = until_hedge if wait_for is None else min(wait_for, until_hedge)
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self._observe(time.monotonic() - started)
+                        return task.result(), hedged
+                    error = task.exception()
+                elapsed = time.monotonic() - started
+                if timeout is not None and elapsed >= timeout and pending:
+                    break
+                if hedge_delay is not None and (pending or error is not None) \
+                        and elapsed >= hedge_delay:
+                    hedge_model, hedge_delay = self.hedge_model or model, None
+                    if gate is None or await gate(hedge_model, False):
+                        hedged = True
+                        pending.add(asyncio.ensure_future(
+                            afn(model=hedge_model, messages=messages, **kwargs)
+                        ))
+        finally:
+            # Losing or timed-out requests are cancelled
+            for task in pending:
+                task.cancel()
+        if error is not None and not pending:
+            raise error
+        raise TimeoutError(f"LLM request timed out after {timeout}s.")
+
+    async def acall(self, afn: Callable, model: str, messages: list, hedge: bool = True,
+                    gate: Callable = None, **kwargs: Any) -> Tuple[Any, dict]:
+        """Asynchronous version of :meth:`call` for coroutine functions.
+
+        `gate`, if given, is a coroutine function.
+        """
+        start = time.monotonic()
+        retry = 0
+        while True:
+            try:
+                if gate is not None:
+                    self._attempt_timeout(start)
+                    await gate(model, True)
+                timeout = self._attempt_timeout(start)
+                response, hedged = await self._aattempt(
+                    afn, model, messages, timeout, hedge, gate, kwargs
+                )
+                return response, {"retries": retry, "hedged": hedged}
+            except Exception as e:
+                await asyncio.sleep(self._next_delay(e, retry, start))
+                retry += 1
+
+_default_policy = RequestPolicy()
+
+def get_default_policy() -> RequestPolicy:
+    """Returns the policy used when a call does not pass its own."""
+    return _default_policy
+
+def set_default_policy(policy: Optional[RequestPolicy]) -> None:
+    """Sets the process-wide default request policy.
+
+    Pass None to restore the built-in default (no timeout, up to two
+    retries of retryable errors, no hedging).
+    """
+    global _default_policy
+    _default_policy = RequestPolicy() if policy is None else policy
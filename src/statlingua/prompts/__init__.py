@@ -1,8 +1,42 @@
 # src/statlingua/prompts.py
 
+import functools
 import importlib.resources
 from pathlib import Path
 
+# Upper bound on memoized system prompts; the number of distinct
+# model x audience x verbosity x style combinations is far smaller.
+_ASSEMBLED_CACHE_SIZE = 1024
+
+def _walk_prompt_dir(directory, prefix: tuple) -> dict:
+    """Recursively reads every markdown file below a package directory."""
+    files = {}
+    for entry in directory.iterdir():
+        parts = prefix + (entry.name,)
+        if entry.is_dir():
+            files.update(_walk_prompt_dir(entry, parts))
+        elif entry.name.endswith(".md"):
+            files[parts] = entry.read_text(encoding='utf-8')
+    return files
+
+@functools.lru_cache(maxsize=None)
+def _prompt_registry() -> dict:
+    """Loads every prompt file under `prompts/` once.
+
+    Returns
+    -------
+    dict[tuple[str, ...], str]
+        A mapping from path components (relative to `prompts/`) to the
+        content of each markdown file.
+    """
+    try:
+        # This is the modern way to access package data files, and it also
+        # works when the package is installed as a zip or wheel
+        root = importlib.resources.files('statlingua').joinpath('prompts')
+        return _walk_prompt_dir(root, ())
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
 def _read_prompt_file(path_parts: list[str]) -> str:
     """Reads a prompt file from the package's data.
 
@@ -16,20 +50,65 @@ def _read_prompt_file(path_parts: list[str]) -> str:
     str
         The content of the prompt file, or an empty string if not found.
     """
-    try:
-        # This is the modern way to access package data files
-        return importlib.resources.files('statlingua') \
-            .joinpath('prompts', *path_parts).read_text(encoding='utf-8')
-    except (FileNotFoundError, NotADirectoryError):
-        # Gracefully handle cases where a prompt file might be missing
-        return ""
+    # Gracefully handle cases where a prompt file might be missing
+    return _prompt_registry().get(tuple(path_parts), "")
+
+def reload_prompts() -> None:
+    """Discards the loaded prompt files and all memoized system prompts.
+
+    The prompt files are read once per process; call this during
+    development after editing the markdown files under `prompts/`.
+    """
+    _prompt_registry.cache_clear()
+    assemble_sys_prompt.cache_clear()
+    assemble_multi_sys_prompt.cache_clear()
+    static_sys_prompt.cache_clear()
+    variable_sys_prompt.cache_clear()
+
+def _role_section(model_name: str) -> str:
+    """The base role and model-specific role."""
+    role_base = _read_prompt_file(["common", "role_base.md"])
+    role_specific = _read_prompt_file(["models", model_name, "role_specific.md"])
+    return f"## Role\n\n{role_base}\n\n{role_specific}".strip()
+
+def _audience_section(audience: str, verbosity: str, heading: str = "##") -> str:
+    """The audience and verbosity instructions."""
+    audience_text = _read_prompt_file(["audience", f"{audience}.md"])
+    verbosity_text = _read_prompt_file(["verbosity", f"{verbosity}.md"])
+    return (
+        f"{heading} Intended Audience and Verbosity\n\n"
+        f"{heading}# Target Audience: {audience.title()}\n{audience_text}\n\n"
+        f"{heading}# Level of Detail (Verbosity): {verbosity.title()}\n{verbosity_text}"
+    ).strip()
+
+def _style_section(style: str, heading: str = "##") -> str:
+    """The response format specification."""
+    style_text = _read_prompt_file(["style", f"{style}.md"])
+    return (
+        f"{heading} Response Format Specification (Style: {style.title()})\n\n{style_text}"
+    ).strip()
+
+def _instructions_section(model_name: str) -> str:
+    """The model-specific instructions."""
+    instructions_text = _read_prompt_file(["models", model_name, "instructions.md"])
+    # Fallback to default instructions if model-specific ones don't exist
+    if not instructions_text.strip():
+        instructions_text = _read_prompt_file(["models", "default", "instructions.md"])
+    return f"## Instructions\n\n{instructions_text}".strip()
 
+def _caution_section() -> str:
+    """The final caution."""
+    caution_text = _read_prompt_file(["common", "caution.md"])
+    return f"## Caution\n\n{caution_text}".strip()
+
+@functools.lru_cache(maxsize=_ASSEMBLED_CACHE_SIZE)
 def assemble_sys_prompt(model_name: str, audience: str, verbosity: str, style: str) -> str:
     """Assembles the complete system prompt from various markdown files.
 
     This function dynamically constructs the system prompt sent to the LLM
     by combining base roles, audience-specific instructions, verbosity levels,
-    and model-specific guidelines.
+    and model-specific guidelines. Results are memoized per combination of
+    arguments; see :func:`reload_prompts` to invalidate them.
 
     Parameters
     ----------
@@ -48,46 +127,112 @@ def assemble_sys_prompt(model_name: str, audience: str, verbosity: str, style: s
     str
         The fully constructed system prompt.
     """
-    # Base role and model-specific role
-    role_base = _read_prompt_file(["common", "role_base.md"])
-    role_specific = _read_prompt_file(["models", model_name, "role_specific.md"])
-    role_section = f"## Role\n\n{role_base}\n\n{role_specific}".strip()
+    return "\n\n\n".join([
+        _role_section(model_name),
+        _audience_section(audience, verbosity),
+        _style_section(style),
+        _instructions_section(model_name),
+        _caution_section(),
+    ]).strip()
 
-    # Audience and verbosity
-    audience_text = _read_prompt_file(["audience", f"{audience}.md"])
-    verbosity_text = _read_prompt_file(["verbosity", f"{verbosity}.md"])
-    audience_section = (
-        f"## Intended Audience and Verbosity\n\n"
-        f"### Target Audience: {audience.title()}\n{audience_text}\n\n"
-        f"### Level of Detail (Verbosity): {verbosity.title()}\n{verbosity_text}"
-    ).strip()
+@functools.lru_cache(maxsize=_ASSEMBLED_CACHE_SIZE)
+def static_sys_prompt(model_name: str) -> str:
+    """Assembles the sections of the system prompt that depend only on the model.
 
-    # Response format
-    style_text = _read_prompt_file(["style", f"{style}.md"])
-    style_section = (
-        f"## Response Format Specification (Style: {style.title()})\n\n{style_text}"
-    ).strip()
+    Together with :func:`variable_sys_prompt`, this is the cache-friendly
+    layout of :func:`assemble_sys_prompt`: the role, instructions and
+    caution, which are the same for every audience, verbosity and style,
+    come first so that they form a prefix providers can cache.
 
-    # Model-specific instructions
-    instructions_text = _read_prompt_file(["models", model_name, "instructions.md"])
-    # Fallback to default instructions if model-specific ones don't exist
-    if not instructions_text.strip():
-        instructions_text = _read_prompt_file(["models", "default", "instructions.md"])
-    instructions_section = f"## Instructions\n\n{instructions_text}".strip()
+    Parameters
+    ----------
+    model_name : str
+        The internal name of the model (e.g., "lm", "glm").
 
-    # Final caution
-    caution_text = _read_prompt_file(["common", "caution.md"])
-    caution_section = f"## Caution\n\n{caution_text}".strip()
-
-    # Assemble all sections into the final prompt
-    full_prompt = "\n\n\n".join([
-        role_section,
-        audience_section,
-        style_section,
-        instructions_section,
-        caution_section
-    ])
-    return full_prompt.strip()
+    Returns
+    -------
+    str
+        The role, instructions and caution sections.
+    """
+    return "\n\n\n".join([
+        _role_section(model_name),
+        _instructions_section(model_name),
+        _caution_section(),
+    ]).strip()
+
+@functools.lru_cache(maxsize=_ASSEMBLED_CACHE_SIZE)
+def variable_sys_prompt(audience: str, verbosity: str, style: str) -> str:
+    """Assembles the audience, verbosity and style sections of the system prompt.
+
+    See :func:`static_sys_prompt`.
+
+    Parameters
+    ----------
+    audience : str
+        The target audience (e.g., "novice", "researcher").
+    verbosity : str
+        The desired level of detail (e.g., "brief", "detailed").
+    style : str
+        The desired output format (e.g., "markdown", "json").
+
+    Returns
+    -------
+    str
+        The audience and response format sections.
+    """
+    return "\n\n\n".join([
+        _audience_section(audience, verbosity),
+        _style_section(style),
+    ]).strip()
+
+def variant_key(audience: str, verbosity: str, style: str) -> str:
+    """The key of an explanation variant in a multi-variant response."""
+    return f"{audience}/{verbosity}/{style}"
+
+@functools.lru_cache(maxsize=_ASSEMBLED_CACHE_SIZE)
+def assemble_multi_sys_prompt(model_name: str, variants: tuple) -> str:
+    """Assembles a system prompt asking for several explanation variants at once.
+
+    The role, instructions and caution appear once; each variant gets its
+    own audience, verbosity and style sections. The LLM is asked to reply
+    with a single JSON object mapping each :func:`variant_key` to that
+    variant's explanation.
+
+    Parameters
+    ----------
+    model_name : str
+        The internal name of the model (e.g., "lm", "glm").
+    variants : tuple[tuple[str, str, str], ...]
+        The (audience, verbosity, style) combinations to explain.
+
+    Returns
+    -------
+    str
+        The fully constructed system prompt.
+    """
+    keys = [variant_key(*variant) for variant in variants]
+    variant_sections = [
+        f"## Variant `{key}`\n\n"
+        f"{_audience_section(audience, verbosity, heading='###')}\n\n"
+        f"{_style_section(style, heading='###')}"
+        for key, (audience, verbosity, style) in zip(keys, variants)
+    ]
+    output_section = (
+        "## Output\n\n"
+        f"Write {len(variants)} independent explanations of the same model output, "
+        "one for each variant described above. Respond with a single JSON object "
+        "and nothing else. Its keys are exactly the variant keys "
+        f"({', '.join(f'`{key}`' for key in keys)}), and each value is a string "
+        "holding that variant's complete explanation, written for its audience "
+        "and level of detail and formatted as its response format specifies."
+    )
+    return "\n\n\n".join([
+        _role_section(model_name),
+        *variant_sections,
+        _instructions_section(model_name),
+        _caution_section(),
+        output_section,
+    ]).strip()
 
 def build_user_prompt(model_description: str, output: str, context: str = None) -> str:
     """Builds the user prompt containing the model summary.
@@ -110,3 +255,59 @@ def build_user_prompt(model_description: str, output: str, context: str = None)
     if context and context.strip():
         prompt += f"\n\n---\n\n## Additional context to consider\n\n{context.strip()}"
     return prompt
+
+# Rough number of characters per token for English prose and numeric
+# tables; good enough to enforce a budget without loading a tokenizer.
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the number of LLM tokens in a piece of text.
+
+    Parameters
+    ----------
+    text : str
+        The text to measure.
+
+    Returns
+    -------
+    int
+        The estimated token count.
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+def build_reduce_prompt(
+    model_description: str,
+    header: str,
+    partials: list[str],
+    context: str = None,
+) -> str:
+    """Builds the user prompt that merges partial (per-block) explanations.
+
+    Parameters
+    ----------
+    model_description : str
+        A brief description of the model type.
+    header : str
+        The model header and fit statistics, shared by every block.
+    partials : list[str]
+        The explanations of the individual coefficient blocks, in order.
+    context : str, optional
+        Additional user-provided context about the data or research question.
+
+    Returns
+    -------
+    str
+        The fully constructed user prompt for the reduce step.
+    """
+    instructions = _read_prompt_file(["common", "reduce.md"]).strip()
+    sections = "\n\n---\n\n".join(
+        f"### Partial explanation {i} of {len(partials)}\n\n{text.strip()}"
+        for i, text in enumerate(partials, start=1)
+    )
+    prompt = (
+        f"{instructions}\n\n---\n\n"
+        f"## {model_description} header\n\n{header.strip()}\n\n---\n\n{sections}"
+    )
+    if context and context.strip():
+        prompt += f"\n\n---\n\n## Additional context to consider\n\n{context.strip()}"
+    return prompt
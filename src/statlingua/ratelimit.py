@@ -0,0 +1,302 @@
+# src/statlingua/ratelimit.py
+
+# Client-side rate limiting of LLM requests.
+#
+# A `RateLimiter` keeps two token buckets per model string, one for
+# requests and one for (estimated) tokens, sized from the provider's
+# requests-per-minute and tokens-per-minute limits. Every attempt a
+# statlingua call makes (including retries) first reserves capacity from
+# the active limiter, before the request policy starts timing the attempt;
+# hedged requests are only sent if capacity is free right away.
+# Reservations may run the bucket into debt: each caller is told exactly
+# how long to wait, so requests are spaced evenly just under the limit
+# instead of bursting into 429s and backing off. Once a response arrives,
+# the token estimate is corrected with the provider-reported usage.
+#
+# `RateLimiter` keeps its buckets in memory and is shared by the threads of
+# one process; `SQLiteRateLimiter` keeps them in a SQLite database so that
+# several worker processes on one host draw from the same budget.
+
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from .prompts import estimate_tokens
+
+# A rough token cost for an inline image; providers bill images separately
+# from text, at a few hundred to about a thousand tokens for typical sizes
+IMAGE_TOKEN_ESTIMATE = 800
+
+def estimate_request_tokens(messages: list, max_tokens: int = None) -> int:
+    """Estimates the tokens an LLM request counts against a TPM limit.
+
+    Parameters
+    ----------
+    messages : list
+        The messages of the request (dicts or response message objects).
+    max_tokens : int, optional
+        The completion budget of the request, by default None (not counted).
+
+    Returns
+    -------
+    int
+        The estimated prompt tokens plus `max_tokens`.
+    """
+    total = 0
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) \
+            else getattr(message, "content", None)
+        if isinstance(content, str):
+            total += estimate_tokens(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict) and part.get("type") == "image_url":
+                    total += IMAGE_TOKEN_ESTIMATE
+                elif isinstance(part, dict):
+                    total += estimate_tokens(str(part.get("text", "")))
+    return total + (max_tokens or 0)
+
+class RateLimiter:
+    """Token-bucket rate limiting of LLM requests, keyed by model string.
+
+    Parameters
+    ----------
+    requests_per_minute : float, optional
+        The default request budget per model, by default None (unlimited).
+    tokens_per_minute : float, optional
+        The default token budget per model, by default None (unlimited).
+    limits : dict, optional
+        Per-model budgets overriding the defaults, e.g.
+        `{"gpt-4o": {"requests_per_minute": 500, "tokens_per_minute": 30_000}}`.
+    headroom : float, optional
+        The fraction of each limit to use, by default 0.95, so that clock
+        skew and token-estimate errors do not push throughput over it.
+    burst : float, optional
+        The fraction of a minute's budget that may be spent at once, by
+        default 0.1. Smaller values spread requests more evenly.
+
+    Examples
+    --------
+    >>> set_rate_limiter(RateLimiter(requests_per_minute=500, tokens_per_minute=30_000))  # doctest: +SKIP
+    >>> explain_many(fits, model="gpt-4o", max_concurrency=64)  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        limits: dict = None,
+        headroom: float = 0.95,
+        burst: float = 0.1,
+    ):
+        if not 0 < headroom <= 1:
+            raise ValueError("`headroom` must be in (0, 1].")
+        if not 0 < burst <= 1:
+            raise ValueError("`burst` must be in (0, 1].")
+        self.defaults = {
+            "requests_per_minute": requests_per_minute,
+            "tokens_per_minute": tokens_per_minute,
+        }
+        self.limits = dict(limits or {})
+        self.headroom = headroom
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets: dict = {}
+
+    def _limit(self, model: str, kind: str) -> Optional[float]:
+        return self.limits.get(model, {}).get(kind, self.defaults[kind])
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _buckets_for(self, model: str, tokens: int) -> list:
+        """Returns (key, amount, rate per second, capacity) for each limited bucket."""
+        buckets = []
+        for kind, amount in (("requests_per_minute", 1), ("tokens_per_minute", tokens)):
+            limit = self._limit(model, kind)
+            if limit:
+                rate = limit * self.headroom / 60.0
+                capacity = max(1.0, limit * self.headroom * self.burst)
+                buckets.append((f"{model}|{kind}", amount, rate, capacity))
+        return buckets
+
+    def _load(self, key: str) -> Optional[tuple]:
+        return self._buckets.get(key)
+
+    def _store(self, key: str, level: float, updated: float) -> None:
+        self._buckets[key] = (level, updated)
+
+    def _take(self, buckets: list, now: float, free_only: bool = False) -> float:
+        """Draws from `buckets` (inside the caller's lock) and returns the wait.
+
+        With `free_only`, nothing is drawn unless the wait would be zero.
+        """
+        wait = 0.0
+        levels = []
+        for key, amount, rate, capacity in buckets:
+            level, updated = self._load(key) or (capacity, now)
+            level = min(capacity, level + rate * max(0.0, now - updated)) - amount
+            levels.append((key, level))
+            if level < 0:
+                wait = max(wait, -level / rate)
+        if wait > 0 and free_only:
+            return wait
+        for key, level in levels:
+            self._store(key, level, now)
+        return wait
+
+    def _draw(self, buckets: list, free_only: bool) -> float:
+        with self._lock:
+            return self._take(buckets, self._now(), free_only)
+
+    def reserve(self, model: str, tokens: int = 0) -> float:
+        """Reserves one request and `tokens` tokens for `model`.
+
+        Returns
+        -------
+        float
+            The number of seconds the caller must wait before sending the
+            request (0.0 if capacity is available now).
+        """
+        buckets = self._buckets_for(model, tokens)
+        if not buckets:
+            return 0.0
+        return self._draw(buckets, free_only=False)
+
+    def try_reserve(self, model: str, tokens: int = 0) -> bool:
+        """Reserves capacity only if a request could be sent right away.
+
+        Used for optional requests, such as hedges, that are not worth
+        waiting for.
+
+        Returns
+        -------
+        bool
+            True if the capacity was reserved, False if the request would
+            have to wait (in which case nothing is reserved).
+        """
+        buckets = self._buckets_for(model, tokens)
+        if not buckets:
+            return True
+        return self._draw(buckets, free_only=True) == 0.0
+
+    def settle(self, model: str, estimated: int, actual: int) -> None:
+        """Corrects a reservation of `estimated` tokens to the `actual` usage."""
+        limit = self._limit(model, "tokens_per_minute")
+        if not limit or actual == estimated:
+            return
+        key = f"{model}|tokens_per_minute"
+        with self._lock:
+            self._adjust(key, estimated - actual)
+
+    def _adjust(self, key: str, delta: float) -> None:
+        state = self._load(key)
+        if state is not None:
+            self._store(key, state[0] + delta, state[1])
+
+    def acquire(self, model: str, tokens: int = 0) -> float:
+        """Blocks until a request of `tokens` tokens to `model` may be sent.
+
+        Returns
+        -------
+        float
+            The number of seconds waited.
+        """
+        wait = self.reserve(model, tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, model: str, tokens: int = 0) -> float:
+        """Asynchronous version of :meth:`acquire` that does not block the event loop."""
+        wait = self.reserve(model, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+class SQLiteRateLimiter(RateLimiter):
+    """A rate limiter whose buckets are shared through a SQLite database.
+
+    Every process on a host that opens the same `path` draws from the same
+    budgets. Reservations run in `BEGIN IMMEDIATE` transactions, so they
+    are serialized across processes, and bucket times use the wall clock.
+
+    Parameters
+    ----------
+    path : str
+        The path to the SQLite database file. It is created if needed.
+    **limits : Any
+        The budgets, as for :class:`RateLimiter`.
+    """
+
+    def __init__(self, path: str, **limits: Any):
+        super().__init__(**limits)
+        self.path = path
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " key TEXT PRIMARY KEY,"
+                " level REAL NOT NULL,"
+                " updated REAL NOT NULL)"
+            )
+
+    def _now(self) -> float:
+        return time.time()
+
+    def _load(self, key: str) -> Optional[tuple]:
+        return self._conn.execute(
+            "SELECT level, updated FROM buckets WHERE key = ?", (key,)
+        ).fetchone()
+
+    def _store(self, key: str, level: float, updated: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO buckets (key, level, updated) VALUES (?, ?, ?)",
+            (key, level, updated),
+        )
+
+    def _transaction(self, fn, *args):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(*args)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return result
+
+    def _draw(self, buckets: list, free_only: bool) -> float:
+        with self._lock:
+            return self._transaction(lambda: self._take(buckets, self._now(), free_only))
+
+    def settle(self, model: str, estimated: int, actual: int) -> None:
+        limit = self._limit(model, "tokens_per_minute")
+        if not limit or actual == estimated:
+            return
+        key = f"{model}|tokens_per_minute"
+        with self._lock:
+            self._transaction(self._adjust, key, estimated - actual)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+_rate_limiter: Optional[RateLimiter] = None
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Returns the process-wide rate limiter, or None if requests are not limited."""
+    return _rate_limiter
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Routes every subsequent LLM request through `limiter`.
+
+    Pass None (the default state) to stop rate limiting.
+    """
+    global _rate_limiter
+    _rate_limiter = limiter
@@ -0,0 +1,246 @@
+# src/statlingua/session.py
+
+# Multi-turn diagnostic conversations about one fitted model.
+#
+# `diagnose()` rebuilds the prompts and re-runs the handler for every
+# question. A `DiagnosticSession` extracts the summary once and keeps it,
+# with the instructions, in a fixed conversation prefix. Chat APIs are
+# stateless, so the prefix is still sent with every question, but it is
+# byte-for-byte identical each time and providers serve it from their
+# prompt cache (Claude models get an explicit `cache_control` breakpoint).
+# Older turns are folded into a short digest once the history exceeds a
+# token budget, so the cost of a question stays flat as the conversation
+# grows. Numeric diagnostic tool outputs are memoized per model object, so
+# they are computed once and shared with other sessions and diagnose_agent().
+
+from typing import Any, List
+
+from .completion import complete, response_usage, send, supports_cache_control
+from .diagnostic import LARGE_N_THRESHOLD, _call_tool, available_tools, plot_tools, tools
+from .instrumentation import Metrics
+from .model_handlers import extract_summary
+from .policy import RequestPolicy
+from .prompts import estimate_tokens
+
+SESSION_SYSTEM_PROMPT = (
+    "You are an expert statistical consultant. Your goal is to help a user "
+    "diagnose the assumptions of their statistical model over a conversation. "
+    "Answer each question clearly and concisely, building on earlier answers. "
+    "When a numeric diagnostic would settle a question, call the appropriate tool."
+)
+
+SUMMARIZE_PROMPT = (
+    "Summarize the following conversation between an analyst and a statistical "
+    "consultant about a fitted model. Keep every number, test result, finding and "
+    "open question; drop pleasantries and repetition. Write at most a few short "
+    "paragraphs."
+)
+
+class DiagnosticSession:
+    """A follow-up-friendly diagnostic conversation about one fitted model.
+
+    Parameters
+    ----------
+    model_object : Any
+        A fitted statistical model object.
+    model : str
+        The model string for the LLM provider (e.g., "gpt-4o").
+    max_prompt_tokens : int, optional
+        An (estimated) token budget for the model summary, by default None.
+    history_tokens : int, optional
+        The (estimated) token budget for the conversation history, by
+        default 2000. Once it is exceeded, all but the last `keep_turns`
+        turns are compacted into a digest.
+    keep_turns : int, optional
+        The number of most recent turns kept verbatim when compacting, by
+        default 2.
+    compaction : str, optional
+        How older turns are compacted: "summarize" (the default) asks the
+        LLM for a summary of them; "truncate" keeps each question and the
+        start of its answer, without an extra LLM call.
+    use_tools : bool, optional
+        Whether the LLM may call the numeric diagnostic tools (VIFs,
+        Breusch-Pagan, influence measures, normality tests), by default
+        True. For plots, use :func:`statlingua.diagnose_agent`.
+    max_steps : int, optional
+        The maximum number of tool-calling turns per question, by default 3.
+    policy : RequestPolicy, optional
+        The deadline, retry and hedging policy for every LLM call, by
+        default the process-wide default.
+    **kwargs : Any
+        Additional keyword arguments to pass to `litellm.completion`.
+
+    Examples
+    --------
+    >>> session = DiagnosticSession(fit, model="gpt-4o")  # doctest: +SKIP
+    >>> session.ask("Is multicollinearity a problem?")["text"]  # doctest: +SKIP
+    >>> session.ask("Which predictor is the worst offender?")["text"]  # doctest: +SKIP
+    """
+
+    # Characters of each answer kept by the "truncate" compaction
+    truncated_answer_chars = 300
+
+    def __init__(
+        self,
+        model_object: Any,
+        model: str,
+        max_prompt_tokens: int = None,
+        history_tokens: int = 2000,
+        keep_turns: int = 2,
+        compaction: str = "summarize",
+        use_tools: bool = True,
+        max_steps: int = 3,
+        policy: RequestPolicy = None,
+        **kwargs: Any,
+    ):
+        if compaction not in ("summarize", "truncate"):
+            raise ValueError("`compaction` must be either 'summarize' or 'truncate'.")
+        if keep_turns < 0:
+            raise ValueError("`keep_turns` must be a non-negative integer.")
+        if max_steps < 1:
+            raise ValueError("`max_steps` must be a positive integer.")
+        self.model_object = model_object
+        self.model = model
+        self.history_tokens = history_tokens
+        self.keep_turns = keep_turns
+        self.compaction = compaction
+        self.use_tools = use_tools
+        self.max_steps = max_steps
+        self.policy = policy
+        self.kwargs = kwargs
+        self.model_name, self.summary_text = extract_summary(
+            model_object, max_tokens=max_prompt_tokens
+        )
+        # Completed (question, answer) turns, and the digest of compacted ones
+        self.history: List[tuple] = []
+        self.digest = None
+        self._prefix = self._build_prefix()
+        self._tools = [tool for tool in tools if tool["function"]["name"] not in plot_tools]
+
+    def _build_prefix(self) -> list:
+        """The fixed start of every request: instructions and the model summary."""
+        text = (
+            f"{SESSION_SYSTEM_PROMPT}\n\n"
+            f"## Summary of the user's {self.model_name} model\n\n{self.summary_text}"
+        )
+        if supports_cache_control(self.model):
+            content = [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+            return [{"role": "system", "content": content}]
+        return [{"role": "system", "content": text}]
+
+    def _history_messages(self) -> list:
+        messages = []
+        if self.digest:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation:\n\n{self.digest}",
+            })
+        for question, answer in self.history:
+            messages.append({"role": "user", "content": question})
+            messages.append({"role": "assistant", "content": answer})
+        return messages
+
+    def _history_size(self) -> int:
+        return estimate_tokens(self.digest or "") + sum(
+            estimate_tokens(question) + estimate_tokens(answer) for question, answer in self.history
+        )
+
+    def _compact(self, metrics: Metrics) -> None:
+        """Folds all but the last `keep_turns` turns into the digest."""
+        cut = len(self.history) - self.keep_turns
+        if cut <= 0 or self._history_size() <= self.history_tokens:
+            return
+        old, self.history = self.history[:cut], self.history[cut:]
+        if self.compaction == "truncate":
+            lines = [self.digest] if self.digest else []
+            for question, answer in old:
+                short = answer if len(answer) <= self.truncated_answer_chars \
+                    else answer[:self.truncated_answer_chars].rstrip() + " ..."
+                lines.append(f"Q: {question}\nA: {short}")
+            self.digest = "\n\n".join(lines)
+            return
+
+        transcript = "\n\n".join(f"Analyst: {q}\n\nConsultant: {a}" for q, a in old)
+        if self.digest:
+            transcript = f"Earlier summary:\n\n{self.digest}\n\n---\n\n{transcript}"
+        with metrics.stage("compact"):
+            result = complete(
+                self.model,
+                [{"role": "system", "content": SUMMARIZE_PROMPT},
+                 {"role": "user", "content": transcript}],
+                policy=self.policy,
+                **self.kwargs,
+            )
+        metrics.add_call(result)
+        self.digest = result["text"]
+
+    def _tool_output(self, name: str) -> str:
+        """Runs a numeric tool, or returns its memoized output for this model."""
+        if name not in available_tools or name in plot_tools:
+            return f"Error: Tool '{name}' not found."
+        return _call_tool(name, self.model_object, LARGE_N_THRESHOLD)
+
+    @property
+    def messages(self) -> list:
+        """The messages that open the next request (prefix, digest and history)."""
+        return self._prefix + self._history_messages()
+
+    def ask(self, question: str) -> dict:
+        """Asks a follow-up question about the model.
+
+        Parameters
+        ----------
+        question : str
+            The user's question.
+
+        Returns
+        -------
+        dict
+            A dictionary with keys 'text' (the answer), 'tool_calls' (the
+            names of the tools used for this answer, in order) and
+            'metrics' (stage timings and token usage, see
+            :class:`statlingua.instrumentation.Metrics`).
+        """
+        metrics = Metrics("session.ask")
+        self._compact(metrics)
+        messages = self.messages + [{"role": "user", "content": question}]
+        executed = []
+
+        for step in range(self.max_steps + 1):
+            # On the final turn the LLM has to answer; the tools stay defined
+            # for the tool messages already in the request (see diagnose_agent)
+            tool_kwargs = {"tools": self._tools} if self.use_tools else {}
+            if self.use_tools and step == self.max_steps:
+                tool_kwargs["tool_choice"] = "none"
+            with metrics.stage("llm"):
+                response, stats = send(
+                    self.model, messages, policy=self.policy, **tool_kwargs, **self.kwargs
+                )
+            metrics.add_call({"usage": response_usage(response), **stats})
+            response_message = response.choices[0].message
+            tool_calls = response_message.tool_calls \
+                if self.use_tools and step < self.max_steps else None
+            if not tool_calls:
+                break
+
+            messages.append(response_message)
+            with metrics.stage("tools"):
+                for tool_call in tool_calls:
+                    executed.append(tool_call.function.name)
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "name": tool_call.function.name,
+                        "content": self._tool_output(tool_call.function.name),
+                    })
+
+        answer = response_message.content or ""
+        # Tool exchanges are not kept: the answer already reflects them, and
+        # the outputs stay memoized for the model
+        self.history.append((question, answer))
+        return {"text": answer, "tool_calls": executed, "metrics": metrics.emit()}
+
+    def reset(self) -> None:
+        """Forgets the conversation, keeping the summary."""
+        self.history = []
+        self.digest = None
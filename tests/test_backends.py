@@ -0,0 +1,118 @@
+# tests/test_backends.py
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from statlingua.backends import (
+    CassetteMissError,
+    RecordReplayBackend,
+    SimulatedLLMError,
+    get_backend,
+    use_backend,
+)
+from statlingua.diagnostic import diagnose_agent
+from statlingua.explain import explain, explain_many, explain_stream
+from statlingua.policy import RequestPolicy
+
+class MockResults:
+    def __init__(self, label="A"):
+        self.label = label
+
+    def summary(self):
+        return f"--- MOCK SUMMARY {self.label} ---"
+
+def _response(text):
+    response = MagicMock()
+    response.choices[0].message.content = text
+    response.choices[0].message.tool_calls = None
+    response.usage.prompt_tokens = 100
+    response.usage.completion_tokens = 20
+    return response
+
+def _record(path, *model_objects):
+    """Records one explanation per model object into the cassette at `path`."""
+    responses = [_response(f"Explanation {i}.") for i in range(len(model_objects))]
+    with patch('litellm.completion', side_effect=responses), \
+            use_backend(RecordReplayBackend(str(path), mode="record")):
+        return [explain(obj, model="gpt-4o")["text"] for obj in model_objects]
+
+@patch('litellm.completion', side_effect=AssertionError("network used during replay"))
+def test_replay_serves_recorded_responses_offline(mock_completion: MagicMock, tmp_path):
+    cassette = tmp_path / "run.jsonl"
+    recorded = _record(cassette, MockResults("A"), MockResults("B"))
+
+    replay = RecordReplayBackend(str(cassette))
+    assert len(replay) == 2
+    with use_backend(replay):
+        result = explain(MockResults("B"), model="gpt-4o")
+        stream = explain_stream(MockResults("A"), model="gpt-4o")
+        streamed = "".join(stream)
+
+    assert result["text"] == recorded[1]
+    assert result["metrics"]["prompt_tokens"] == 100
+    assert streamed == recorded[0]
+    assert get_backend() is not replay
+
+def test_replay_latency_and_concurrency(tmp_path):
+    cassette = tmp_path / "run.jsonl"
+    _record(cassette, MockResults("A"))
+
+    replay = RecordReplayBackend(str(cassette), latency=0.2)
+    with patch('litellm.acompletion', new_callable=AsyncMock) as mock_acompletion, use_backend(replay):
+        start = time.perf_counter()
+        results = explain_many(
+            [MockResults("A") for _ in range(10)], model="gpt-4o",
+            max_concurrency=10, dedupe=False,
+        )
+        elapsed = time.perf_counter() - start
+
+    mock_acompletion.assert_not_called()
+    assert all(result["text"] == "Explanation 0." for result in results)
+    assert 0.2 <= elapsed < 1.0
+
+def test_replay_error_injection_and_misses(tmp_path):
+    cassette = tmp_path / "run.jsonl"
+    _record(cassette, MockResults("A"))
+
+    with use_backend(RecordReplayBackend(str(cassette), error_rate=1.0)):
+        with pytest.raises(SimulatedLLMError):
+            explain(MockResults("A"), model="gpt-4o", policy=RequestPolicy(max_retries=0))
+
+    with use_backend(RecordReplayBackend(str(cassette))):
+        with pytest.raises(CassetteMissError):
+            explain(MockResults("A"), model="gpt-4o", audience="manager")
+
+    with pytest.raises(ValueError, match="mode"):
+        RecordReplayBackend(str(cassette), mode="rewind")
+
+def test_agent_round_trips_tool_calls(tmp_path):
+    sm = pytest.importorskip("statsmodels.api")
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    X = sm.add_constant(rng.normal(size=(50, 2)))
+    fit = sm.OLS(X @ [1.0, 2.0, -1.0] + rng.normal(size=50), X).fit()
+
+    tool_call = MagicMock()
+    tool_call.id = "call_1"
+    tool_call.function.name = "compute_vif"
+    tool_call.function.arguments = "{}"
+    first = MagicMock()
+    first.choices[0].message.role = "assistant"
+    first.choices[0].message.content = None
+    first.choices[0].message.tool_calls = [tool_call]
+    final = _response("VIFs are low.")
+
+    cassette = tmp_path / "agent.jsonl"
+    with patch('litellm.completion', side_effect=[first, final]), \
+            use_backend(RecordReplayBackend(str(cassette), mode="record")):
+        recorded = diagnose_agent(fit, prompt="Multicollinearity?", model="gpt-4o")
+
+    with patch('litellm.completion', side_effect=AssertionError("network used")), \
+            use_backend(RecordReplayBackend(str(cassette))):
+        replayed = diagnose_agent(fit, prompt="Multicollinearity?", model="gpt-4o")
+
+    assert replayed["text"] == recorded["text"] == "VIFs are low."
+    assert replayed["tool_calls"] == ["compute_vif"]
+    assert replayed["table"] == recorded["table"]
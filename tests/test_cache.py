@@ -0,0 +1,83 @@
+# tests/test_cache.py
+
+import time
+from unittest.mock import MagicMock, patch
+
+from statlingua.cache import LRUCache, SQLiteCache, make_cache_key
+from statlingua.explain import explain
+
+class MockResults:
+    def summary(self):
+        return "--- MOCK SUMMARY ---"
+
+def test_cache_key_ignores_transport_kwargs():
+    """
+    Tests that the cache key covers result-affecting kwargs only.
+    """
+    messages = [{"role": "user", "content": "hi"}]
+    base = make_cache_key("gpt-4o", messages, temperature=0)
+    assert base == make_cache_key("gpt-4o", messages, temperature=0, api_key="sk-1")
+    assert base != make_cache_key("gpt-4o", messages, temperature=1)
+    assert base != make_cache_key("gpt-4o-mini", messages, temperature=0)
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", {"text": "A"})
+    cache.set("b", {"text": "B"})
+    cache.get("a")
+    cache.set("c", {"text": "C"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"text": "A"}
+    assert len(cache) == 2
+
+def test_sqlite_cache_ttl_and_size_eviction(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=0.05, max_entries=2)
+    cache.set("a", {"text": "A"})
+    cache.set("b", {"text": "B"})
+    cache.set("c", {"text": "C"})
+    assert len(cache) == 2
+    assert cache.get("c") == {"text": "C"}
+    time.sleep(0.1)
+    assert cache.get("c") is None
+    cache.close()
+
+    # Entries persist across connections
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    cache.set("d", {"text": "D"})
+    cache.close()
+    assert SQLiteCache(str(tmp_path / "cache.db")).get("d") == {"text": "D"}
+
+def test_sqlite_cache_hits_do_not_write(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.set("a", {"text": "A"})
+    cache.set("b", {"text": "B"})
+    changes = cache._conn.total_changes
+    for _ in range(3):
+        assert cache.get("a") == {"text": "A"}
+    assert cache._conn.total_changes == changes
+
+    # Buffered accesses still count for eviction on the next write
+    cache.set("c", {"text": "C"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"text": "A"}
+    cache.close()
+
+@patch('litellm.completion')
+def test_explain_uses_cache(mock_completion: MagicMock):
+    """
+    Tests that a repeated explain() call is served from the cache.
+    """
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = "Cached explanation."
+    mock_completion.return_value = mock_response
+    cache = LRUCache()
+
+    first = explain(MockResults(), model="gpt-4o", cache=cache)
+    second = explain(MockResults(), model="gpt-4o", cache=cache)
+    third = explain(MockResults(), model="gpt-4o", audience="manager", cache=cache)
+
+    assert mock_completion.call_count == 2
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["text"] == "Cached explanation."
+    assert third["cached"] is False
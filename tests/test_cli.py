@@ -0,0 +1,78 @@
+# tests/test_cli.py
+
+import json
+import pickle
+from unittest.mock import MagicMock, patch
+
+from statlingua.cli import main
+
+def _fake_completion(model, messages, **kwargs):
+    user_prompt = messages[1]["content"]
+    if "FAIL" in user_prompt:
+        raise ValueError("bad request")
+    response = MagicMock()
+    response.choices[0].message.content = f"Explained: {user_prompt.splitlines()[-1]}"
+    response.usage.prompt_tokens = 10
+    response.usage.completion_tokens = 5
+    return response
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_batch_run_resumes_from_checkpoint(tmp_path):
+    inputs = tmp_path / "inputs"
+    (inputs / "nested").mkdir(parents=True)
+    with open(inputs / "nested" / "model.pkl", "wb") as f:
+        pickle.dump({"coef": 1.5}, f)
+    with open(inputs / "summaries.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "a", "summary": "SUMMARY A", "model_type": "lm"}) + "\n")
+        f.write("\n")
+        f.write(json.dumps({"summary": "SUMMARY FAIL"}) + "\n")
+        f.write(json.dumps({"id": "b", "summary": "SUMMARY B", "context": "Sales data"}) + "\n")
+    output = tmp_path / "results.jsonl"
+    argv = ["explain", str(inputs), "--model", "gpt-4o", "-o", str(output), "-j", "2"]
+
+    with patch('litellm.completion', side_effect=_fake_completion) as mock_completion:
+        assert main(argv) == 1
+        first_calls = mock_completion.call_count
+        records = {record["id"]: record for record in _read(output)}
+
+        assert first_calls == 4
+        assert records["a"]["text"] == "Explained: SUMMARY A"
+        assert records["a"]["model_type"] == "lm"
+        assert "Sales data" in records["b"]["text"]
+        assert records[str(inputs / "nested" / "model.pkl")]["model_type"] == "default"
+        assert "ValueError" in records[f"{inputs / 'summaries.jsonl'}:3"]["error"]
+
+        # Re-running only retries the failed item
+        assert main(argv) == 1
+        assert mock_completion.call_count == first_calls + 1
+        assert len(_read(output)) == 5
+
+        # Different settings are new work
+        assert main(argv + ["--audience", "manager"]) == 1
+        assert mock_completion.call_count == first_calls + 5
+
+def test_identical_inputs_each_get_a_record(tmp_path):
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    for name in ("first.pkl", "copy.pkl"):
+        with open(inputs / name, "wb") as f:
+            pickle.dump({"coef": 1.5}, f)
+    line = json.dumps({"summary": "SUMMARY A"}) + "\n"
+    with open(inputs / "summaries.jsonl", "w", encoding="utf-8") as f:
+        f.write(line + line)
+    output = tmp_path / "results.jsonl"
+    argv = ["explain", str(inputs), "--model", "gpt-4o", "-o", str(output)]
+
+    with patch('litellm.completion', side_effect=_fake_completion) as mock_completion:
+        assert main(argv) == 0
+        assert main(argv) == 0
+
+    ids = sorted(record["id"] for record in _read(output))
+    assert ids == sorted([
+        str(inputs / "copy.pkl"), str(inputs / "first.pkl"),
+        f"{inputs / 'summaries.jsonl'}:1", f"{inputs / 'summaries.jsonl'}:2",
+    ])
+    assert mock_completion.call_count == 4
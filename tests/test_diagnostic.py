@@ -0,0 +1,310 @@
+# tests/test_diagnostic.py
+
+import base64
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from statlingua.diagnostic import (
+    _binned_residual_smoother,
+    _encode_image,
+    check_heteroscedasticity,
+    check_normality,
+    compute_influence,
+    compute_vif,
+    diagnose_agent,
+    plot_residuals_vs_fitted,
+)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _fit_ols(n=80, seed=0):
+    sm = pytest.importorskip("statsmodels.api")
+    pytest.importorskip("seaborn")
+    rng = np.random.default_rng(seed)
+    X = sm.add_constant(rng.normal(size=(n, 2)))
+    return sm.OLS(X @ [1.0, 2.0, -1.0] + rng.normal(size=n), X).fit()
+
+def test_plot_residuals_vs_fitted_renders_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fit = _fit_ols()
+
+    png = plot_residuals_vs_fitted(fit)
+    assert png.startswith(PNG_SIGNATURE)
+    assert list(tmp_path.iterdir()) == []
+
+    # File output is optional
+    png = plot_residuals_vs_fitted(fit, filepath=str(tmp_path / "resid.png"))
+    assert (tmp_path / "resid.png").read_bytes() == png
+
+def test_plot_residuals_vs_fitted_is_thread_safe():
+    fits = [_fit_ols(seed=seed) for seed in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        pngs = list(pool.map(plot_residuals_vs_fitted, fits))
+    assert all(png.startswith(PNG_SIGNATURE) for png in pngs)
+
+@patch('litellm.completion')
+def test_diagnose_agent_sends_plot_bytes(mock_completion: MagicMock):
+    """
+    Tests that the agent sends a compact re-encoding of the in-memory PNG
+    to the interpretation call.
+    """
+    tool_call = MagicMock()
+    tool_call.id = "call_1"
+    tool_call.function.name = "plot_residuals_vs_fitted"
+    first = MagicMock()
+    first.choices[0].message.tool_calls = [tool_call]
+    final = MagicMock()
+    final.choices[0].message.content = "The residuals look fine."
+    final.choices[0].message.tool_calls = None
+    mock_completion.side_effect = [first, final]
+
+    result = diagnose_agent(_fit_ols(), prompt="Is the model linear?", model="gpt-4o")
+
+    assert result['text'] == "The residuals look fine."
+    assert result['plot'] is None
+    assert result['image'].startswith(PNG_SIGNATURE)
+    image_message = mock_completion.call_args.kwargs['messages'][-1]
+    image_url = image_message['content'][1]['image_url']
+    assert image_url['detail'] == "auto"
+    assert image_url['url'].startswith("data:image/png;base64,")
+    payload = base64.b64decode(image_url['url'].split(",", 1)[1])
+    assert payload.startswith(PNG_SIGNATURE)
+    assert len(payload) == result['image_payload_bytes'] < len(result['image'])
+
+def test_plot_residuals_vs_fitted_large_n_mode_is_fast():
+    pytest.importorskip("matplotlib")
+    rng = np.random.default_rng(0)
+    fitted = rng.normal(size=2_000_000)
+    fit = MagicMock()
+    fit.fittedvalues = fitted
+    fit.resid = rng.normal(size=fitted.size) * (1 + np.abs(fitted))
+
+    start = time.perf_counter()
+    png = plot_residuals_vs_fitted(fit, large_n_threshold=50_000)
+    assert png.startswith(PNG_SIGNATURE)
+    assert time.perf_counter() - start < 5
+
+def test_binned_residual_smoother_tracks_mean_and_spread():
+    rng = np.random.default_rng(1)
+    fitted = rng.uniform(-2, 2, size=200_000)
+    residuals = fitted ** 2 + rng.normal(size=fitted.size) * (1 + np.abs(fitted))
+
+    centres, means, sds = _binned_residual_smoother(fitted, residuals, n_bins=20)
+    assert len(centres) == 20
+    np.testing.assert_allclose(means, centres ** 2, atol=0.15)
+    # The spread grows away from zero
+    assert sds[0] > sds[10] and sds[-1] > sds[10]
+
+def test_numeric_tools_match_statsmodels():
+    from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+    fit = _fit_ols(n=120)
+    exog = fit.model.exog
+
+    vif_table = compute_vif(fit)
+    for j in (1, 2):
+        assert f"{variance_inflation_factor(exog, j):.2f}" in vif_table
+
+    influence = fit.get_influence()
+    influence_text = compute_influence(fit, top_k=3)
+    assert f"max Cook's D = {influence.cooks_distance[0].max():.4g}" in influence_text
+    assert f"max leverage = {influence.hat_matrix_diag.max():.4g}" in influence_text
+
+    assert "Breusch-Pagan LM" in check_heteroscedasticity(fit)
+    assert "Jarque-Bera" in check_normality(fit)
+
+def test_residual_tools_support_glms():
+    """
+    Tests that the residual-based tools fall back to Pearson residuals for
+    GLM results, which have no `.resid`.
+    """
+    sm = pytest.importorskip("statsmodels.api")
+    from statsmodels.stats.diagnostic import het_breuschpagan
+
+    rng = np.random.default_rng(0)
+    X = sm.add_constant(rng.normal(size=(200, 2)))
+    y = rng.poisson(np.exp(X @ [0.5, 0.3, -0.2]))
+    fit = sm.GLM(y, X, family=sm.families.Poisson()).fit()
+    assert not hasattr(fit, "resid")
+
+    heteroscedasticity = check_heteroscedasticity(fit)
+    lm = het_breuschpagan(fit.resid_pearson, X)[0]
+    assert heteroscedasticity.startswith("Heteroscedasticity tests of the Pearson residuals")
+    assert f"{lm:.4g}" in heteroscedasticity
+    normality = check_normality(fit)
+    assert normality.startswith("Normality tests of the Pearson residuals")
+    assert "Jarque-Bera" in normality
+
+def test_numeric_tools_report_errors_as_text():
+    assert compute_vif(object()).startswith("Error executing compute_vif")
+
+@patch('litellm.completion')
+def test_diagnose_agent_sends_text_tool_results(mock_completion: MagicMock):
+    """
+    Tests that numeric tools return their table as the tool message and skip
+    the image payload.
+    """
+    tool_call = MagicMock()
+    tool_call.id = "call_1"
+    tool_call.function.name = "compute_vif"
+    first = MagicMock()
+    first.choices[0].message.tool_calls = [tool_call]
+    final = MagicMock()
+    final.choices[0].message.content = "No multicollinearity."
+    final.choices[0].message.tool_calls = None
+    mock_completion.side_effect = [first, final]
+
+    result = diagnose_agent(_fit_ols(), prompt="Any multicollinearity?", model="gpt-4o")
+
+    assert result['text'] == "No multicollinearity."
+    assert result['image'] is None
+    assert result['table'].startswith("Variance Inflation Factors")
+    tool_message = mock_completion.call_args.kwargs['messages'][-1]
+    assert tool_message['role'] == "tool"
+    assert tool_message['content'] == result['table']
+
+def _tool_call(call_id, name):
+    tool_call = MagicMock()
+    tool_call.id = call_id
+    tool_call.function.name = name
+    return tool_call
+
+@patch('litellm.completion')
+def test_diagnose_agent_runs_all_tool_calls_concurrently(mock_completion: MagicMock):
+    """
+    Tests that every requested tool runs, concurrently, with one tool message
+    per call in request order.
+    """
+    first = MagicMock()
+    first.choices[0].message.tool_calls = [
+        _tool_call("call_1", "slow_a"),
+        _tool_call("call_2", "slow_b"),
+        _tool_call("call_3", "missing_tool"),
+    ]
+    final = MagicMock()
+    final.choices[0].message.content = "Done."
+    final.choices[0].message.tool_calls = None
+    mock_completion.side_effect = [first, final]
+
+    def slow(label):
+        def tool(model_object):
+            time.sleep(0.5)
+            return label
+        return tool
+
+    fake_tools = {"slow_a": slow("A"), "slow_b": slow("B")}
+    with patch.dict("statlingua.diagnostic.available_tools", fake_tools):
+        start = time.perf_counter()
+        result = diagnose_agent(MagicMock(), prompt="Check everything", model="gpt-4o")
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.9
+    assert result['text'] == "Done."
+    assert result['tool_calls'] == ["slow_a", "slow_b", "missing_tool"]
+    assert result['table'] == "A\n\nB"
+    tool_messages = [m for m in mock_completion.call_args.kwargs['messages'] if isinstance(m, dict) and m['role'] == "tool"]
+    assert [m['tool_call_id'] for m in tool_messages] == ["call_1", "call_2", "call_3"]
+    assert tool_messages[2]['content'] == "Error: Tool 'missing_tool' not found."
+
+@patch('litellm.completion')
+def test_diagnose_agent_stops_after_max_steps(mock_completion: MagicMock):
+    """
+    Tests that the agent forbids new tool calls once `max_steps` turns have
+    run, while keeping the tools defined for the tool messages in the history.
+    """
+    looping = MagicMock()
+    looping.choices[0].message.tool_calls = [_tool_call("call_1", "compute_vif")]
+    looping.choices[0].message.content = "Final answer."
+    mock_completion.return_value = looping
+
+    result = diagnose_agent(_fit_ols(), prompt="Check", model="gpt-4o", max_steps=2)
+
+    assert mock_completion.call_count == 3
+    assert mock_completion.call_args.kwargs["tool_choice"] == "none"
+    assert mock_completion.call_args.kwargs["tools"]
+    assert "tool_choice" not in mock_completion.call_args_list[0].kwargs
+    assert result['tool_calls'] == ["compute_vif", "compute_vif"]
+    assert result['text'] == "Final answer."
+
+@patch('litellm.completion')
+def test_diagnose_agent_speculative_tools_overlap_first_call(mock_completion: MagicMock):
+    """
+    Tests that a speculatively started tool runs during the first LLM call
+    and that its result is reused, not recomputed.
+    """
+    first = MagicMock()
+    first.choices[0].message.tool_calls = [_tool_call("call_1", "slow_plot")]
+    final = MagicMock()
+    final.choices[0].message.content = "Done."
+    final.choices[0].message.tool_calls = None
+    responses = iter([first, final])
+
+    def slow_completion(**kwargs):
+        time.sleep(0.5)
+        return next(responses)
+
+    mock_completion.side_effect = slow_completion
+    calls = []
+
+    def slow_plot(model_object):
+        calls.append(model_object)
+        time.sleep(0.5)
+        return "plot"
+
+    with patch.dict("statlingua.diagnostic.available_tools", {"slow_plot": slow_plot}):
+        start = time.perf_counter()
+        result = diagnose_agent(
+            MagicMock(), prompt="Check", model="gpt-4o", speculate=["slow_plot"]
+        )
+        elapsed = time.perf_counter() - start
+
+    # Two LLM calls of 0.5s each; the tool is hidden behind the first one
+    assert elapsed < 1.4
+    assert len(calls) == 1
+    assert result['table'] == "plot"
+
+@patch('litellm.completion')
+def test_diagnose_agent_discards_unrequested_speculation(mock_completion: MagicMock, tmp_path):
+    """
+    Tests that speculative results the LLM never asks for are not returned
+    or written to disk.
+    """
+    response = MagicMock()
+    response.choices[0].message.content = "No tools needed."
+    response.choices[0].message.tool_calls = None
+    mock_completion.return_value = response
+
+    plot_path = tmp_path / "resid.png"
+    result = diagnose_agent(
+        _fit_ols(), prompt="Hi", model="gpt-4o", plot_path=str(plot_path), speculate=True
+    )
+
+    assert result['image'] is None
+    assert result['tool_calls'] == []
+    assert not plot_path.exists()
+
+@pytest.mark.parametrize("image_format, signature", [
+    ("png", PNG_SIGNATURE),
+    ("jpeg", b"\xff\xd8\xff"),
+    ("webp", b"RIFF"),
+])
+def test_encode_image_downscales_and_converts(image_format, signature):
+    from PIL import Image
+
+    png = plot_residuals_vs_fitted(_fit_ols())
+    encoded = _encode_image(png, max_size=400, image_format=image_format, colors=16)
+
+    assert encoded.startswith(signature)
+    assert max(Image.open(io.BytesIO(encoded)).size) == 400
+    assert len(encoded) < len(png)
+
+def test_diagnose_agent_rejects_unknown_image_options():
+    with pytest.raises(ValueError, match="image_format"):
+        diagnose_agent(MagicMock(), prompt="Hi", model="gpt-4o", image_format="gif")
+    with pytest.raises(ValueError, match="image_detail"):
+        diagnose_agent(MagicMock(), prompt="Hi", model="gpt-4o", image_detail="medium")
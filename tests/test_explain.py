@@ -1,9 +1,20 @@
 # tests/test_explain.py
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
 
 # Import the function we want to test directly from its module
-from statlingua.explain import explain
+from statlingua.explain import (
+    aexplain,
+    aexplain_stream,
+    explain,
+    explain_many,
+    explain_stream,
+    explain_variants,
+)
 
 # A simple mock class to simulate a statsmodels OLSResults object
 class MockOLSResults:
@@ -88,3 +99,258 @@ def test_explain_handles_glm(mock_completion: MagicMock):
     # Check that the user prompt identifies the model as a "glm"
     assert "Explain the following glm model output:" in user_prompt
     assert "--- MOCK GLM SUMMARY ---" in user_prompt
+
+@patch('litellm.acompletion', new_callable=AsyncMock)
+def test_explain_many_preserves_order_and_collects_errors(mock_acompletion: AsyncMock):
+    """
+    Tests that explain_many() returns results in input order and records
+    per-item failures instead of aborting the batch.
+    """
+    # Arrange
+    class Summary:
+        def __init__(self, label):
+            self.label = label
+
+        def summary(self):
+            return f"--- SUMMARY {self.label} ---"
+
+    async def fake_acompletion(model, messages, **kwargs):
+        user_prompt = messages[1]['content']
+        if "SUMMARY 1" in user_prompt:
+            raise RuntimeError("provider error")
+        response = MagicMock()
+        response.choices[0].message.content = user_prompt.splitlines()[-1]
+        return response
+
+    mock_acompletion.side_effect = fake_acompletion
+    models = [Summary(i) for i in range(4)]
+
+    # Act
+    results = explain_many(models, model="gpt-4o", max_concurrency=2)
+
+    # Assert
+    assert mock_acompletion.call_count == 4
+    assert isinstance(results[1], RuntimeError)
+    assert [r['text'] for i, r in enumerate(results) if i != 1] == [
+        "--- SUMMARY 0 ---", "--- SUMMARY 2 ---", "--- SUMMARY 3 ---"
+    ]
+
+@patch('litellm.acompletion', new_callable=AsyncMock)
+def test_explain_many_dedupes_identical_summaries(mock_acompletion: AsyncMock):
+    """
+    Tests that models differing only in volatile summary fields share a
+    single LLM call.
+    """
+    class Refit:
+        def __init__(self, time):
+            self.time = time
+
+        def summary(self):
+            return f"R-squared: 0.5\nTime:       {self.time}\ncoef x 1.0"
+
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = "Shared explanation."
+    mock_acompletion.return_value = mock_response
+
+    results = explain_many([Refit("10:00:00"), Refit("10:00:01")], model="gpt-4o")
+
+    mock_acompletion.assert_called_once()
+    assert [r['text'] for r in results] == ["Shared explanation."] * 2
+    assert results[0]['fingerprint'] == results[1]['fingerprint']
+
+def _stream_chunks(*texts):
+    chunks = []
+    for text in texts:
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = text
+        chunks.append(chunk)
+    return chunks
+
+@patch('litellm.completion')
+def test_explain_stream_yields_chunks_then_metadata(mock_completion: MagicMock):
+    mock_completion.return_value = iter(_stream_chunks("This ", None, "streams."))
+
+    stream = explain_stream(MockOLSResults(), model="gpt-4o", audience="manager")
+    assert stream.result is None
+    chunks = list(stream)
+
+    assert mock_completion.call_args.kwargs['stream'] is True
+    assert chunks == ["This ", "streams."]
+    assert stream.result['text'] == "This streams."
+    assert stream.result['audience'] == "manager"
+    assert stream.result['cached'] is False
+
+@patch('litellm.acompletion', new_callable=AsyncMock)
+def test_aexplain_stream_yields_chunks(mock_acompletion: AsyncMock):
+    async def agen():
+        for chunk in _stream_chunks("Async ", "stream."):
+            yield chunk
+
+    mock_acompletion.return_value = agen()
+
+    async def consume():
+        stream = await aexplain_stream(MockOLSResults(), model="gpt-4o")
+        return [chunk async for chunk in stream], stream.result
+
+    chunks, result = asyncio.run(consume())
+    assert chunks == ["Async ", "stream."]
+    assert result['text'] == "Async stream."
+    assert result['style'] == "markdown"
+
+@patch('litellm.completion')
+def test_explain_chunked_map_reduce(mock_completion: MagicMock):
+    """
+    Tests that chunked mode explains every coefficient block and merges
+    the partial explanations in the requested style.
+    """
+    sm = pytest.importorskip("statsmodels.api")
+    rng = np.random.default_rng(0)
+    X = sm.add_constant(rng.normal(size=(100, 24)))
+    fit = sm.OLS(X @ rng.normal(size=25) + rng.normal(size=100), X).fit()
+
+    def fake_completion(model, messages, **kwargs):
+        user_prompt = messages[1]['content']
+        response = MagicMock()
+        if "Partial explanation" in user_prompt:
+            response.choices[0].message.content = "MERGED"
+        else:
+            block = user_prompt.split("Coefficients ")[1].split(" of")[0]
+            response.choices[0].message.content = f"PARTIAL {block}"
+        return response
+
+    mock_completion.side_effect = fake_completion
+
+    result = explain(fit, model="gpt-4o", style="json", audience="manager", chunk_size=10)
+
+    assert mock_completion.call_count == 4
+    assert result['text'] == "MERGED"
+    assert result['chunks'] == 3
+    reduce_messages = mock_completion.call_args.kwargs['messages']
+    assert "Style: Json" in reduce_messages[0]['content']
+    assert "Target Audience: Manager" in reduce_messages[0]['content']
+    for block in ("1-10", "11-20", "21-25"):
+        assert f"PARTIAL {block}" in reduce_messages[1]['content']
+
+@patch('litellm.acompletion', new_callable=AsyncMock)
+def test_aexplain_chunked_maps_blocks_concurrently(mock_acompletion: AsyncMock):
+    """
+    Tests that aexplain() supports chunked mode, runs the map step
+    concurrently and does not forward `chunk_size` to the provider.
+    """
+    sm = pytest.importorskip("statsmodels.api")
+    rng = np.random.default_rng(0)
+    X = sm.add_constant(rng.normal(size=(100, 24)))
+    fit = sm.OLS(X @ rng.normal(size=25) + rng.normal(size=100), X).fit()
+    in_flight = []
+    peak = []
+
+    async def fake_acompletion(model, messages, **kwargs):
+        assert "chunk_size" not in kwargs and "max_concurrency" not in kwargs
+        user_prompt = messages[1]['content']
+        response = MagicMock()
+        if "Partial explanation" in user_prompt:
+            response.choices[0].message.content = "MERGED"
+            return response
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        block = user_prompt.split("Coefficients ")[1].split(" of")[0]
+        response.choices[0].message.content = f"PARTIAL {block}"
+        return response
+
+    mock_acompletion.side_effect = fake_acompletion
+
+    result = asyncio.run(aexplain(fit, model="gpt-4o", style="json", chunk_size=10))
+
+    assert mock_acompletion.call_count == 4
+    assert result['text'] == "MERGED"
+    assert result['chunks'] == 3
+    assert max(peak) == 3
+    reduce_messages = mock_acompletion.call_args.kwargs['messages']
+    assert "Style: Json" in reduce_messages[0]['content']
+    for block in ("1-10", "11-20", "21-25"):
+        assert f"PARTIAL {block}" in reduce_messages[1]['content']
+
+@patch('litellm.acompletion', new_callable=AsyncMock)
+def test_explain_variants_fans_out_from_one_summary(mock_acompletion: AsyncMock):
+    """
+    Tests that explain_variants() extracts the summary once and makes one
+    call per audience x verbosity combination.
+    """
+    model_object = MagicMock()
+    model_object.summary.return_value = "--- MOCK OLS SUMMARY ---"
+
+    async def fake_acompletion(model, messages, **kwargs):
+        response = MagicMock()
+        audience_line = messages[0]['content'].split("Target Audience: ")[1]
+        response.choices[0].message.content = audience_line.splitlines()[0]
+        return response
+
+    mock_acompletion.side_effect = fake_acompletion
+    results = explain_variants(
+        model_object, model="gpt-4o",
+        audiences=["manager", "novice"], verbosities=["brief", "detailed"],
+    )
+
+    assert model_object.summary.call_count == 1
+    assert mock_acompletion.call_count == 4
+    assert list(results) == [
+        ("manager", "brief", "markdown"), ("manager", "detailed", "markdown"),
+        ("novice", "brief", "markdown"), ("novice", "detailed", "markdown"),
+    ]
+    assert results["novice", "detailed", "markdown"]["text"] == "Novice"
+    assert results["manager", "brief", "markdown"]["verbosity"] == "brief"
+
+@patch('litellm.acompletion', new_callable=AsyncMock)
+def test_explain_variants_single_call(mock_acompletion: AsyncMock):
+    """
+    Tests that the single-call mode splits one keyed JSON response and
+    reports variants missing from it as errors.
+    """
+    response = MagicMock()
+    response.choices[0].message.content = (
+        '```json\n{"manager/brief/markdown": "For managers.", '
+        '"manager/brief/text": 42}\n```'
+    )
+    mock_acompletion.return_value = response
+
+    results = explain_variants(
+        MockOLSResults(), model="gpt-4o", audiences="manager", verbosities="brief",
+        styles=["markdown", "text"], single_call=True,
+    )
+
+    assert mock_acompletion.call_count == 1
+    system_prompt = mock_acompletion.call_args.kwargs['messages'][0]['content']
+    assert "`manager/brief/markdown`" in system_prompt and "`manager/brief/text`" in system_prompt
+    assert results["manager", "brief", "markdown"]["text"] == "For managers."
+    assert results["manager", "brief", "markdown"]["metrics"]["llm_calls"] == 1
+    assert isinstance(results["manager", "brief", "text"], ValueError)
+
+@patch('litellm.completion')
+def test_explain_prompt_caching_layout(mock_completion: MagicMock):
+    """
+    Tests that prompt_caching puts the static prompt first and the
+    audience-specific sections last, marks cache breakpoints only for
+    providers that need them, and reports cached tokens.
+    """
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = "Explained."
+    mock_response.usage.prompt_tokens = 3000
+    mock_response.usage.completion_tokens = 200
+    mock_response.usage.prompt_tokens_details.cached_tokens = 2048
+    mock_completion.return_value = mock_response
+
+    result = explain(MockOLSResults(), model="gpt-4o", audience="manager", prompt_caching=True)
+    system, user = mock_completion.call_args.kwargs['messages']
+    assert system['content'].startswith("## Role")
+    assert "Target Audience" not in system['content']
+    assert user['content'].index("MOCK OLS SUMMARY") < user['content'].index("Target Audience: Manager")
+    assert result['metrics']['cached_tokens'] == 2048
+
+    explain(MockOLSResults(), model="anthropic/claude-3-5-sonnet", prompt_caching=True)
+    system, user = mock_completion.call_args.kwargs['messages']
+    assert system['content'][0]['cache_control'] == {"type": "ephemeral"}
+    assert user['content'][0]['cache_control'] == {"type": "ephemeral"}
+    assert "cache_control" not in user['content'][1]
+    assert "Target Audience: Novice" in user['content'][1]['text']
@@ -0,0 +1,39 @@
+# tests/test_import.py
+
+# Import-time regression checks. They run in a fresh interpreter so that
+# modules imported by other tests do not leak into the measurement. For a
+# detailed breakdown, run `python -X importtime -c "import statlingua"`.
+
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ("litellm", "statsmodels", "matplotlib", "seaborn", "pandas", "numpy")
+
+# Budget for `from statlingua import explain, diagnose`, in seconds. This is
+# generous on purpose; it is meant to catch an eager heavy import sneaking
+# back in (litellm alone takes several seconds), not to benchmark.
+IMPORT_BUDGET = 1.0
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+    )
+    return result.stdout
+
+def test_import_does_not_load_heavy_dependencies():
+    code = (
+        "import json, sys\n"
+        "from statlingua import explain, diagnose, diagnose_agent\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    assert json.loads(_run(code)) == []
+
+def test_import_time_budget():
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "from statlingua import explain, diagnose\n"
+        "print(time.perf_counter() - start)"
+    )
+    assert float(_run(code)) < IMPORT_BUDGET
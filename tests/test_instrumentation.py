@@ -0,0 +1,102 @@
+# tests/test_instrumentation.py
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from statlingua.cache import LRUCache
+from statlingua.diagnostic import diagnose
+from statlingua.explain import explain, explain_stream
+from statlingua.instrumentation import Metrics, clear_hooks, register_hook, unregister_hook
+
+class MockResults:
+    def summary(self):
+        return "--- MOCK SUMMARY ---"
+
+def _response(text="An explanation.", prompt_tokens=120, completion_tokens=30):
+    response = MagicMock()
+    response.choices[0].message.content = text
+    response.usage.prompt_tokens = prompt_tokens
+    response.usage.completion_tokens = completion_tokens
+    return response
+
+@pytest.fixture(autouse=True)
+def _no_hooks():
+    clear_hooks()
+    yield
+    clear_hooks()
+
+@patch('litellm.completion')
+def test_explain_reports_stage_timings_and_tokens(mock_completion: MagicMock):
+    mock_completion.return_value = _response()
+
+    metrics = explain(MockResults(), model="gpt-4o")["metrics"]
+
+    assert metrics["operation"] == "explain"
+    assert set(metrics["stages"]) == {"handler", "prompt", "llm"}
+    assert metrics["total_seconds"] >= sum(metrics["stages"].values())
+    assert metrics["prompt_tokens"] == 120
+    assert metrics["completion_tokens"] == 30
+    assert (metrics["llm_calls"], metrics["cache_hits"], metrics["cache_misses"]) == (1, 0, 1)
+    assert metrics["retries"] == 0
+
+@patch('litellm.completion')
+def test_hooks_receive_metrics_and_cache_hits(mock_completion: MagicMock):
+    mock_completion.return_value = _response()
+    received = []
+    hook = register_hook(received.append)
+    cache = LRUCache()
+
+    explain(MockResults(), model="gpt-4o", cache=cache)
+    second = explain(MockResults(), model="gpt-4o", cache=cache)
+    diagnose(MockResults(), prompt="Is this a good model?", model="gpt-4o")
+    unregister_hook(hook)
+    explain(MockResults(), model="gpt-4o")
+
+    assert [m["operation"] for m in received] == ["explain", "explain", "diagnose"]
+    assert received[1] == second["metrics"]
+    assert received[1]["cache_hits"] == 1
+    assert received[1]["prompt_tokens"] == 0
+
+@patch('litellm.completion')
+def test_failing_hook_only_warns(mock_completion: MagicMock):
+    mock_completion.return_value = _response()
+
+    @register_hook
+    def broken(metrics):
+        raise RuntimeError("metrics backend down")
+
+    with pytest.warns(UserWarning, match="metrics backend down"):
+        result = explain(MockResults(), model="gpt-4o")
+    assert result["text"] == "An explanation."
+
+@patch('litellm.completion')
+def test_explain_stream_separates_first_token(mock_completion: MagicMock):
+    chunks = []
+    for text in ("An ", "explanation."):
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = text
+        chunks.append(chunk)
+    # With include_usage, the final chunk carries the usage of the response
+    usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30)
+    chunks.append(SimpleNamespace(choices=[], usage=usage))
+    mock_completion.return_value = iter(chunks)
+
+    stream = explain_stream(MockResults(), model="gpt-4o")
+    assert "".join(stream) == "An explanation."
+
+    assert mock_completion.call_args.kwargs["stream_options"] == {"include_usage": True}
+    metrics = stream.result["metrics"]
+    assert metrics["stages"]["first_token"] <= metrics["stages"]["llm"]
+    assert (metrics["prompt_tokens"], metrics["completion_tokens"]) == (120, 30)
+
+def test_metrics_ignore_missing_usage():
+    metrics = Metrics("custom")
+    metrics.add_call({"text": "x", "cached": False, "usage": {"prompt_tokens": None}})
+    with metrics.stage("work"):
+        pass
+    record = metrics.as_dict()
+    assert record["prompt_tokens"] == 0
+    assert record["llm_calls"] == 1
+    assert "work" in record["stages"]
@@ -0,0 +1,215 @@
+# tests/test_model_handlers.py
+
+import gc
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from statlingua import model_handlers
+from statlingua.model_handlers import (
+    canonicalize_summary,
+    compact_summary,
+    extract_summary,
+    handle_lm,
+    structured_summary,
+    summary_fingerprint,
+)
+from statlingua.prompts import estimate_tokens
+
+SUMMARY = """\
+                            OLS Regression Results
+==============================================================================
+Dep. Variable:                      y   R-squared:                       0.919
+Date:                {date}   Prob (F-statistic):           2.28e-26
+Time:                        {time}   Log-Likelihood:                -72.330
+No. Observations:                  50   AIC:                             150.7
+=============================================================================="""
+
+def test_canonicalize_summary_strips_date_and_time():
+    """
+    Tests that the volatile Date/Time cells are removed while the
+    neighbouring column is kept intact.
+    """
+    text = canonicalize_summary(SUMMARY.format(date="Sat, 17 Oct 2026", time="16:03:31"))
+    assert "2026" not in text and "16:03:31" not in text
+    assert "Prob (F-statistic):           2.28e-26" in text
+    assert "Log-Likelihood:                -72.330" in text
+
+def test_summary_fingerprint_is_stable_across_refits():
+    first = SUMMARY.format(date="Sat, 17 Oct 2026", time="16:03:31")
+    second = SUMMARY.format(date="Mon, 19 Oct 2026", time="09:15:02")
+    assert summary_fingerprint("lm", first) == summary_fingerprint("lm", second)
+    assert summary_fingerprint("lm", first) != summary_fingerprint("glm", first)
+    assert summary_fingerprint("lm", first) != summary_fingerprint(
+        "lm", first.replace("0.919", "0.920")
+    )
+
+def _fit_ols(n=60, p=3, seed=0):
+    sm = pytest.importorskip("statsmodels.api")
+    rng = np.random.default_rng(seed)
+    X = sm.add_constant(rng.normal(size=(n, p)))
+    y = X @ np.arange(1, p + 2) + rng.normal(size=n)
+    return sm.OLS(y, X).fit()
+
+def test_structured_summary_matches_results_arrays():
+    """
+    Tests that the structured path pulls coefficient arrays directly from
+    the results object and renders them as a compact table.
+    """
+    fit = _fit_ols()
+    structured = structured_summary(fit)
+
+    assert len(structured) == 4
+    np.testing.assert_allclose(structured.params, fit.params)
+    np.testing.assert_allclose(structured.conf_int, fit.conf_int())
+    assert ("No. Observations", "60") in structured.header
+
+    name, text = extract_summary(fit)
+    assert name == "lm"
+    assert text.splitlines()[0] == "OLS Regression Results"
+    assert "P>|t|" in text
+    assert text.splitlines()[-1].startswith("x3")
+    # Rendering a subset only emits the requested rows
+    assert structured.render_table([2]).splitlines()[1].startswith("x2")
+
+def test_structured_summary_keeps_residual_tests_and_notes():
+    """
+    Tests that the statistics and notes of the statsmodels summary's lower
+    panel are carried by the structured render.
+    """
+    fit = _fit_ols()
+    X = fit.model.exog.copy()
+    X[:, 1] *= 1e4
+    scaled = type(fit.model)(fit.model.endog, X).fit()
+    _, text = extract_summary(scaled)
+
+    for label in ("Omnibus", "Prob(Omnibus)", "Skew", "Kurtosis", "Durbin-Watson",
+                  "Jarque-Bera (JB)", "Prob(JB)", "Cond. No."):
+        assert f"{label}: " in text
+    assert f"Durbin-Watson: {scaled.summary().tables[2].data[0][3].strip()}" in text
+    assert "[1] Standard Errors assume" in text
+    assert "The condition number is large" in text
+    # Likelihood-scale statistics keep their decimals
+    assert f"Log-Likelihood: {scaled.llf:.3f}" in text
+    assert f"AIC: {scaled.aic:.3f}" in text
+
+def test_condition_number_reuses_cached_eigenvalues():
+    """
+    Tests that wide designs are not decomposed again: the condition number
+    comes from the eigenvalues statsmodels caches on the results object.
+    """
+    fit = _fit_ols(n=2000, p=300)
+    with patch.object(np.linalg, "svd", side_effect=AssertionError("full-design SVD")):
+        _, text = extract_summary(fit)
+    assert f"Cond. No.: {fit.condition_number:.3g}" in text
+
+def test_handlers_fall_back_to_summary_text():
+    class MockOLSResults:
+        def summary(self):
+            return "--- MOCK OLS SUMMARY ---"
+
+    assert structured_summary(MockOLSResults()) is None
+    assert handle_lm(MockOLSResults()) == ("lm", "--- MOCK OLS SUMMARY ---")
+
+def test_compact_summary_keeps_top_terms_within_budget():
+    """
+    Tests that wide models are trimmed to the most significant
+    coefficients, with an aggregate line for the rest.
+    """
+    fit = _fit_ols(n=400, p=200)
+    _, full = extract_summary(fit)
+    _, compact = extract_summary(fit, max_tokens=600)
+
+    assert estimate_tokens(full) > 600 >= estimate_tokens(compact)
+    assert "No. Observations: 400" in compact
+    # The largest effects have the largest |t| and must survive trimming
+    assert any(line.startswith("x200 ") for line in compact.splitlines())
+    assert "terms omitted to fit the token budget" in compact.splitlines()[-1]
+    # Summaries that already fit are left untouched
+    assert compact_summary(fit, full, max_tokens=10 ** 6) == full
+
+def test_compact_summary_latency_is_bounded_for_wide_models():
+    """
+    Tests that compacting a wide model costs far less than fitting it: the
+    top-k path never decomposes the n x p design.
+    """
+    fit = _fit_ols(n=4000, p=800)
+    start = time.perf_counter()
+    _, compact = extract_summary(fit, max_tokens=2000)
+    elapsed = time.perf_counter() - start
+
+    assert estimate_tokens(compact) <= 2000
+    assert elapsed < 0.15
+
+def test_compact_summary_truncates_unstructured_text():
+    text = "\n".join(f"line {i}" for i in range(1000))
+    compact = compact_summary(object(), text, max_tokens=50)
+    assert compact.startswith("line 0\nline 1")
+    assert compact.endswith("more lines omitted to fit the token budget]")
+
+    # A budget that fits every line exactly drops nothing and adds no marker
+    lines = text.splitlines()[:5]
+    exact = sum(estimate_tokens(line + "\n") for line in lines)
+    assert model_handlers._truncate_lines("\n".join(lines), exact) == "\n".join(lines)
+    assert model_handlers._truncate_lines("\n".join(lines), exact - 1).endswith(
+        "[... 1 more lines omitted to fit the token budget]"
+    )
+
+def test_extract_summary_is_memoized_per_model_object():
+    """
+    Tests that handler output is computed once per model object and freed
+    when the object is garbage-collected.
+    """
+    class CountingResults:
+        calls = 0
+
+        def summary(self):
+            CountingResults.calls += 1
+            return "--- COUNTED SUMMARY ---"
+
+    results = CountingResults()
+    first = extract_summary(results)
+    assert extract_summary(results) == first
+    assert CountingResults.calls == 1
+
+    object_id = id(results)
+    assert object_id in model_handlers._MODEL_CACHE
+    del results
+    gc.collect()
+    assert object_id not in model_handlers._MODEL_CACHE
+
+    # Objects that cannot be weakly referenced are simply not cached
+    assert extract_summary("plain text summary") == ("default", "plain text summary")
+
+def test_memo_eviction_waits_for_the_lock():
+    """
+    Tests that an entry freed by garbage collection is not removed while
+    another thread holds the cache lock (e.g., inside clear_summary_cache).
+    """
+    class Results:
+        def summary(self):
+            return "--- SUMMARY ---"
+
+    results = Results()
+    extract_summary(results)
+    object_id = id(results)
+    holding = threading.Event()
+    seen = []
+
+    def hold_lock():
+        with model_handlers._MODEL_CACHE_LOCK:
+            holding.set()
+            time.sleep(0.1)
+            seen.append(object_id in model_handlers._MODEL_CACHE)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    holding.wait()
+    del results  # The finalizer blocks until the holder releases the lock
+    holder.join()
+
+    assert seen == [True]
+    assert object_id not in model_handlers._MODEL_CACHE
@@ -0,0 +1,105 @@
+# tests/test_policy.py
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from statlingua.explain import explain
+from statlingua.policy import RequestPolicy, is_retryable
+
+class MockResults:
+    def summary(self):
+        return "--- MOCK SUMMARY ---"
+
+class RateLimitError(Exception):
+    """Stands in for litellm.RateLimitError, which is matched by name."""
+
+def _response(text):
+    response = MagicMock()
+    response.choices[0].message.content = text
+    response.usage.prompt_tokens = 100
+    response.usage.completion_tokens = 20
+    return response
+
+def test_is_retryable():
+    assert is_retryable(RateLimitError("slow down"))
+    assert is_retryable(TimeoutError())
+    error = Exception("bad gateway")
+    error.status_code = 502
+    assert is_retryable(error)
+    assert not is_retryable(ValueError("invalid request"))
+
+@patch('litellm.completion')
+def test_retries_retryable_errors(mock_completion: MagicMock):
+    mock_completion.side_effect = [RateLimitError("slow down"), _response("Recovered.")]
+    policy = RequestPolicy(max_retries=2, backoff_base=0.0)
+
+    result = explain(MockResults(), model="gpt-4o", policy=policy)
+
+    assert result["text"] == "Recovered."
+    assert mock_completion.call_count == 2
+    assert result["metrics"]["retries"] == 1
+
+@patch('litellm.completion', side_effect=ValueError("invalid request"))
+def test_does_not_retry_client_errors(mock_completion: MagicMock):
+    with pytest.raises(ValueError):
+        explain(MockResults(), model="gpt-4o", policy=RequestPolicy(backoff_base=0.0))
+    assert mock_completion.call_count == 1
+
+def test_timeout_and_deadline():
+    def slow(model, messages, **kwargs):
+        time.sleep(0.5)
+        return _response("Too late.")
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        RequestPolicy(timeout=0.05, max_retries=0).call(slow, "gpt-4o", [])
+    with pytest.raises(TimeoutError):
+        RequestPolicy(timeout=0.05, deadline=0.2, backoff_base=0.01, max_retries=10).call(
+            slow, "gpt-4o", []
+        )
+    assert time.perf_counter() - start < 0.45
+
+def test_hedges_to_fallback_model():
+    def completion(model, messages, **kwargs):
+        if model == "primary":
+            time.sleep(0.5)
+        return _response(f"From {model}.")
+
+    policy = RequestPolicy(hedge_after=0.05, hedge_model="backup")
+    start = time.perf_counter()
+    response, stats = policy.call(completion, "primary", [])
+
+    assert response.choices[0].message.content == "From backup."
+    assert stats == {"retries": 0, "hedged": True}
+    assert time.perf_counter() - start < 0.4
+
+def test_async_hedging_cancels_the_loser():
+    cancelled = []
+
+    async def acompletion(model, messages, **kwargs):
+        try:
+            await asyncio.sleep(0.5 if model == "primary" else 0.0)
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+        return _response(f"From {model}.")
+
+    policy = RequestPolicy(hedge_after=0.05, hedge_model="backup")
+    response, stats = asyncio.run(policy.acall(acompletion, "primary", []))
+
+    assert response.choices[0].message.content == "From backup."
+    assert stats["hedged"]
+    assert cancelled == ["primary"]
+
+def test_hedge_delay_tracks_latency_percentile():
+    policy = RequestPolicy(hedge_after=2.0, hedge_percentile=90)
+    assert policy.hedge_delay() == 2.0
+    for i in range(100):
+        policy._observe(i / 100)
+    assert policy.hedge_delay() == pytest.approx(0.9)
+
+    with pytest.raises(ValueError, match="hedge_percentile"):
+        RequestPolicy(hedge_percentile=100)
@@ -0,0 +1,48 @@
+# tests/test_prompts.py
+
+from unittest.mock import patch
+
+from statlingua import prompts
+from statlingua.prompts import (
+    assemble_sys_prompt,
+    reload_prompts,
+    static_sys_prompt,
+    variable_sys_prompt,
+)
+
+def test_prompt_registry_loads_all_files():
+    registry = prompts._prompt_registry()
+    assert ("common", "role_base.md") in registry
+    assert ("audience", "novice.md") in registry
+    assert ("style", "json.md") in registry
+
+def test_assemble_sys_prompt_is_memoized_and_reloadable():
+    """
+    Tests that prompt files are read once and that reload_prompts()
+    picks up edited files.
+    """
+    reload_prompts()
+    first = assemble_sys_prompt("lm", "student", "brief", "markdown")
+    assert assemble_sys_prompt("lm", "student", "brief", "markdown") is first
+
+    edited = dict(prompts._prompt_registry())
+    edited[("common", "caution.md")] = "EDITED CAUTION"
+    with patch.object(prompts, "_walk_prompt_dir", return_value=edited):
+        # Still memoized until an explicit reload
+        assert "EDITED CAUTION" not in assemble_sys_prompt("lm", "student", "brief", "markdown")
+        reload_prompts()
+        assert "EDITED CAUTION" in assemble_sys_prompt("lm", "student", "brief", "markdown")
+    reload_prompts()
+
+def test_cache_friendly_layout_has_the_same_sections():
+    """
+    Tests that the static and variable prompts split the sections of the
+    full system prompt, with the audience-independent ones first.
+    """
+    static = static_sys_prompt("lm")
+    variable = variable_sys_prompt("manager", "brief", "html")
+    assert static.startswith("## Role") and "## Caution" in static
+    assert "Target Audience: Manager" in variable and "Style: Html" in variable
+    assert "Target Audience" not in static
+    full = assemble_sys_prompt("lm", "manager", "brief", "html")
+    assert sorted(full.split("\n\n\n## ")) == sorted(f"{static}\n\n\n{variable}".split("\n\n\n## "))
@@ -0,0 +1,145 @@
+# tests/test_ratelimit.py
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from statlingua.completion import complete
+from statlingua.explain import explain_many
+from statlingua.policy import RequestPolicy
+from statlingua.ratelimit import (
+    RateLimiter,
+    SQLiteRateLimiter,
+    estimate_request_tokens,
+    set_rate_limiter,
+)
+
+class MockResults:
+    def __init__(self, label):
+        self.label = label
+
+    def summary(self):
+        return f"--- MOCK SUMMARY {self.label} ---"
+
+def _frozen(limiter, now=1000.0):
+    limiter._now = lambda: now
+    return limiter
+
+def test_requests_are_spaced_under_the_limit():
+    # 60 RPM with room for a single request at once: one request per second
+    limiter = _frozen(RateLimiter(requests_per_minute=60, headroom=1.0, burst=0.01))
+    waits = [limiter.reserve("gpt-4o") for _ in range(4)]
+    assert waits == pytest.approx([0.0, 1.0, 2.0, 3.0])
+    # Other models have their own buckets; unlimited models never wait
+    limiter.limits["mini"] = {"requests_per_minute": 6000}
+    assert limiter.reserve("mini") == 0.0
+    assert RateLimiter().reserve("gpt-4o", tokens=10**6) == 0.0
+
+def test_token_budget_and_settlement():
+    # 600 TPM: 10 tokens per second, a full minute's budget available at once
+    limiter = _frozen(RateLimiter(tokens_per_minute=600, headroom=1.0, burst=1.0))
+    assert limiter.reserve("gpt-4o", tokens=500) == 0.0
+    assert limiter.reserve("gpt-4o", tokens=200) == pytest.approx(10.0)
+    # The first request used 300 tokens fewer than estimated
+    limiter.settle("gpt-4o", estimated=500, actual=200)
+    assert limiter.reserve("gpt-4o", tokens=100) == pytest.approx(0.0)
+
+def test_try_reserve_only_draws_free_capacity():
+    limiter = _frozen(RateLimiter(requests_per_minute=60, headroom=1.0, burst=0.01))
+    assert limiter.try_reserve("gpt-4o")
+    assert not limiter.try_reserve("gpt-4o")
+    # The refused reservation did not push later requests back
+    assert limiter.reserve("gpt-4o") == pytest.approx(1.0)
+
+def test_sqlite_buckets_are_shared(tmp_path):
+    path = str(tmp_path / "limits.db")
+    workers = [
+        _frozen(SQLiteRateLimiter(path, requests_per_minute=60, headroom=1.0, burst=0.01))
+        for _ in range(2)
+    ]
+    waits = [workers[i % 2].reserve("gpt-4o") for i in range(4)]
+    assert waits == pytest.approx([0.0, 1.0, 2.0, 3.0])
+    for worker in workers:
+        worker.close()
+
+def test_estimate_request_tokens():
+    messages = [
+        {"role": "system", "content": "x" * 400},
+        {"role": "user", "content": [
+            {"type": "text", "text": "y" * 40},
+            {"type": "image_url", "image_url": {"url": "data:image/png;base64,"}},
+        ]},
+    ]
+    tokens = estimate_request_tokens(messages, max_tokens=50)
+    assert tokens > estimate_request_tokens(messages) > estimate_request_tokens(messages[:1])
+
+@patch('litellm.acompletion', new_callable=AsyncMock)
+def test_batch_throughput_follows_the_limit(mock_acompletion: AsyncMock):
+    response = MagicMock()
+    response.choices[0].message.content = "Explained."
+    response.usage.prompt_tokens = 10
+    response.usage.completion_tokens = 5
+    mock_acompletion.return_value = response
+
+    # 600 RPM, one request at a time: 10 requests per second
+    set_rate_limiter(RateLimiter(requests_per_minute=600, headroom=1.0, burst=0.001))
+    try:
+        start = time.perf_counter()
+        results = explain_many(
+            [MockResults(i) for i in range(5)], model="gpt-4o", max_concurrency=5
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        set_rate_limiter(None)
+
+    assert all(result["text"] == "Explained." for result in results)
+    assert 0.35 <= elapsed < 1.5
+
+def _timed_completion(sent, delay=0.0):
+    def completion(model, messages, **kwargs):
+        sent.append((model, time.monotonic()))
+        time.sleep(delay)
+        response = MagicMock()
+        response.choices[0].message.content = "Answer."
+        response.usage.prompt_tokens = 10
+        response.usage.completion_tokens = 5
+        return response
+    return completion
+
+def test_limiter_waits_do_not_count_against_the_attempt_timeout():
+    sent = []
+    # 600 RPM, one request at a time: the second request waits 0.1s
+    set_rate_limiter(RateLimiter(requests_per_minute=600, headroom=1.0, burst=0.001))
+    policy = RequestPolicy(timeout=0.05, max_retries=2, backoff_base=0.0)
+    try:
+        with patch('litellm.completion', side_effect=_timed_completion(sent)):
+            start = time.monotonic()
+            for _ in range(2):
+                result = complete("gpt-4o", [{"role": "user", "content": "Hi"}], policy=policy)
+                assert result["text"] == "Answer." and result["retries"] == 0
+            time.sleep(0.3)
+    finally:
+        set_rate_limiter(None)
+
+    # No timed-out attempt was abandoned to send a late request
+    assert len(sent) == 2
+    assert sent[1][1] - start == pytest.approx(0.1, abs=0.05)
+
+def test_hedges_are_skipped_without_free_capacity():
+    sent = []
+    limiter = RateLimiter(limits={"gpt-4o": {"requests_per_minute": 60}}, headroom=1.0, burst=0.01)
+    set_rate_limiter(limiter)
+    policy = RequestPolicy(hedge_after=0.01)
+    messages = [{"role": "user", "content": "Hi"}]
+    try:
+        with patch('litellm.completion', side_effect=_timed_completion(sent, delay=0.1)):
+            result = complete("gpt-4o", messages, policy=policy)
+            # Unlimited models are still hedged
+            unlimited = complete("gpt-4o-mini", messages, policy=policy)
+    finally:
+        set_rate_limiter(None)
+
+    assert result["hedged"] is False
+    assert unlimited["hedged"] is True
+    assert [model for model, _ in sent] == ["gpt-4o", "gpt-4o-mini", "gpt-4o-mini"]
@@ -0,0 +1,107 @@
+# tests/test_session.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from statlingua.diagnostic import available_tools
+from statlingua.session import SUMMARIZE_PROMPT, DiagnosticSession
+
+class MockResults:
+    def summary(self):
+        return "--- MOCK SUMMARY ---"
+
+def _response(text, tool_calls=None):
+    response = MagicMock()
+    response.choices[0].message.content = text
+    response.choices[0].message.tool_calls = tool_calls
+    return response
+
+def _tool_call(name):
+    tool_call = MagicMock()
+    tool_call.id = f"call_{name}"
+    tool_call.function.name = name
+    tool_call.function.arguments = "{}"
+    return tool_call
+
+@patch('litellm.completion')
+def test_follow_ups_reuse_the_prefix(mock_completion: MagicMock):
+    mock_completion.side_effect = [_response(f"Answer {i}.") for i in range(3)]
+    session = DiagnosticSession(MockResults(), model="gpt-4o", use_tools=False)
+
+    for i in range(3):
+        assert session.ask(f"Question {i}?")["text"] == f"Answer {i}."
+
+    requests = [call.kwargs["messages"] for call in mock_completion.call_args_list]
+    assert all(messages[0] == requests[0][0] for messages in requests)
+    assert "--- MOCK SUMMARY ---" in requests[0][0]["content"]
+    assert sum("MOCK SUMMARY" in str(m["content"]) for m in requests[2]) == 1
+    assert [m["content"] for m in requests[2][1:]] == [
+        "Question 0?", "Answer 0.", "Question 1?", "Answer 1.", "Question 2?"
+    ]
+
+@patch('litellm.completion')
+def test_history_is_compacted_past_the_budget(mock_completion: MagicMock):
+    long_answer = "word " * 400
+    mock_completion.side_effect = [_response(long_answer) for _ in range(3)] + [
+        _response("Digest of turns 0-1."), _response("Final."),
+    ]
+    session = DiagnosticSession(
+        MockResults(), model="gpt-4o", use_tools=False, history_tokens=1200, keep_turns=1
+    )
+    for i in range(3):
+        session.ask(f"Question {i}?")
+    result = session.ask("Question 3?")
+
+    summarize_call = mock_completion.call_args_list[-2].kwargs["messages"]
+    assert summarize_call[0]["content"] == SUMMARIZE_PROMPT
+    assert "Question 0?" in summarize_call[1]["content"]
+    assert session.digest == "Digest of turns 0-1."
+    assert [q for q, _ in session.history] == ["Question 2?", "Question 3?"]
+    final_request = mock_completion.call_args_list[-1].kwargs["messages"]
+    assert "Digest of turns 0-1." in final_request[1]["content"]
+    assert result["metrics"]["llm_calls"] == 2
+
+    truncating = DiagnosticSession(
+        MockResults(), model="gpt-4o", use_tools=False, history_tokens=10,
+        keep_turns=0, compaction="truncate",
+    )
+    truncating.history = [("Question?", long_answer)]
+    truncating._compact(MagicMock())
+    assert truncating.digest.startswith("Q: Question?\nA: word")
+    assert len(truncating.digest) < 400
+
+@patch('litellm.completion')
+def test_tool_outputs_are_computed_once(mock_completion: MagicMock):
+    mock_completion.side_effect = [
+        _response(None, [_tool_call("compute_vif")]), _response("VIFs are fine."),
+        _response(None, [_tool_call("compute_vif")]), _response("Still fine."),
+    ]
+    vif = MagicMock(return_value="VIF table")
+    results = MockResults()
+    with patch.dict(available_tools, {"compute_vif": vif}):
+        first = DiagnosticSession(results, model="gpt-4o").ask("Multicollinearity?")
+        # A second session on the same fit reuses the output
+        second = DiagnosticSession(results, model="gpt-4o").ask("And now?")
+
+    assert vif.call_count == 1
+    assert first["tool_calls"] == second["tool_calls"] == ["compute_vif"]
+    assert second["text"] == "Still fine."
+    tools = mock_completion.call_args_list[0].kwargs["tools"]
+    assert "plot_residuals_vs_fitted" not in [tool["function"]["name"] for tool in tools]
+
+@patch('litellm.completion')
+def test_final_turn_forbids_tool_calls(mock_completion: MagicMock):
+    looping = _response("Final answer.", [_tool_call("compute_vif")])
+    mock_completion.return_value = looping
+    with patch.dict(available_tools, {"compute_vif": MagicMock(return_value="VIF table")}):
+        result = DiagnosticSession(MockResults(), model="claude-3-5-sonnet", max_steps=1).ask("VIFs?")
+
+    assert mock_completion.call_count == 2
+    final = mock_completion.call_args.kwargs
+    assert final["tool_choice"] == "none" and final["tools"]
+    assert result["text"] == "Final answer."
+
+def test_invalid_compaction():
+    with pytest.raises(ValueError, match="compaction"):
+        DiagnosticSession(MockResults(), model="gpt-4o", compaction="forget")